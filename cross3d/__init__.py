@@ -2,6 +2,7 @@
 import glob
 import os
 import sys
+import types
 
 
 # Setup logging for the cross3d library.
@@ -32,22 +33,43 @@ if not logger.handlers:
 # 		cross3d.debugLevel = cross3d.constants.DebugLevels.Mid
 # To check if the current debug level is Mid or higher:
 #		cross3d.debugLevel >= cross3d.constants.DebugLevels.Mid
-from constants import DebugLevels as _DebugLevels
-debugLevel = _DebugLevels[os.getenv('CROSS3D_DEBUG_LEVEL', 'Disabled')]
+# The debug level and the constants module are created on first access by _lazyAttribute.
 
 #--------------------------------------------------------------------------------
 # Decorators and functions used for maintaining cross3d
 #--------------------------------------------------------------------------------
 
+# How the methods decorated by abstractmethod behave when they are called without being overridden.
+# The "CROSS3D_ABSTRACTMETHOD_MODE" environment variable sets the mode at import, use
+# setAbstractMethodMode to change it later.
+_abstractMethodMode = os.getenv('CROSS3D_ABSTRACTMETHOD_MODE') or None
+_abstractMethodCounting = bool(os.getenv('CROSS3D_ABSTRACTMETHOD_COUNT'))
+# The decorated functions and the callable that currently stands for them.
+_abstractMethods = []
+# The amount of calls to abstract methods by (backend, method) when counting.
+_abstractMethodCalls = {}
+
 def abstractmethod(function):
 	""" The decorated function should be overridden by a software specific module.
 	
-	Depending on the state of the environment variable "CROSS3D_ABSTRACT_MODE" is set to 
+	Depending on the state of the environment variable "CROSS3D_ABSTRACTMETHOD_MODE" calling the
+	function will raise a NotImplementedError when set to "raise", or log a debug message when set to
+	"warn". Otherwise the function is returned as is and calling it has no overhead.
 	"""
+	entry = [function, _abstractMethodWrapper(function, _abstractMethodMode, _abstractMethodCounting)]
+	_abstractMethods.append(entry)
+	return entry[1]
+
+def _abstractMethodWrapper(function, mode, counting):
+	if mode not in ('raise', 'warn') and not counting:
+		return function
+
+	msg = 'Abstract implementation has not been overridden.'
 	def newFunction(*args, **kwargs):
+		if counting:
+			key = (_abstractMethodBackend(args, function, newFunction), '{}.{}'.format(function.__module__, function.__name__))
+			_abstractMethodCalls[key] = _abstractMethodCalls.get(key, 0) + 1
 		# when debugging, raise an error
-		msg = 'Abstract implementation has not been overridden.'
-		mode = os.getenv('CROSS3D_ABSTRACTMETHOD_MODE')
 		if mode == 'raise':
 			raise NotImplementedError(debugObjectString(function, msg))
 		elif mode == 'warn':
@@ -58,6 +80,68 @@ def abstractmethod(function):
 	newFunction.__dict__ = function.__dict__
 	return newFunction
 
+def _abstractMethodBackend(args, *callables):
+	""" Returns the name of the package defining the class of the object an abstract method was
+	called on, like "studiomax", or "abstract" for functions. The callables are the function and its
+	wrapper, a module holding one of them under its name defines it as a function.
+	"""
+	if not args:
+		return 'abstract'
+	function = callables[0]
+	module = sys.modules.get(function.__module__)
+	if module is not None and vars(module).get(function.__name__) in callables:
+		return 'abstract'
+	import inspect
+	receiver = args[0] if inspect.isclass(args[0]) else type(args[0])
+	parts = getattr(receiver, '__module__', '').split('.')
+	if parts[0] == __name__ and len(parts) > 2:
+		return parts[1]
+	return parts[0]
+
+def setAbstractMethodMode(mode=None, counting=False):
+	""" Changes how the methods decorated by abstractmethod behave for the rest of the session.
+
+	Args:
+		mode(str): "raise" to raise a NotImplementedError, "warn" to log a debug message, None to
+			call the abstract implementation without any overhead.
+		counting(bool): Count the calls to abstract methods, see abstractMethodCalls.
+	"""
+	global _abstractMethodMode, _abstractMethodCounting
+	_abstractMethodMode = mode or None
+	_abstractMethodCounting = counting
+
+	for entry in _abstractMethods:
+		function, current = entry
+		wrapper = _abstractMethodWrapper(function, _abstractMethodMode, _abstractMethodCounting)
+		if wrapper is current:
+			continue
+		# Swapping the callable on the module or classes holding it.
+		module = sys.modules.get(function.__module__)
+		if module:
+			holders = [module] + [value for value in vars(module).values() if isinstance(value, (type, types.ClassType))]
+			for holder in holders:
+				attribute = vars(holder).get(function.__name__)
+				if attribute is current:
+					setattr(holder, function.__name__, wrapper)
+				elif isinstance(attribute, (classmethod, staticmethod)) and attribute.__func__ is current:
+					setattr(holder, function.__name__, type(attribute)(wrapper))
+		entry[1] = wrapper
+
+def abstractMethodMode():
+	""" Returns the mode set by setAbstractMethodMode or the "CROSS3D_ABSTRACTMETHOD_MODE" variable.
+	"""
+	return _abstractMethodMode
+
+def abstractMethodCalls():
+	""" Returns the amount of calls that fell through to a method that was not overridden, by
+	(backend, method name) tuples. Calls are only counted after setAbstractMethodMode(counting=True)
+	or with the "CROSS3D_ABSTRACTMETHOD_COUNT" environment variable set.
+	"""
+	return dict(_abstractMethodCalls)
+
+def clearAbstractMethodCalls():
+	_abstractMethodCalls.clear()
+
 def debugObjectString(object, msg):
 	import inspect
 	# debug a module
@@ -88,20 +172,101 @@ def debugObjectString(object, msg):
 _debugModule = os.getenv('CROSS3D_DEBUG_MODULE')
 logger.debug('DebugModule: {}'.format(_debugModule))
 
-import constants
+# The software specific module can also be chosen with the environment variable CROSS3D_BACKEND, which
+# skips the detection but still falls back on the abstract implementation if that module fails. Set
+# it to "abstract" for jobs that run outside of any software.
+_backendOverride = os.getenv('CROSS3D_BACKEND')
+
+# The module the host software of each software specific module provides. The software specific
+# module is only imported if this one can be found, which avoids executing it for nothing.
+_backendHostModules = {
+	'studiomax': 'Py3dsMax',
+	'softimage': 'PySoftimage',
+	'maya': 'maya',
+	'motionbuilder': 'pyfbsdk',
+}
 
-from classes import FCurve
-from classes import Exceptions
-from classes import ValueRange
-from classes import FrameRange
-from classes import FileSequence
-from classes import Timecode
-from classes import Clipboard
-from classes import FlipBook
-from classes import Dispatch as _Dispatch
+# The state of init, the name of the software specific module that initialized or "abstract".
+_initState = {'initialized': False, 'backend': None}
+
+# Symbols imported the first time they are accessed, by the module defining them.
+_lazySymbols = {
+	'FCurve': 'classes.fcurve',
+	'Exceptions': 'classes.exceptions',
+	'ValueRange': 'classes.valuerange',
+	'FrameRange': 'classes.framerange',
+	'FrameRangeSet': 'classes.framerangeset',
+	'FileSequence': 'classes.filesequence',
+	'Timecode': 'classes.timecode',
+	'Clipboard': 'classes.clipboard',
+	'FlipBook': 'classes.flipbook',
+}
+
+class _LazyModule(types.ModuleType):
+	""" A module importing its symbols the first time they are accessed.
+
+	Python 2 modules cannot define __getattr__, so lazy packages replace themselves in sys.modules
+	by an instance of this class holding a copy of their namespace.
+
+	Args:
+		module(module): The module being replaced.
+		symbols(dict): The modules defining each lazy symbol, relative to the package.
+		fallback(callable): Called with the name of other missing attributes. It returns their value
+			or raises AttributeError.
+	"""
+	def __init__(self, module, symbols, fallback=None):
+		super(_LazyModule, self).__init__(module.__name__)
+		self.__dict__.update(module.__dict__)
+		# Python 2 clears the globals of a module when it is garbage collected, the functions of the
+		# replaced module still use them.
+		self.__dict__['_lazyReplacedModule'] = module
+		self.__dict__['_lazySymbols'] = symbols
+		self.__dict__['_lazyFallback'] = fallback
 
-# Global Dispatch object.  This is the main entry point for connecting to events and signals generated by the 3D environment.
-dispatch = _Dispatch()
+	def __getattr__(self, name):
+		# Special names are looked up by the import machinery and tools, they are never lazy.
+		if name.startswith('__'):
+			raise AttributeError(name)
+		symbols = self.__dict__['_lazySymbols']
+		if name in symbols:
+			import importlib
+			value = getattr(importlib.import_module('.' + symbols[name], self.__name__), name)
+		elif self.__dict__['_lazyFallback']:
+			value = self.__dict__['_lazyFallback'](name)
+		else:
+			raise AttributeError("'module' object has no attribute '{}'".format(name))
+		setattr(self, name, value)
+		return value
+
+def _lazyAttribute(name):
+	""" Provides the debug level, the global dispatch object and the symbols registered by init,
+	calling it if needed.
+	"""
+	if name == 'constants':
+		import constants
+		return constants
+	if name == 'debugLevel':
+		from constants import DebugLevels
+		return DebugLevels[os.getenv('CROSS3D_DEBUG_LEVEL', 'Disabled')]
+	if name == 'dispatch':
+		# Global Dispatch object.  This is the main entry point for connecting to events and signals generated by the 3D environment.
+		from classes.dispatch import Dispatch
+		return Dispatch()
+	if not _initState['initialized']:
+		init()
+		import cross3d
+		if name in cross3d.__dict__:
+			return cross3d.__dict__[name]
+	# Submodules like cross3d.migrate used to be imported with the package, code still expects them.
+	import imp
+	try:
+		imp.find_module(name, __path__)
+	except ImportError:
+		pass
+	else:
+		import importlib
+		return importlib.import_module('.' + name, __name__)
+	raise AttributeError("'module' object has no attribute '{}'".format(name))
 
 def _methodNames():
 	filenames = glob.glob(os.path.split(__file__)[0] + '/*/__init__.py')
@@ -112,10 +277,54 @@ def _methodNames():
 			ret.append(os.path.normpath(filename).split(os.path.sep)[-2])
 	return ret
 
+def _hostModuleExists(modname):
+	""" Returns False if the module the host software of a software specific module provides can't be
+	found. Modules that are already imported or unknown are assumed to exist.
+	"""
+	hostModule = _backendHostModules.get(modname)
+	if not hostModule or hostModule in sys.modules:
+		return True
+	import imp
+	try:
+		imp.find_module(hostModule)
+	except ImportError:
+		return False
+	return True
+
 def packageName(modname):
 	return 'cross3d.%s' % modname
 
+def backend():
+	""" Returns the name of the software specific module in use, like "studiomax", or "abstract" if
+	none could be initialized. Calls init if it was not called yet.
+	"""
+	init()
+	return _initState['backend']
+
 def init():
+	""" Imports the software specific module and the abstract api, registering their symbols.
+
+	This is called automatically the first time one of their symbols is accessed, so importing
+	cross3d does not pay for it. Calling it again does nothing.
+	"""
+	# Holding the import lock so other threads wait for the symbols to be registered.
+	import imp
+	imp.acquire_lock()
+	try:
+		if _initState['initialized']:
+			return
+		_initState['initialized'] = True
+		_initState['backend'] = _initBackend()
+
+		# import the abstract api for default implementations of api
+		import abstract
+		abstract.init()
+	finally:
+		imp.release_lock()
+
+def _initBackend():
+	""" Imports and initializes the software specific module, returning its name or "abstract".
+	"""
 	if _debugModule != None:
 		logger.debug('Forced import of Software Specific module: {}'.format(_debugModule))
 		# TODO: Research a better way to handle importing the software specific modules
@@ -124,29 +333,32 @@ def init():
 		mod = sys.modules[pckg]
 		logger.debug('pckg: {}'.format([pckg, mod]))
 		mod.init()
+		return _debugModule
+
+	if _backendOverride:
+		modnames = [] if _backendOverride == 'abstract' else [_backendOverride]
 	else:
-		# import any overrides to the abstract symbols
-		for modname in _methodNames():
-			pckg = packageName(modname)
-
-			# Attempt to import and init this modname.
-			try:
-				__import__(pckg)
-			except ImportError:
-				continue
-
-			mod = sys.modules[pckg]
-			try:
-				mod.init()
-				logger.debug('The module "{}" initialized successfully.'.format(modname))
-				# The module successfully initalized no need to try any other modules.
-				break
-			except:
-				continue
-
-	# import the abstract api for default implementations of api
-	import abstract
-	abstract.init()
+		modnames = [modname for modname in _methodNames() if _hostModuleExists(modname)]
+
+	# import any overrides to the abstract symbols
+	for modname in modnames:
+		pckg = packageName(modname)
+
+		# Attempt to import and init this modname.
+		try:
+			__import__(pckg)
+		except ImportError:
+			continue
+
+		mod = sys.modules[pckg]
+		try:
+			mod.init()
+			logger.debug('The module "{}" initialized successfully.'.format(modname))
+			# The module successfully initalized no need to try any other modules.
+			return modname
+		except:
+			continue
+	return 'abstract'
 
 def external(appName):
 	appName = appName.lower()
@@ -172,4 +384,4 @@ def registerSymbol(name, value, ifNotFound=False):
 
 	cross3d.__dict__[name] = value
 
-init()
+sys.modules[__name__] = _LazyModule(sys.modules[__name__], _lazySymbols, _lazyAttribute)
@@ -9,20 +9,79 @@
 # 	\date		05/26/11
 #
 
+import os
 import re
+import copy
 import json
+import json.scanner
 import cross3d
 from collections import OrderedDict
+from contextlib import contextmanager
 from PyQt4.QtCore import QTimer as _QTimer
 
 dispatchObject = cross3d.dispatch.dispatchObject
 
+# Calling the scanner of json directly skips most of the overhead of json.loads on short values.
+_scanJson = json.scanner.make_scanner(json.JSONDecoder())
+
+def _loadJson(string):
+	value, end = _scanJson(string, 0)
+	if end != len(string):
+		raise ValueError('Extra data in JSON value: {}'.format(string))
+	return value
+
+def _isJsonExact(value):
+	""" Returns whether json encodes the value without loosing its types, dict keys and tuples being
+	the usual culprits.
+	"""
+	if value is None or isinstance(value, (basestring, bool, int, long, float)):
+		return True
+	if type(value) == list:
+		return all(_isJsonExact(item) for item in value)
+	if type(value) == dict:
+		return all(isinstance(key, basestring) and _isJsonExact(item) for key, item in value.iteritems())
+	return False
+
 class AbstractUserProps(dict):
 	"""
 	The cross3d.UserProps package creates an abstract wrapper from a 
 	3d system to use storing and retreiving custom user props
+
+	Values are always read in both encodings. Values stored by older versions or typed by users are
+	decoded by trying their possible types in turn, the results of which are cached. When typedValues
+	is set values are stored with a typed encoding, a version and type tag prefix followed by the
+	value, like "c3d1:i:125", which decodes in one step but older versions of cross3d cannot read.
 	"""
 
+	# Store values with the typed encoding, set with the "CROSS3D_TYPED_USERPROPS" environment variable
+	# once every version of cross3d reading the files decodes it.
+	typedValues = bool(os.getenv('CROSS3D_TYPED_USERPROPS'))
+
+	# The version and the type tags of the typed encoding.
+	_TYPED_PREFIX = u'c3d1:'
+	_TYPED_DECODERS = {
+		u's': unicode,
+		u'i': int,
+		u'f': float,
+		u'b': lambda payload: payload == u'1',
+		u'n': lambda payload: None,
+		u'l': _loadJson,
+		u'd': _loadJson,
+		u't': lambda payload: tuple(_loadJson(payload)),
+		u'o': lambda payload: OrderedDict(_loadJson(payload)),
+		u'r': eval,
+	}
+
+	# Decoded legacy values, see setValueCacheSize. Immutable values are cached as they are, containers
+	# are cached typed when the encoding is exact and copied otherwise, so callers get their own copy.
+	_valueCache = {}
+	_valueCacheSize = 4096
+	_IMMUTABLE_TYPES = (int, long, float, bool, str, unicode, type(None))
+	_CACHED_VALUE, _CACHED_TYPED, _CACHED_COPY = range(3)
+
+	# The amount of nested batch blocks currently open, see batch.
+	_batchDepth = 0
+
 	def __init__(self, nativePointer):
 		dict.__init__(self)
 		self._nativePointer = nativePointer
@@ -65,6 +124,33 @@ class AbstractUserProps(dict):
 	def __str__(self):
 		return '<{cls} {props}>'.format(cls=self.__class__.__name__, props=unicode(self.lookupProps()))
 
+	@contextmanager
+	def batch(self):
+		"""
+		Groups the changes made inside the with block, software that supports it stores them in a single
+		write and emits a single change notification when the outermost block exits.
+
+			with cross3d.UserProps(nativePointer).batch() as props:
+				props['Asset'] = 'Hero'
+				props['Version'] = 3
+
+		"""
+		self._batchDepth += 1
+		try:
+			yield self
+		finally:
+			self._batchDepth -= 1
+			if not self._batchDepth:
+				self._commitBatch()
+
+	def _commitBatch(self):
+		"""
+		Stores the changes made in a batch, see batch. Changes are stored as they are made unless this
+		is reimplemented.
+
+		"""
+		pass
+
 	def clear(self):
 		self.lookupProps().clear()
 
@@ -175,16 +261,77 @@ class AbstractUserProps(dict):
 			string = unicode(string)
 		return string.replace(' ', '&#32;').replace('\n', '&#10;').replace('\r', '&#13;')
 
-	@staticmethod
-	def escapeValue(string):
+	@classmethod
+	def escapeValue(cls, string):
 		"""
-		Replaces any unstorable characters in value with their html codes
+		Encodes the value, with encodeValue if typedValues is set, and replaces any unstorable characters
+		with their html codes
 
 		"""
-		if not isinstance(string, (str, unicode)):
+		if cls.typedValues:
+			string = cls.encodeValue(string)
+		elif not isinstance(string, (str, unicode)):
 			string = unicode(string)
 		return string.replace('\r\n', '&#13;&#10;').replace('\n', '&#10;').replace('\r', '&#13;')
 
+	@classmethod
+	def encodeValue(cls, value):
+		"""
+		Returns the typed encoding of the value. Values of other types than strings, numbers, None
+		and the python containers are converted to strings like older versions did.
+
+		"""
+		valueType = type(value)
+		if valueType in (str, unicode):
+			tag = u's'
+		elif valueType == bool:
+			tag, value = u'b', u'1' if value else u'0'
+		elif valueType in (int, long):
+			tag = u'i'
+		elif valueType == float:
+			tag, value = u'f', repr(value)
+		elif value is None:
+			tag, value = u'n', u''
+		elif valueType in (list, dict, tuple, OrderedDict):
+			if valueType == OrderedDict:
+				items = [list(item) for item in value.iteritems()]
+			elif valueType == tuple:
+				items = list(value)
+			else:
+				items = value
+			if _isJsonExact(items):
+				tag, value = {list: u'l', dict: u'd', tuple: u't', OrderedDict: u'o'}[valueType], json.dumps(items, separators=(',', ':'))
+			else:
+				tag, value = u'r', repr(value)
+		else:
+			return unicode(value)
+		return u'%s%s:%s' % (cls._TYPED_PREFIX, tag, value)
+
+	@classmethod
+	def _decodeTypedValue(cls, string):
+		""" Decodes a string starting with the typed prefix, returning the string if it is not valid. """
+		prefixLength = len(cls._TYPED_PREFIX)
+		decoder = cls._TYPED_DECODERS.get(string[prefixLength:prefixLength + 1])
+		if decoder is None or string[prefixLength + 1:prefixLength + 2] != u':':
+			return string
+		payload = string[prefixLength + 2:]
+		if u'&#1' in payload:
+			payload = payload.replace('&#13;', '\r').replace('&#10;', '\n')
+		try:
+			return decoder(payload)
+		except Exception:
+			return string
+
+	@classmethod
+	def setValueCacheSize(cls, size):
+		"""
+		Sets the amount of legacy values whose decoded value is kept, 0 disables the cache.
+
+		"""
+		AbstractUserProps._valueCacheSize = size
+		while len(AbstractUserProps._valueCache) > max(size, 0):
+			AbstractUserProps._valueCache.popitem()
+
 	@staticmethod
 	def unescapeKey(string):
 		"""
@@ -195,13 +342,48 @@ class AbstractUserProps(dict):
 			string = unicode(string)
 		return string.replace('&#32;', ' ').replace('&#10;', '\n').replace('&#13;', '\r')
 
-	@staticmethod
-	def unescapeValue(string):
+	@classmethod
+	def unescapeValue(cls, string):
 		"""
-		Replaces any html codes with their associated unstorable characters
+		Decodes a stored value, typed or legacy.
 
 		"""
 		string = unicode(string)
+		if string.startswith(cls._TYPED_PREFIX):
+			return cls._decodeTypedValue(string)
+		cache = AbstractUserProps._valueCache
+		key = (cls, string)
+		entry = cache.get(key)
+		if entry is None:
+			value = cls._decodeLegacyValue(string)
+			if AbstractUserProps._valueCacheSize <= 0:
+				return value
+			if type(value) in cls._IMMUTABLE_TYPES:
+				entry = (cls._CACHED_VALUE, value)
+			else:
+				typed = cls.encodeValue(value)
+				if typed.startswith(cls._TYPED_PREFIX) and typed[len(cls._TYPED_PREFIX)] != u'r':
+					entry = (cls._CACHED_TYPED, typed)
+				else:
+					entry = (cls._CACHED_COPY, value)
+			if len(cache) >= AbstractUserProps._valueCacheSize:
+				# Evicting any entry, keeping track of the use of each one costs more than it saves.
+				cache.popitem()
+			cache[key] = entry
+			return value
+		kind, value = entry
+		if kind == cls._CACHED_VALUE:
+			return value
+		if kind == cls._CACHED_TYPED:
+			return cls._decodeTypedValue(value)
+		return copy.deepcopy(value)
+
+	@staticmethod
+	def _decodeLegacyValue(string):
+		"""
+		Decodes a value stored without the typed encoding, trying its possible types in turn.
+
+		"""
 		try:
 			return json.loads( string )
 		except ValueError:
@@ -268,49 +450,111 @@ class AbstractUserProps(dict):
 		return openPos, pos
 
 class AbstractFileProps(AbstractUserProps):
+	"""
+	Reads and writes the custom properties of a file through dsofile.dll, or the class set as storeClass.
+
+	Each access opens the file unless it is made in a session, which opens the file once, answers the
+	reads from the properties read when opening it and stores the changes once when it exits:
+
+		with cross3d.FileProps(path).session() as props:
+			if props.get('Version', 0) < 3:
+				props['Version'] = 3
+				props['Status'] = 'Approved'
+
+	Scanning many files is faster in a pool, which keeps the files that were read open, closing the
+	least recently used ones past its size and the others when it exits:
+
+		with AbstractFileProps.pool(64):
+			versions = dict([(path, cross3d.FileProps(path).get('Version')) for path in paths])
+
+	"""
+
+	# The class of the store reading and writing the properties, DSOFile if None. The pure python
+	# cross3d.migrate.sidecarfile.SidecarFile can be set instead where dsofile.dll is not available.
+	storeClass = None
+
+	# The open stores and their properties by file name while a pool is open, most recently used last.
+	_pool = None
+	_poolSize = 0
+	_REMOVED = object()
+
 	def __init__(self, fileName=''):
 		self._dso = None
 		self.fileName = fileName
 		self._closeScheduled = False
 		self._saveScheduled = False
+		# The properties and the changes of the current session, see session.
+		self._sessionValues = None
+		self._sessionChanges = {}
 		super(AbstractFileProps, self).__init__(None)
 
+	def __contains__(self, key):
+		return key in self._values()
+
 	def __delitem__(self, key):
-		if self.dso().open(self.fileName):
-			self._saveScheduled = True
-			if self.dso().removeCustomProperty(key):
-				self._close()
-				return True
+		if key not in self._values():
 			raise KeyError('FileProps does not contain key: %s' % key)
-		else:
-			raise cross3d.Exceptions.FileNotDSO
+		self._change({key: self._REMOVED})
 
 	def __getitem__(self, key):
-		if self.dso().open(self.fileName):
-			self._scheduleClose()
-			out = self.dso().customProperty(key)
-			if out:
-				return self.unescapeValue(out.value())
-			raise KeyError('FileProps does not contain key: %s' % key)
-		else:
-			raise cross3d.Exceptions.FileNotDSO
+		values = self._values()
+		if key in values:
+			return self.unescapeValue(values[key])
+		raise KeyError('FileProps does not contain key: %s' % key)
 
 	def __setitem__(self, key, value):
-		if self.dso().open(self.fileName):
-			self._saveScheduled = True
-			prop = self.dso().customProperty(key)
-			if prop:
-				prop.setValue(value)
-			else:
-				self.dso().addCustomProperty(key, value)
-			self._close()
-			self.emitChange()
-		else:
-			raise cross3d.Exceptions.FileNotDSO
+		self._change({key: value})
 
 	def __repr__(self):
 		return self.__str__()
 
+	def _change(self, changes):
+		"""
+		Stores the changes, a value or _REMOVED by key, when they are made outside of a session and
+		records them otherwise.
+
+		"""
+		if self._batchDepth:
+			values = self._values()
+			for key, value in changes.iteritems():
+				if value is self._REMOVED:
+					values.pop(key, None)
+				else:
+					values[key] = value
+			self._sessionChanges.update(changes)
+			return
+		store = self._openStore()
+		self._applyChanges(store, changes)
+		self._releaseStore(store, save=True)
+		self.emitChange()
+
+	def _commitBatch(self):
+		changes, self._sessionChanges = self._sessionChanges, {}
+		opened = self._sessionValues is not None
+		self._sessionValues = None
+		if changes:
+			store = self._openStore()
+			self._applyChanges(store, changes)
+			self._releaseStore(store, save=True)
+			self.emitChange()
+		elif opened and self._poolEntry() is None:
+			self._close()
+
+	def _applyChanges(self, store, changes):
+		entry = self._poolEntry()
+		for key, value in changes.iteritems():
+			if value is self._REMOVED:
+				store.removeCustomProperty(key)
+			else:
+				prop = store.customProperty(key)
+				if prop:
+					prop.setValue(value)
+				else:
+					store.addCustomProperty(key, value)
+		if entry is not None:
+			# Reading the properties back rather than guessing how the store converted the values.
+			entry[1] = None
+
 	def _close(self):
 		if self._saveScheduled:
 			self._saveScheduled = False
@@ -318,6 +562,69 @@ class AbstractFileProps(AbstractUserProps):
 		self.dso().close()
 		self._closeScheduled = False
 
+	def _createStore(self):
+		if self.storeClass is not None:
+			return self.storeClass()
+		from cross3d.migrate import dsofile
+		return dsofile.DSOFile()
+
+	def _openStore(self):
+		"""
+		Returns the store opened on the file, from the pool if one is open.
+
+		"""
+		entry = self._poolEntry()
+		if entry is not None:
+			return entry[0]
+		pool = AbstractFileProps._pool
+		if pool is not None:
+			store = self._createStore()
+			if not store.open(self.fileName):
+				raise cross3d.Exceptions.FileNotDSO
+			while pool and len(pool) >= AbstractFileProps._poolSize:
+				pool.popitem(last=False)[1][0].close()
+			pool[self._poolKey()] = [store, None]
+			return store
+		if self.dso().open(self.fileName):
+			return self.dso()
+		raise cross3d.Exceptions.FileNotDSO
+
+	def _releaseStore(self, store, save=False):
+		"""
+		Saves the changes made to the store returned by _openStore if save is True and closes it, after
+		the current event when reading. Stores of the pool stay open.
+
+		"""
+		if self._poolEntry() is not None:
+			if save:
+				store.save()
+		elif save:
+			self._saveScheduled = True
+			self._close()
+		else:
+			self._scheduleClose()
+
+	def _poolEntry(self):
+		"""
+		Returns the [store, properties] entry of the file in the pool, marking it as the most recently
+		used, or None.
+
+		"""
+		pool = AbstractFileProps._pool
+		if pool is None:
+			return None
+		key = self._poolKey()
+		entry = pool.pop(key, None)
+		if entry is not None:
+			pool[key] = entry
+		return entry
+
+	def _poolKey(self):
+		return os.path.normcase(os.path.abspath(self.fileName))
+
+	def _readValues(self, store):
+		return dict([(prop.name(), prop.value()) for prop in store.customProperties()])
+
 	def _scheduleClose(self, save=False):
 		if save:
 			self._saveScheduled = save
@@ -325,17 +632,33 @@ class AbstractFileProps(AbstractUserProps):
 			_QTimer.singleShot(0, self._close)
 			self._closeScheduled = True
 
-	def clear(self):
+	def _values(self):
 		"""
-		Removes all attributes and immediately saves the changes. There is no QTimer delay.
+		Returns the stored values by key. In a session this is the dictionary the changes are made to.
+
 		"""
-		if self.dso().open(self.fileName):
-			self.dso().clear()
-			self._saveScheduled = True
-			self._close()
-			self.emitChange()
+		if self._sessionValues is not None:
+			return self._sessionValues
+		store = self._openStore()
+		entry = self._poolEntry()
+		if entry is not None:
+			if entry[1] is None:
+				entry[1] = self._readValues(store)
+			values = dict(entry[1])
 		else:
-			raise cross3d.Exceptions.FileNotDSO
+			values = self._readValues(store)
+		if self._batchDepth:
+			# The store stays open until the session exits.
+			self._sessionValues = values
+		elif entry is None:
+			self._releaseStore(store)
+		return values
+
+	def clear(self):
+		"""
+		Removes all attributes and immediately saves the changes unless in a session. There is no QTimer delay.
+		"""
+		self._change(dict([(key, self._REMOVED) for key in self._values()]))
 
 	def close(self):
 		"""
@@ -346,33 +669,75 @@ class AbstractFileProps(AbstractUserProps):
 		else:
 			raise cross3d.Exceptions.FileNotDSO
 
+	@classmethod
+	def closePool(cls):
+		"""
+		Closes the stores kept open by the pool, see pool.
+		"""
+		pool = AbstractFileProps._pool
+		while pool:
+			pool.popitem(last=False)[1][0].close()
+
 	def dso(self):
 		if not self._dso:
-			from cross3d.migrate import dsofile
-			self._dso = dsofile.DSOFile()
+			self._dso = self._createStore()
 		return self._dso
 
+	def get(self, key, default=None):
+		values = self._values()
+		if key in values:
+			return self.unescapeValue(values[key])
+		return default
+
+	def has_key(self, key):
+		return key in self._values()
+
+	def keys(self):
+		return self._values().keys()
+
 	def lookupProps(self):
-		dso = self.dso()
-		if self.dso().open(self.fileName):
-			self._scheduleClose()
-			ret = {}
-			[ret.update({prop.name(): self.unescapeValue(prop.value())}) for prop in self.dso().customProperties()]
-			return ret
-		else:
-			raise cross3d.Exceptions.FileNotDSO
+		return dict([(key, self.unescapeValue(value)) for key, value in self._values().iteritems()])
+
+	def pop(self, key, default=None):
+		values = self._values()
+		if key not in values:
+			return default
+		value = self.unescapeValue(values[key])
+		del self[key]
+		return value
+
+	@classmethod
+	@contextmanager
+	def pool(cls, size=32):
+		"""
+		Keeps up to size files open while in the with block, reading the properties of each once.
+		Changes are saved as they are made but changes made to the files by other processes are not
+		seen until the pool is closed.
+
+		"""
+		previous = AbstractFileProps._pool, AbstractFileProps._poolSize
+		if AbstractFileProps._pool is None:
+			AbstractFileProps._pool = OrderedDict()
+		AbstractFileProps._poolSize = max(size, 1)
+		try:
+			yield
+		finally:
+			if previous[0] is None:
+				cls.closePool()
+			AbstractFileProps._pool, AbstractFileProps._poolSize = previous
+
+	def session(self):
+		"""
+		Returns a context manager opening the file once, the reads made in the with block return the
+		properties read when it was opened and the changes are saved once when it exits, see batch.
+		"""
+		return self.batch()
 
 	def update(self, *args, **kwargs):
 		"""
-		Adds all provided items and imedeately saves the changes. There is no QTimer delay.
+		Adds all provided items and immediately saves the changes unless in a session. There is no QTimer delay.
 		"""
-		if self.dso().open(self.fileName):
-			for k, v in dict(*args, **kwargs).iteritems():
-				self[k] = v
-			self._saveScheduled = True
-			self._close()
-		else:
-			raise cross3d.Exceptions.FileNotDSO
+		self._change(dict(*args, **kwargs))
 
 # register the symbol
 cross3d.registerSymbol('UserProps', AbstractUserProps, ifNotFound=True)
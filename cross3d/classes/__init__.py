@@ -8,12 +8,19 @@
 #	\date		06/08/11
 #
 
-from fcurve import FCurve
-from exceptions import Exceptions
-from dispatch import Dispatch
-from clipboard import Clipboard
-from valuerange import ValueRange
-from framerange import FrameRange
-from filesequence import FileSequence
-from timecode import Timecode
-from flipbook import FlipBook
+import sys
+from cross3d import _LazyModule
+
+# The classes are imported the first time they are accessed, Dispatch for instance requires Qt.
+sys.modules[__name__] = _LazyModule(sys.modules[__name__], {
+	'FCurve': 'fcurve',
+	'Exceptions': 'exceptions',
+	'Dispatch': 'dispatch',
+	'Clipboard': 'clipboard',
+	'ValueRange': 'valuerange',
+	'FrameRange': 'framerange',
+	'FrameRangeSet': 'framerangeset',
+	'FileSequence': 'filesequence',
+	'Timecode': 'timecode',
+	'FlipBook': 'flipbook',
+})
@@ -7,7 +7,13 @@ file operations, using a reference counter
 
 """
 
-from PyQt4.QtCore import pyqtSignal, QObject
+import inspect
+from timeit import default_timer
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+
+from PyQt4.QtCore import pyqtSignal, QObject, QTimer
 
 class Dispatch(QObject):
 	# scene signals
@@ -77,6 +83,10 @@ class Dispatch(QObject):
 
 	eventCalled = pyqtSignal(list)
 
+	# Emitted once per signal when its coalesced events are delivered, with the name of the signal and
+	# the list of the emitted arguments, see batch and setCoalesceWindow.
+	eventsCoalesced = pyqtSignal(str, list)
+
 	_instance = None
 
 	_isConnected = False
@@ -96,6 +106,14 @@ class Dispatch(QObject):
 			global cross3d
 			cls._instance._linkedSignals = {}
 			cls._instance._linkedTriggers = []
+			cls._instance._batchDepth = 0
+			cls._instance._coalesceWindows = {}
+			cls._instance._coalesceGenerations = {}
+			cls._instance._pendingEvents = OrderedDict()
+			cls._instance._coalesceStats = {}
+			cls._instance._profiling = False
+			cls._instance._profiledSlots = {}
+			cls._instance._handlerStats = {}
 			cls._process = None
 			import cross3d
 		return cls._instance
@@ -136,7 +154,7 @@ class Dispatch(QObject):
 		# connect the signal
 		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal'):
 			if not signal in self._functionSignals:
-				getattr(self, signal).connect(function)
+				getattr(self, signal).connect(self._profiledSlot(signal, function) if self._profiling else function)
 			# keep track of what signals are connected to dispatch
 			if signal in self._connections:
 				self._connections[signal].append(function)
@@ -160,8 +178,9 @@ class Dispatch(QObject):
 		"""
 		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal'):
 			if not signal in self._functionSignals:
+				slots = self._profiledSlots.get((signal, function))
 				try:
-					getattr(self, signal).disconnect(function)
+					getattr(self, signal).disconnect(slots.pop() if slots else function)
 				except TypeError:
 					pass
 			# remove the signal from the connections list
@@ -197,7 +216,10 @@ class Dispatch(QObject):
 		"""
 		if cross3d.application.shouldBlockSignal(signal, self.signalsBlocked()):
 			return
+		if not self._coalesce(self._emitDispatch, signal, args, args):
+			self._emitDispatch(signal, args)
 
+	def _emitDispatch(self, signal, args):
 		# emit a defined pyqtSignal
 		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal'):
 			getattr(self, signal).emit(*args)
@@ -211,6 +233,7 @@ class Dispatch(QObject):
 		if (signal in self._linkedSignals):
 			for trigger in self._linkedSignals[signal]:
 				self.dispatch(trigger)
+		return args
 
 	def dispatchFunction(self, signal):
 		"""
@@ -220,7 +243,10 @@ class Dispatch(QObject):
 		if signal in self._connections:
 			for fn in self._connections[signal]:
 				# call the function
-				fn()
+				if self._profiling:
+					self._callProfiled(signal, fn, ())
+				else:
+					fn()
 
 	def dispatchObject(self, signal, *args):
 		"""
@@ -230,20 +256,26 @@ class Dispatch(QObject):
 		"""
 		if cross3d.application.shouldBlockSignal(signal, self.signalsBlocked()):
 			return
+		if not self._coalesce(self._emitObject, signal, args, args[0] if args else None):
+			self._emitObject(signal, args)
 
+	def _emitObject(self, signal, args):
 		# emit a defined pyqtSignal
 		if (hasattr(self, signal) and type(getattr(self, signal)).__name__ == 'pyqtBoundSignal') and args[0]:
-			getattr(self, signal).emit(cross3d.SceneObject(cross3d.Scene.instance(), args[0]))
+			out = cross3d.SceneObject(cross3d.Scene.instance(), args[0])
+			getattr(self, signal).emit(out)
 
 		# otherwise emit a custom signal
 		else:
 			from PyQt4.QtCore import SIGNAL
 			self.emit(SIGNAL(signal), *args)
+			out = args
 
 		# emit linked signals
 		if (signal in self._linkedSignals):
 			for trigger in self._linkedSignals[signal]:
 				self.dispatch(trigger)
+		return out
 
 	def dispatchRename(self, signal, *args):
 		"""
@@ -260,9 +292,204 @@ class Dispatch(QObject):
 				oldName = args[0][0]
 				newName = args[0][1]
 				node = args[0][2]
-			if node:
-				so = cross3d.SceneObject(cross3d.Scene.instance(), node)
-				self.objectRenamed.emit(oldName, newName, so)
+			if node and not self._coalesce(self._emitRename, signal, (oldName, newName, node), node):
+				self._emitRename(signal, (oldName, newName, node))
+
+	def _emitRename(self, signal, args):
+		oldName, newName, node = args
+		so = cross3d.SceneObject(cross3d.Scene.instance(), node)
+		self.objectRenamed.emit(oldName, newName, so)
+		return (oldName, newName, so)
+
+	@contextmanager
+	def batch(self):
+		"""
+			\remarks	Coalesces the signals dispatched in the with block. The events of each signal are
+						deduplicated by native object, or by arguments for the signals that do not take an
+						object, and delivered when the outermost block exits. Each signal is then emitted
+						once per remaining event and eventsCoalesced is emitted once with the list of them.
+
+						with cross3d.dispatch.batch():
+							for obj in objects:
+								obj.setName(obj.name().replace('Box', 'Crate'))
+		"""
+		self._batchDepth += 1
+		try:
+			yield self
+		finally:
+			self._batchDepth -= 1
+			if not self._batchDepth:
+				self.flushEvents()
+
+	def _coalesce(self, emitter, signal, args, key):
+		"""
+			\remarks	Buffers the event if its signal is coalesced, returning whether it was.
+		"""
+		if not self._batchDepth and signal not in self._coalesceWindows:
+			return False
+		stats = self._coalesceStats.get(signal)
+		if stats is None:
+			stats = self._coalesceStats[signal] = [0, 0]
+		stats[0] += 1
+		events = self._pendingEvents.get(signal)
+		if events is None:
+			events = self._pendingEvents[signal] = OrderedDict()
+			if not self._batchDepth:
+				generation = self._coalesceGenerations.get(signal, 0)
+				QTimer.singleShot(self._coalesceWindows[signal], partial(self._flushSignal, signal, generation))
+		try:
+			hash(key)
+		except TypeError:
+			key = id(key)
+		previous = events.get(key)
+		if previous is not None:
+			stats[1] += 1
+			if emitter == self._emitRename:
+				# Keeping the name the object had before the first rename.
+				args = (previous[1][0],) + args[1:]
+		events[key] = (emitter, args)
+		return True
+
+	def _deliverEvents(self, signal):
+		events = self._pendingEvents.pop(signal, None)
+		if events:
+			# The window timers started for these events no longer have anything to deliver.
+			self._coalesceGenerations[signal] = self._coalesceGenerations.get(signal, 0) + 1
+			# Buffering the signals dispatched meanwhile, like linked signals, to deliver each once as well.
+			self._batchDepth += 1
+			try:
+				delivered = [emitter(signal, args) for emitter, args in events.itervalues()]
+			finally:
+				self._batchDepth -= 1
+			self.eventsCoalesced.emit(signal, delivered)
+
+	def _flushSignal(self, signal, generation=None):
+		if generation is not None and generation != self._coalesceGenerations.get(signal, 0):
+			return
+		if not self._batchDepth:
+			self._deliverEvents(signal)
+			self.flushEvents()
+
+	def coalesceStats(self):
+		"""
+			\remarks	Returns the amount of events received and the amount collapsed into other events by
+						signal since the last resetCoalesceStats, for the signals that were coalesced.
+			\return	<dict>	{signal: (received, collapsed)}
+		"""
+		return dict([(signal, tuple(stats)) for signal, stats in self._coalesceStats.iteritems()])
+
+	def coalesceWindow(self, signal):
+		"""
+			\remarks	Returns the window in milliseconds of a coalesced signal, see setCoalesceWindow, or None.
+		"""
+		return self._coalesceWindows.get(signal)
+
+	def flushEvents(self):
+		"""
+			\remarks	Delivers the coalesced events that are pending, in the order their signals were
+						first dispatched.
+		"""
+		while self._pendingEvents and not self._batchDepth:
+			self._deliverEvents(next(iter(self._pendingEvents)))
+
+	def resetCoalesceStats(self):
+		self._coalesceStats.clear()
+
+	def resetStats(self):
+		"""
+			\remarks	Clears the handler timings recorded while profiling, see setProfiling.
+		"""
+		self._handlerStats.clear()
+
+	def stats(self, reset=False):
+		"""
+			\remarks	Returns a snapshot of the handler timings recorded while profiling, see setProfiling, slowest
+						cumulative time first.
+
+						cross3d.dispatch.setProfiling(True)
+						...
+						for entry in cross3d.dispatch.stats()[:5]:
+							print '{signal} {handler}: {calls} calls, {totalTime:.3f}s, max {maxTime:.3f}s'.format(**entry)
+
+			\param		reset	<bool>	Clears the timings once they are returned.
+			\return		<list>	[{'signal', 'handler', 'function', 'calls', 'totalTime', 'maxTime', 'exceptions'}]
+		"""
+		out = []
+		for (signal, function), (calls, total, maximum, exceptions) in self._handlerStats.items():
+			out.append({
+				'signal': signal,
+				'handler': self._handlerName(function),
+				'function': function,
+				'calls': calls,
+				'totalTime': total,
+				'maxTime': maximum,
+				'exceptions': exceptions,
+			})
+		if reset:
+			self.resetStats()
+		out.sort(key=lambda entry: entry['totalTime'], reverse=True)
+		return out
+
+	def setCoalesceWindow(self, signal, msec=0):
+		"""
+			\remarks	Coalesces the events of a signal outside of batches as well, delivering them msec
+						milliseconds after the first one once the event loop runs, see batch.
+			\param		signal	<str>
+			\param		msec	<int>|None	None to stop coalescing the signal.
+		"""
+		if msec is None:
+			self._coalesceWindows.pop(signal, None)
+			self._flushSignal(signal)
+		else:
+			self._coalesceWindows[signal] = msec
+
+	def _callProfiled(self, signal, function, args):
+		key = (signal, function)
+		stats = self._handlerStats.get(key)
+		if stats is None:
+			# calls, cumulative time, maximum time, exceptions
+			stats = self._handlerStats[key] = [0, 0.0, 0.0, 0]
+		start = default_timer()
+		try:
+			return function(*args)
+		except Exception:
+			stats[3] += 1
+			raise
+		finally:
+			elapsed = default_timer() - start
+			stats[0] += 1
+			stats[1] += elapsed
+			if elapsed > stats[2]:
+				stats[2] = elapsed
+
+	def _profiledSlot(self, signal, function):
+		"""
+			\remarks	Returns a slot calling the function and recording its timing, which is connected in its place.
+		"""
+		# Like PyQt, only passing as many arguments as the function takes.
+		count = None
+		try:
+			spec = inspect.getargspec(function)
+		except TypeError:
+			pass
+		else:
+			if spec.varargs is None:
+				count = len(spec.args) - (1 if inspect.ismethod(function) and function.im_self is not None else 0)
+
+		def slot(*args):
+			return self._callProfiled(signal, function, args if count is None else args[:count])
+
+		self._profiledSlots.setdefault((signal, function), []).append(slot)
+		return slot
+
+	@staticmethod
+	def _handlerName(function):
+		if inspect.ismethod(function):
+			owner = function.im_class.__name__
+			return '%s.%s.%s' % (function.__module__, owner, function.__name__)
+		if hasattr(function, '__name__'):
+			return '%s.%s' % (getattr(function, '__module__', None) or '', function.__name__)
+		return repr(function)
 
 	def isConnected(self, signal=''):
 		"""
@@ -272,6 +499,9 @@ class Dispatch(QObject):
 			return self._isConnected
 		return signal in self._connections
 
+	def isProfiling(self):
+		return self._profiling
+
 	def linkSignals(self, signal, trigger):
 		"""
 			\remarks	creates a dependency so that when the inputed signal is dispatched, the dependent trigger signal is also dispatched.  This will only work
@@ -302,6 +532,34 @@ class Dispatch(QObject):
 	def process(self):
 		return self._process
 
+	def setProfiling(self, state):
+		"""
+			\remarks	Enables recording the calls, cumulative and maximum wall time and exceptions of each connected
+						function per signal, reported by stats. Functions are connected through a timing slot while
+						profiling, the connections are left untouched otherwise so profiling costs nothing when disabled.
+			\param		state	<bool>
+		"""
+		state = bool(state)
+		if state == self._profiling:
+			return
+		self._profiling = state
+		for signal, functions in self._connections.iteritems():
+			if signal in self._functionSignals:
+				continue
+			boundSignal = getattr(self, signal)
+			for function in functions:
+				try:
+					if state:
+						boundSignal.disconnect(function)
+						boundSignal.connect(self._profiledSlot(signal, function))
+					else:
+						boundSignal.disconnect(self._profiledSlots[(signal, function)].pop())
+						boundSignal.connect(function)
+				except TypeError:
+					pass
+		if not state:
+			self._profiledSlots.clear()
+
 	def setProcess(self, process):
 		self._process = process
 		self._process.start()
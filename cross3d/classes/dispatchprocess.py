@@ -2,70 +2,219 @@
 #	\namespace	cross3d.classes.dispatchprocess
 #
 #	\remarks	Responsible for handling processing of events in a secondary thread
-#	
+#
 #	\author		Mikeh
 #	\author		Blur Studio
 #	\date		06/09/11
 #
 
-from PyQt4.QtCore import QThread
 import time
+import Queue
+import threading
+from contextlib import contextmanager
+
+from PyQt4.QtCore import QThread, Qt, pyqtSignal
 
 class DispatchProcess(QThread):
-	def __init__(self, parent = None):
+	"""
+		\remarks	Queues the events of the application and hands them to the main thread in batches.
+
+					Events are put in a bounded queue by processEvent, which returns immediately. The
+					thread blocks until events are queued, drains up to batchSize of them at once and
+					emits eventsReady. eventsReady is connected to deliverEvents through a queued
+					connection, so the main thread dispatches the batches, coalesced in a Dispatch.batch,
+					the next time its event loop runs. deliverEvents can also be called directly.
+
+					When the queue is full the overflow policy applies: OverflowDropOldest discards the
+					oldest queued event, OverflowDropNewest the event being queued and OverflowBlock
+					waits for room, which must not be used by the thread calling deliverEvents.
+	"""
+
+	OverflowDropOldest = 'dropOldest'
+	OverflowDropNewest = 'dropNewest'
+	OverflowBlock = 'block'
+
+	# Emitted by the thread when batches of events are ready to be delivered.
+	eventsReady = pyqtSignal()
+
+	_STOP = object()
+
+	def __init__(self, parent = None, dispatch = None, maxDepth = 10000, overflow = OverflowDropOldest, batchSize = 256):
+		"""
+			\param		dispatch	<cross3d.Dispatch>	The object the events are dispatched to, cross3d.dispatch if None.
+			\param		maxDepth	<int>	The amount of events the queue holds.
+			\param		overflow	<str>	What to do with events queued when the queue is full.
+			\param		batchSize	<int>	The maximum amount of events handed to the main thread at once.
+		"""
+		# Set first so __del__ has nothing to stop if the arguments are invalid.
+		self.exiting = True
 		QThread.__init__(self, parent)
+		if overflow not in (self.OverflowDropOldest, self.OverflowDropNewest, self.OverflowBlock):
+			raise ValueError('Invalid overflow policy: %s' % overflow)
+		if dispatch is None:
+			from cross3d import dispatch
 		self.exiting = False
-		self._eventQueue = []
-		
+		self.overflow = overflow
+		self.batchSize = max(batchSize, 1)
+		self._dispatch = dispatch
+		self._eventQueue = Queue.Queue(max(maxDepth, 1))
+		self._readyBatches = Queue.Queue()
+		self._statsLock = threading.Lock()
+		self.resetStats()
+
 		# create connections to signals
-		global Dispatch, Scene, SceneObject
-		from cross3d	import dispatch
-		from cross3d import Scene, SceneObject
-		dispatch.eventCalled.connect(self.processEvent)
-	
+		self.eventsReady.connect(self.deliverEvents, Qt.QueuedConnection)
+		eventCalled = getattr(dispatch, 'eventCalled', None)
+		if eventCalled is not None:
+			eventCalled.connect(self.processEvent)
+
 	def __del__(self):
-		self.exiting = True
+		self.stop()
 		self.wait()
-	
+
 	def processEvent(self, event, *args):
 		"""
-			\remarks	processes the signals emited from the application creates any objects neccissary, and emits the proper cross3d.Dispatch signal.
-						This is designed to run in a secondary thread and emit signals that are processed on the main thread. It hopefully will create minimum
-						slowdown.
-			\param		event	<str>	Identifies the event type
-			\param		*args, **kwargs any properties that need processed and emited by the signals
+			\remarks	Queues an event emited from the application, to be emitted by the proper cross3d.Dispatch signal on the main thread.
+						This returns immediately unless the queue is full and the overflow policy is OverflowBlock.
+			\param		event	<str>	Identifies the event type, or a list of it followed by the arguments.
+			\param		*args any properties that need processed and emited by the signals
+			\return		<bool>	False if the event was dropped.
 		"""
-		print 'Processing event', event
-		self._eventQueue.append((event, args))
-	
-	
-	def dispatchEvent(self, signal, *args):
-		print 'Dispatching event', signal
-		if ( self.signalsBlocked() ):
-			return
-			
-		# emit a defined pyqtSignal
-		if ( hasattr(Dispatch,signal) and type(getattr(Dispatch,signal)).__name__ == 'pyqtBoundSignal' ):
-			# this should identify the object type before emiting it if it needs to emit something
-			getattr(Dispatch,signal).emit(SceneObject(Scene.instance(), args[0]))
-		
-		# elif process application specific signals like xsi's value changed
-		
-		# otherwise emit a custom signal
+		if isinstance(event, list):
+			event, args = event[0], tuple(event[1:]) + args
+		item = (event, args, time.time())
+		if self.overflow == self.OverflowBlock:
+			self._eventQueue.put(item)
 		else:
-			from PyQt4.QtCore import SIGNAL
-			self.emit( SIGNAL( signal ), *args )
-		
-		# emit linked signals
-		if ( signal in self._linkedSignals ):
-			for trigger in self._linkedSignals[signal]:
-				self.dispatch( trigger )
-	
+			while True:
+				try:
+					self._eventQueue.put_nowait(item)
+					break
+				except Queue.Full:
+					if self.overflow == self.OverflowDropNewest:
+						self._recordDrop(event)
+						return False
+					try:
+						dropped = self._eventQueue.get_nowait()
+					except Queue.Empty:
+						continue
+					if dropped is self._STOP:
+						# The thread is stopping, this event would not be handed over anyway.
+						self._eventQueue.put(dropped)
+						self._recordDrop(event)
+						return False
+					self._recordDrop(dropped[0])
+		depth = self._eventQueue.qsize()
+		if depth > self._maxDepth:
+			self._maxDepth = depth
+		return True
+
+	def _recordDrop(self, event):
+		with self._statsLock:
+			self._signalStats(event)[1] += 1
+
+	def _signalStats(self, signal):
+		stats = self._stats.get(signal)
+		if stats is None:
+			# delivered, dropped, total latency, maximum latency
+			stats = self._stats[signal] = [0, 0, 0.0, 0.0]
+		return stats
+
+	def deliverEvents(self):
+		"""
+			\remarks	Dispatches the batches of events handed over by the thread, on the calling thread, which should be the main thread.
+			\return		<int>	The amount of events delivered.
+		"""
+		batches = []
+		while True:
+			try:
+				batches.append(self._readyBatches.get_nowait())
+			except Queue.Empty:
+				break
+		if not batches:
+			return 0
+		with self._coalesced():
+			for batch in batches:
+				for signal, args, queued in batch:
+					self._dispatch.dispatchObject(signal, *args)
+		delivered = time.time()
+		count = 0
+		with self._statsLock:
+			for batch in batches:
+				count += len(batch)
+				for signal, args, queued in batch:
+					stats = self._signalStats(signal)
+					latency = delivered - queued
+					stats[0] += 1
+					stats[2] += latency
+					if latency > stats[3]:
+						stats[3] = latency
+		return count
+
+	@contextmanager
+	def _coalesced(self):
+		batch = getattr(self._dispatch, 'batch', None)
+		if batch is None:
+			yield
+		else:
+			with batch():
+				yield
+
+	def queueDepth(self):
+		"""
+			\remarks	Returns the amount of events queued and not yet handed to the main thread.
+		"""
+		return self._eventQueue.qsize()
+
+	def resetStats(self):
+		with self._statsLock:
+			self._stats = {}
+			self._maxDepth = 0
+
+	def stats(self):
+		"""
+			\remarks	Returns the queue depth, its maximum since the last resetStats and per signal the amount of events
+						delivered and dropped and their mean and maximum latency in seconds, from being queued to being dispatched.
+			\return		<dict>	{'depth': <int>, 'maxDepth': <int>, 'signals': {signal: {'delivered', 'dropped', 'meanLatency', 'maxLatency'}}}
+		"""
+		with self._statsLock:
+			signals = {}
+			for signal, (delivered, dropped, total, maximum) in self._stats.iteritems():
+				signals[signal] = {
+					'delivered': delivered,
+					'dropped': dropped,
+					'meanLatency': total / delivered if delivered else 0.0,
+					'maxLatency': maximum,
+				}
+			return {'depth': self.queueDepth(), 'maxDepth': self._maxDepth, 'signals': signals}
+
+	def stop(self):
+		"""
+			\remarks	Stops the thread once the events queued so far were handed to the main thread.
+		"""
+		if not self.exiting:
+			self.exiting = True
+			try:
+				self._eventQueue.put_nowait(self._STOP)
+			except Queue.Full:
+				# The thread exits once it emptied the queue.
+				pass
+
 	def run(self):
 		#process items in the queue
-		while not self.exiting:
-			if self._eventQueue:
-				item = self._eventQueue.pop(0)
-				self.dispatchEvent(item[0], item[1])
-			else:
-				time.sleep(0.05)
\ No newline at end of file
+		while not self.exiting or not self._eventQueue.empty():
+			item = self._eventQueue.get()
+			if item is self._STOP:
+				break
+			batch = [item]
+			while len(batch) < self.batchSize:
+				try:
+					item = self._eventQueue.get_nowait()
+				except Queue.Empty:
+					break
+				if item is self._STOP:
+					self._eventQueue.put(item)
+					break
+				batch.append(item)
+			self._readyBatches.put(batch)
+			self.eventsReady.emit()
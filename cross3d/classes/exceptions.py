@@ -60,3 +60,14 @@ class Exceptions:
 		""" Exception raised if you try to access a native pointer that is no longer valid
 		"""
 		pass
+
+	class FileOperationFailed(Blur3DException):
+		""" Exception raised if some files of a batch operation could not be processed.
+
+		The errors attribute holds an (item, exception) tuple for every file that failed.
+		"""
+		def __init__(self, errors):
+			self.errors = errors
+			item, error = errors[0]
+			self.message = '{count} file operation(s) failed, first error: {error}'.format(count=len(errors), error=error)
+			super(Exceptions.FileOperationFailed, self).__init__(self.message)
@@ -1,5 +1,9 @@
 import os
+import sys
 import math
+import array
+import bisect
+import struct
 import hashlib
 import xml.dom.minidom
 
@@ -41,14 +45,243 @@ class Key(object):
 		return self.time + x, self.value + y
 
 
+def _columnProperty(name):
+	def fget(self):
+		return self._store._columns[name][self._index].item()
+
+	def fset(self, value):
+		self._store.setValue(self._index, name, value)
+
+	return property(fget, fset)
+
+
+class KeyView(object):
+	""" A Key backed by a row of a KeyStore. It has the same attributes as Key but holds no data
+	of its own, setting an attribute writes through to the store.
+	"""
+	__slots__ = ('_store', '_index')
+
+	def __init__(self, store, index):
+		self._store = store
+		self._index = index
+
+	value = _columnProperty('value')
+	time = _columnProperty('time')
+	inTangentAngle = _columnProperty('inTangentAngle')
+	outTangentAngle = _columnProperty('outTangentAngle')
+	inTangentType = _columnProperty('inTangentType')
+	outTangentType = _columnProperty('outTangentType')
+	outTangentLength = _columnProperty('outTangentLength')
+	inTangentLength = _columnProperty('inTangentLength')
+	normalizedTangents = _columnProperty('normalizedTangents')
+	brokenTangents = _columnProperty('brokenTangents')
+
+	inTangentPoint = Key.inTangentPoint
+	outTangentPoint = Key.outTangentPoint
+
+
+class KeyStore(object):
+	""" Columnar storage for the keys of a FCurve.
+
+	Each Key attribute lives in its own typed numpy array, which costs about 50 bytes per key
+	instead of a full Python object per key. The store behaves like a read only list of KeyView
+	objects and exposes the columns for whole array operations.
+	"""
+
+	# Column name, numpy type, conversion and default value. This mirrors Key.__init__.
+	_COLUMNS = (
+		('value', 'float64', float, 0.0),
+		('time', 'float64', float, 0.0),
+		('inTangentAngle', 'float64', float, 0.0),
+		('outTangentAngle', 'float64', float, 0.0),
+		('inTangentType', 'int8', int, TangentType.Automatic),
+		('outTangentType', 'int8', int, TangentType.Automatic),
+		('outTangentLength', 'float64', float, 0.0),
+		('inTangentLength', 'float64', float, 0.0),
+		('normalizedTangents', 'bool', bool, True),
+		('brokenTangents', 'bool', bool, False),
+	)
+
+	def __init__(self, onChange=None):
+		"""
+		Args:
+			onChange(callable): Called without arguments every time a value is modified.
+		"""
+		import numpy as np
+		self._count = 0
+		self._onChange = onChange
+		self._columns = dict((name, np.empty(0, dtype=dtype)) for name, dtype, _, _ in self._COLUMNS)
+
+	@classmethod
+	def fromColumns(cls, columns, onChange=None):
+		""" Builds a store around existing arrays, keyed by column name. Arrays that already have
+		the right type are used as is, which keeps memory mapped columns lazy.
+		"""
+		import numpy as np
+		store = cls(onChange)
+		for name, dtype, _, _ in cls._COLUMNS:
+			column = np.asarray(columns[name]).astype(dtype, copy=False)
+			store._columns[name] = column if column.flags.writeable else column.copy()
+		store._count = len(store._columns['time'])
+		return store
+
+	@classmethod
+	def columnNames(cls):
+		return [column[0] for column in cls._COLUMNS]
+
+	def __len__(self):
+		return self._count
+
+	def __nonzero__(self):
+		return bool(self._count)
+
+	def __iter__(self):
+		for index in xrange(self._count):
+			yield KeyView(self, index)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [KeyView(self, i) for i in xrange(*index.indices(self._count))]
+		if index < 0:
+			index += self._count
+		if not 0 <= index < self._count:
+			raise IndexError('KeyStore index out of range.')
+		return KeyView(self, index)
+
+	def _reserve(self, count):
+		""" Grows the columns so they can hold at least count keys.
+		"""
+		import numpy as np
+		capacity = len(self._columns['time'])
+		if count > capacity:
+			capacity = max(count, capacity * 2, 16)
+			for name in self._columns:
+				column = self._columns[name]
+				grown = np.empty(capacity, dtype=column.dtype)
+				grown[:self._count] = column[:self._count]
+				self._columns[name] = grown
+
+	def addKey(self, **kwargs):
+		""" Appends a key built from the same keyword arguments as Key.
+		"""
+		self._reserve(self._count + 1)
+		for name, _, convert, default in self._COLUMNS:
+			self._columns[name][self._count] = convert(kwargs.get(name, default))
+		self._count += 1
+		self.changed()
+
+	def append(self, key):
+		""" Appends a copy of a Key or KeyView.
+		"""
+		self.addKey(**dict((name, getattr(key, name)) for name in self.columnNames()))
+
+	def column(self, name):
+		""" Returns a writable numpy view on the values of a key attribute. Call changed() after
+		writing to it.
+		"""
+		return self._columns[name][:self._count]
+
+	def setValue(self, index, name, value):
+		for column, _, convert, _ in self._COLUMNS:
+			if column == name:
+				self._columns[name][index] = convert(value)
+				self.changed()
+				return
+		raise AttributeError('Keys have no attribute {}.'.format(name))
+
+	def changed(self):
+		if self._onChange:
+			self._onChange()
+
 class FCurve(object):
 
+	# Binary curve files start with this magic string, see toBinary for the layout.
+	_BINARY_MAGIC = 'FCRV'
+	_BINARY_VERSION = 1
+	_BINARY_HEADER = struct.Struct('<4sHHQiiiI')
+	_BINARY_COLUMNS = (
+		('value', '<f8'),
+		('time', '<f8'),
+		('inTangentAngle', '<f8'),
+		('outTangentAngle', '<f8'),
+		('inTangentType', '<i1'),
+		('outTangentType', '<i1'),
+		('outTangentLength', '<f8'),
+		('inTangentLength', '<f8'),
+		('normalizedTangents', '?'),
+		('brokenTangents', '?'),
+	)
+	_ARRAY_TYPECODES = {'<f8': 'd', '<i1': 'b', '?': 'B'}
+
 	def __init__(self, **kwargs):
 		self._name = unicode(kwargs.get('name', ''))
 		self._type = int(kwargs.get('tpe', ControllerType.BezierFloat))
-		self._keys = []
+		self._keys = KeyStore(self.invalidate) if kwargs.get('columnar', False) else []
 		self._inExtrapolation = int(kwargs.get('inExtrapolation', ExtrapolationType.Constant))
 		self._outExtrapolation = int(kwargs.get('outExtrapolation', ExtrapolationType.Constant))
+		self.invalidate()
+
+	def invalidate(self):
+		""" Drops the cached key index, segment coefficients and digest.
+
+		Every FCurve method that modifies keys calls this for you. Call it yourself after editing
+		the Key objects returned by keys() in place.
+		"""
+		self._sortedKeys = None
+		self._sortedTimes = None
+		self._segments = {}
+		self._segmentArrays = None
+		self._digest = None
+
+	def _keyIndex(self):
+		""" Returns the keys sorted by time along with the matching list of times.
+		The index is built on first use and kept until the keys change.
+		"""
+		if self._sortedKeys is None:
+			self._sortedKeys = sorted(self._keys, key=lambda k: k.time)
+			self._sortedTimes = [key.time for key in self._sortedKeys]
+		return self._sortedKeys, self._sortedTimes
+
+	def _segment(self, index):
+		""" Returns the cached bezier coefficients of the segment starting at the sorted key index.
+		"""
+		coefficients = self._segments.get(index)
+		if coefficients is None:
+			sortedKeys = self._keyIndex()[0]
+			coefficients = self._bezierCoefficients(sortedKeys[index], sortedKeys[index + 1])
+			self._segments[index] = coefficients
+		return coefficients
+
+	def _arrays(self):
+		""" Returns numpy arrays of the sorted key times and values, and the (segments, 13) array
+		of bezier coefficients matching _bezierCoefficients. Built on first use, like _keyIndex.
+		"""
+		if self._segmentArrays is None:
+			import numpy as np
+			sortedKeys, sortedTimes = self._keyIndex()
+			times = np.array(sortedTimes, dtype=np.float64)
+			values = np.array([key.value for key in sortedKeys], dtype=np.float64)
+			k0, k1 = sortedKeys[:-1], sortedKeys[1:]
+			p0x, p0y = times[:-1], values[:-1]
+			p3x, p3y = times[1:], values[1:]
+			p1x, p1y = np.array([key.outTangentPoint for key in k0], dtype=np.float64).reshape(-1, 2).T
+			p2x, p2y = np.array([key.inTangentPoint for key in k1], dtype=np.float64).reshape(-1, 2).T
+
+			# Same math as _bezierCoefficients. Degenerate segments (duplicated key times) are never
+			# looked up, so their infinite or NaN coefficients are harmless.
+			with np.errstate(divide='ignore', invalid='ignore'):
+				totalXRecip = 1.0 / (p3x - p0x)
+				f = (p1x - p0x) * totalXRecip
+				g = (p3x - p2x)  * totalXRecip
+				d = 3*f + 3*g - 2
+				n = 2*f + g - 1
+				r = (n*n - f*d) / (d*d)
+				qBase = (3*f*d*n - 2*n*n*n) / (d*d*d)
+				rPositive = np.where(r > 0, r, np.nan)
+				coefficients = np.column_stack((p0x, totalXRecip, d, n/d, r, 4*r*r*r, qBase,
+					rPositive**0.5, rPositive**(3/2.0), p0y, p1y, p2y, p3y))
+			self._segmentArrays = (times, values, coefficients)
+		return self._segmentArrays
 
 	def valueAtTime(self, time):
 		"""Returns the value of the fcurve at the specified time
@@ -59,27 +292,84 @@ class FCurve(object):
 		Returns:
 		    float: value of the fcurve at the specified time.
 		"""
-		# we need to ensure keys is sorted properly for this to work.
-		sortedKeys = sorted(self._keys, key=lambda k: k.time)
+		sortedKeys, sortedTimes = self._keyIndex()
 		# If the time specified is out of the range of keyframes, we'll need to
 		# extrapolate to find the value.  This will be split into its own fn since
 		# it gets a bit messy.
-		if time < sortedKeys[0].time or time > sortedKeys[-1].time:
+		if time < sortedTimes[0] or time > sortedTimes[-1]:
 			return self.extrapolateValue(time)
-		i = 0
-		t = sortedKeys[i].time
-		maxI = len(sortedKeys) - 1
-		while t < time and i < maxI:
-			i += 1
-			t = sortedKeys[i].time
-		if t == time:
+		i = bisect.bisect_left(sortedTimes, time)
+		if sortedTimes[i] == time:
 			# time is at a key -- we can just return that key's value.
 			return sortedKeys[i].value
-		else:
-			# we should have two keys that our time falls between
-			k0 = sortedKeys[i - 1]
-			k1 = sortedKeys[i]
-			return self.bezierEvaluation(k0, k1, time)
+		# we should have two keys that our time falls between
+		return self._bezierSolve(self._segment(i - 1), time)
+
+	def valuesAtTimes(self, times):
+		"""Returns the values of the fcurve at all the specified times, computed with numpy.
+
+		This is the batch counterpart of valueAtTime and covers every extrapolation mode. Results
+		match valueAtTime within 1e-9 relative tolerance. Where valueAtTime raises on a degenerate
+		segment (for instance a negative cube root or a zero length cycle) the value is NaN.
+
+		Args:
+		    times (array_like): times at which to evaluate the fcurve.
+
+		Returns:
+		    numpy.ndarray: float64 array of values with the same shape as times.
+		"""
+		import numpy as np
+		times = np.asarray(times, dtype=np.float64)
+		keyTimes = self._arrays()[0]
+		values = np.empty(times.shape, dtype=np.float64)
+		undefined = np.isnan(times)
+		with np.errstate(invalid='ignore'):
+			before = times < keyTimes[0]
+			after = times > keyTimes[-1]
+		inside = ~(before | after | undefined)
+		values[undefined] = np.nan
+		values[inside] = self._valuesInRange(times[inside])
+		if before.any():
+			values[before] = self._extrapolateValues(times[before], True)
+		if after.any():
+			values[after] = self._extrapolateValues(times[after], False)
+		return values
+
+	def _valuesInRange(self, times):
+		""" Vectorized valueAtTime for a 1D array of times within the keyframed range.
+		"""
+		import numpy as np
+		keyTimes, keyValues, coefficients = self._arrays()
+		indices = np.searchsorted(keyTimes, times, side='left')
+		onKey = keyTimes[indices] == times
+		values = np.empty(times.shape, dtype=np.float64)
+		values[onKey] = keyValues[indices[onKey]]
+		between = ~onKey
+		if between.any():
+			values[between] = self._bezierSolveArray(coefficients[indices[between] - 1], times[between])
+		return values
+
+	@staticmethod
+	def _bezierSolveArray(coefficients, frames):
+		""" Vectorized _bezierSolve, solving each frame against its own row of coefficients.
+		"""
+		import numpy as np
+		p0x, totalXRecip, d, nOverD, r, r3, qBase, rSqrt, rPow, p0y, p1y, p2y, p3y = coefficients.T
+		with np.errstate(divide='ignore', invalid='ignore'):
+			xVal = (frames - p0x) * totalXRecip
+			q = qBase - xVal/d
+			discriminant = q*q - r3
+			real = discriminant >= 0
+
+			pm = np.where(real, discriminant, 0.0)**0.5/2
+			w = (-q/2 + pm)**(1/3.0)
+			theta = np.arccos(-q / ( 2*rPow) )
+			phi = theta/3 + 4*np.pi/3
+			u = np.where(real, w + r/w, 2 * rSqrt * np.cos(phi))
+
+			t = u + nOverD
+			t1 = 1-t
+			return (t1**3*p0y + 3*t1**2*t*p1y + 3*t1*t**2*p2y + t**3*p3y)
 
 	def plot(self, startValue=None, endValue=None, resolution=1.0, plotHandles=True):
 		"""Uses matplotlib to generate a plot of the curve, primarily useful for debugging purposes.
@@ -104,8 +394,7 @@ class FCurve(object):
 				plt.plot(*points, color='black')
 		# plot line
 		x = np.arange(startValue, endValue, resolution)
-		f = np.vectorize(self.valueAtTime)
-		plt.plot(x, f(x))
+		plt.plot(x, self.valuesAtTimes(x))
 		plt.show()
 
 	def plotted(self, rng, step=1):
@@ -114,16 +403,67 @@ class FCurve(object):
 			self.addKey(time=value, value=self.valueAtTime(value))
 		return plotted
 
+	def isColumnar(self):
+		""" Returns whether the keys are held in a KeyStore rather than a list of Key objects.
+		"""
+		return isinstance(self._keys, KeyStore)
+
+	def setColumnar(self, columnar=True):
+		""" Moves the keys to a KeyStore, or back to a list of Key objects.
+
+		Columnar curves use a fraction of the memory and transform their keys with whole array
+		operations. They require numpy.
+		"""
+		if columnar == self.isColumnar():
+			return
+		if columnar:
+			keys = KeyStore(self.invalidate)
+			for key in self._keys:
+				keys.append(key)
+		else:
+			keys = [Key(**dict((name, getattr(key, name)) for name in KeyStore.columnNames())) for key in self._keys]
+		self._keys = keys
+		self.invalidate()
+
+	def _columnData(self, name, dtype):
+		""" Returns the bytes of a key attribute for the binary curve format, in key order.
+		List backed curves use the array module so they do not need numpy.
+		"""
+		if self.isColumnar():
+			return self._keys.column(name).astype(dtype).tostring()
+		data = array.array(self._ARRAY_TYPECODES[dtype], [getattr(key, name) for key in self._keys])
+		if sys.byteorder == 'big':
+			data.byteswap()
+		return data.tostring()
+
+	@staticmethod
+	def _roundArray(array):
+		""" Rounds half away from zero in place, like the builtin round.
+		"""
+		import numpy as np
+		np.copysign(np.floor(np.abs(array) + 0.5), array, out=array)
+
 	def offset(self, value, attr='time', rnd=False):
+		if self.isColumnar():
+			column = self._keys.column(attr)
+			column += float(value)
+			if rnd:
+				self._roundArray(column)
+			self._keys.changed()
+			return
 		for key in self._keys:
 			v = getattr(key, attr) + float(value)
 			v = round(v) if rnd else v
 			setattr(key, attr, v)
+		self.invalidate()
 
 	def keys(self):
 		return self._keys
 
 	def scale(self, value, attr='time', pivot=0.0, rnd=False):
+		if self.isColumnar():
+			self._scaleColumns(value, attr, pivot, rnd)
+			return
 		for key in self._keys:
 
 			# Scaling the attribute.
@@ -151,6 +491,44 @@ class FCurve(object):
 			key.outTangentAngle = math.atan2(outTangentValue, outTangentTime)
 			key.outTangentLength = math.sqrt(outTangentValue**2 + outTangentTime**2)
 
+		self.invalidate()
+
+	def _scaleColumns(self, value, attr, pivot, rnd):
+		""" Whole array version of scale for columnar curves.
+		"""
+		import numpy as np
+		keys = self._keys
+		column = keys.column(attr)
+		column -= pivot
+		column *= value
+		column += pivot
+		if rnd:
+			self._roundArray(column)
+
+		inTangentAngle, inTangentLength = keys.column('inTangentAngle'), keys.column('inTangentLength')
+		outTangentAngle, outTangentLength = keys.column('outTangentAngle'), keys.column('outTangentLength')
+
+		# Getting the tangents time and value.
+		inTangentTime = np.cos(inTangentAngle) * inTangentLength
+		inTangentValue = np.sin(inTangentAngle) * inTangentLength
+		outTangentTime = np.cos(outTangentAngle) * outTangentLength
+		outTangentValue = np.sin(outTangentAngle) * outTangentLength
+
+		# Scaling the right tangent components.
+		if attr == 'time':
+			inTangentTime *= value
+			outTangentTime *= value
+		elif attr == 'value':
+			inTangentValue *= value
+			outTangentValue *= value
+
+		# Setting the tangent data on the keys.
+		inTangentAngle[:] = np.arctan2(inTangentValue, inTangentTime)
+		inTangentLength[:] = np.sqrt(inTangentValue**2 + inTangentTime**2)
+		outTangentAngle[:] = np.arctan2(outTangentValue, outTangentTime)
+		outTangentLength[:] = np.sqrt(outTangentValue**2 + outTangentTime**2)
+		keys.changed()
+
 	def remap(self, rng, attr='time', rnd=False):
 		start = getattr(self._keys[0], attr)
 		end = getattr(self._keys[-1], attr)
@@ -162,9 +540,14 @@ class FCurve(object):
 		self.offset(rng[0] - start, attr=attr, rnd=rnd)
 
 	def round(self, attr='time'):
+		if self.isColumnar():
+			self._roundArray(self._keys.column(attr))
+			self._keys.changed()
+			return
 		for key in self._keys:
 			v = getattr(key, attr)
 			setattr(key, attr, round(v))
+		self.invalidate()
 
 	def invert(self, conversionRatio=1.0):
 		""" Inverse time and values of each key.
@@ -180,17 +563,30 @@ class FCurve(object):
 		if conversionRatio and conversionRatio != 1.0:
 			self.scale(conversionRatio, attr='value')
 
-		for key in self._keys:
-			time = key.time
-			value = key.value
+		if self.isColumnar():
+			times, values = self._keys.column('time'), self._keys.column('value')
+			swap = times.copy()
+			times[:] = values
+			values[:] = swap
+			for name in ('inTangentAngle', 'outTangentAngle'):
+				angles = self._keys.column(name)
+				angles[:] = math.pi / 2.0 - angles
+			self._keys.changed()
+
+		else:
+			for key in self._keys:
+				time = key.time
+				value = key.value
+
+				# Swapping time and value.
+				key.time = value
+				key.value = time
 
-			# Swapping time and value.
-			key.time = value
-			key.value = time
+				# Flipping tangents based on a 45 degrees line.
+				key.inTangentAngle = math.pi / 2.0 - key.inTangentAngle
+				key.outTangentAngle = math.pi / 2.0 - key.outTangentAngle
 
-			# Flipping tangents based on a 45 degrees line.
-			key.inTangentAngle = math.pi / 2.0 - key.inTangentAngle
-			key.outTangentAngle = math.pi / 2.0 - key.outTangentAngle
+		self.invalidate()
 
 		# We revert the scale of the Y axis.
 		if conversionRatio and conversionRatio != 1.0:
@@ -207,6 +603,7 @@ class FCurve(object):
 	def setExtrapolation(self, extrapolation=[None, None]):
 		self._inExtrapolation = extrapolation[0] or self._inExtrapolation
 		self._outExtrapolation = extrapolation[1] or self._outExtrapolation
+		self._digest = None
 
 	def extrapolation(self):
 		return (self._inExtrapolation, self._outExtrapolation)
@@ -219,13 +616,18 @@ class FCurve(object):
 
 	def setType(self, tpe):
 		self._type = tpe
+		self._digest = None
 
 	def setName(self, name):
 		self._name = name
+		self._digest = None
 
 	def addKey(self, **kwargs):
-		key = Key(**kwargs)
-		self._keys.append(key)
+		if self.isColumnar():
+			self._keys.addKey(**kwargs)
+		else:
+			self._keys.append(Key(**kwargs))
+		self.invalidate()
 		return self._keys
 
 	def __len__(self):
@@ -235,21 +637,49 @@ class FCurve(object):
 		return bool(self.__len__())
 
 	def __eq__(self, other):
-		""" Allows to compare to fCurve objects.
+		""" Allows to compare to fCurve objects. Curves are equal when they have the same XML, keys
+		are compared at the 12 significant digits toXML writes through their cached digest.
 		"""
 		if isinstance(other, FCurve):
-
-			if cross3d.debugLevel >= cross3d.constants.DebugLevels.Mid:
-				with open(r'C:\temp\fCurve.xml', 'w') as fle:
-					fle.write(self.toXML())
-				with open(r'C:\temp\otherFCurve.xml', 'w') as fle:
-					fle.write(other.toXML())
-
-			return self.__hash__() == other.__hash__()
+			if other is self:
+				return True
+
+			# Cheap checks first, the digests are only computed for curves that could match.
+			if (len(self._keys) != len(other._keys) or self._type != other._type or
+				self.extrapolation() != other.extrapolation() or self._name != other._name):
+				return False
+			return self.digest() == other.digest()
 		return False
 
 	def __hash__(self):
-		return hashlib.sha224(self.toXML()).hexdigest()
+		return hash(self.digest())
+
+	def _keyData(self):
+		""" Returns the name, type, extrapolation and key attributes of the curve as a string, with
+		the values formatted at the precision of toXML.
+		"""
+		header = u'%s\0%i\0%i\0%i\0%i' % (self._name, self._type, self._inExtrapolation,
+			self._outExtrapolation, len(self._keys))
+		chunks = [header.encode('utf-8')]
+		for name in KeyStore.columnNames():
+			if self.isColumnar():
+				import numpy as np
+				values = np.char.mod('%.12g', self._keys.column(name).astype(np.float64)).tolist()
+			else:
+				values = ['%.12g' % getattr(key, name) for key in self._keys]
+			chunks.append(' '.join(values))
+		return '\0'.join(chunks)
+
+	def digest(self):
+		""" Returns a SHA-224 hex digest of the name, type, extrapolation and key data, equal for
+		curves that are equal.
+
+		The digest is cached until the curve changes, which makes it a cheap cache key. Call
+		invalidate after editing the Key objects returned by keys() in place.
+		"""
+		if self._digest is None:
+			self._digest = hashlib.sha224(self._keyData()).hexdigest()
+		return self._digest
 
 	def __ne__(self, other):
 		return not self.__eq__(other)
@@ -273,7 +703,7 @@ class FCurve(object):
 		self._type = ControllerType.valueByLabel(fCurveElement.attribute('type'))
 		self._inExtrapolation = ExtrapolationType.valueByLabel(fCurveElement.attribute('inExtrapolation'))
 		self._outExtrapolation = ExtrapolationType.valueByLabel(fCurveElement.attribute('outExtrapolation'))
-		self._keys = []
+		self._keys = KeyStore(self.invalidate) if self.isColumnar() else []
 
 		for element in fCurveElement.children():
 
@@ -302,7 +732,9 @@ class FCurve(object):
 					'normalizedTangents': element.findChild('normalizedTangents').value() == 'True',
 					'brokenTangents': element.findChild('brokenTangents').value() == 'True'}
 
-				self._keys.append(Key(**kwargs))
+				self.addKey(**kwargs)
+
+		self.invalidate()
 
 	def toXML(self):
 		""" Translate the curve data into a XML.
@@ -340,18 +772,100 @@ class FCurve(object):
 
 		return document.toxml()
 
-	def write(self, path):
+	def toBinary(self):
+		""" Translate the curve data into the binary curve format.
+
+		The data starts with a little endian header (magic, version, header size, key count, type,
+		in and out extrapolation, name length), followed by the utf-8 name and one contiguous block
+		per key attribute in the order of _BINARY_COLUMNS. The name and every block are padded to
+		8 bytes so the columns can be memory mapped.
+
+		Returns:
+			str: The binary data for that curve.
+		"""
+		name = self._name.encode('utf-8')
+		chunks = [self._BINARY_HEADER.pack(self._BINARY_MAGIC, self._BINARY_VERSION,
+			self._BINARY_HEADER.size, len(self._keys), self._type, self._inExtrapolation,
+			self._outExtrapolation, len(name)), name]
+		for column, dtype in self._BINARY_COLUMNS:
+			chunks.append(self._columnData(column, dtype))
+		return ''.join(chunk + '\0' * (-len(chunk) % 8) for chunk in chunks)
+
+	def fromBinary(self, data):
+		""" Loads curve data from the binary curve format.
+
+		Args:
+			data(str): The data returned by toBinary.
+		"""
+		import numpy as np
+		self._loadBinary(np.frombuffer(data, dtype=np.uint8).copy())
+
+	def _loadBinary(self, buffer):
+		""" Loads curve data from a numpy uint8 array holding the binary curve format. Columnar
+		curves keep views on the buffer so a memory mapped file is only read as keys are accessed.
+		"""
+		import numpy as np
+		header = self._BINARY_HEADER.unpack(buffer[:self._BINARY_HEADER.size].tostring())
+		magic, version, headerSize, count, tpe, inExtrapolation, outExtrapolation, nameLength = header
+		if magic != self._BINARY_MAGIC:
+			raise ValueError('The data is not a binary fCurve.')
+		if version > self._BINARY_VERSION:
+			raise ValueError('Binary fCurve version {} is not supported.'.format(version))
+
+		offset = headerSize
+		self._name = buffer[offset:offset + nameLength].tostring().decode('utf-8')
+		offset += nameLength + (-nameLength % 8)
+		columns = {}
+		for name, dtype in self._BINARY_COLUMNS:
+			size = count * np.dtype(dtype).itemsize
+			columns[name] = buffer[offset:offset + size].view(dtype)
+			offset += size + (-size % 8)
+
+		self._type = tpe
+		self._inExtrapolation = inExtrapolation
+		self._outExtrapolation = outExtrapolation
+		if self.isColumnar():
+			self._keys = KeyStore.fromColumns(columns, self.invalidate)
+		else:
+			names = KeyStore.columnNames()
+			values = zip(*[columns[name].tolist() for name in names])
+			self._keys = [Key(**dict(zip(names, row))) for row in values]
+		self.invalidate()
+
+	def write(self, path, binary=False):
+		""" Writes the curve to a file.
+
+		Args:
+			path(str): The file to write.
+			binary(bool): Write the binary curve format instead of XML. Defaults to False.
+		"""
 		if path and isinstance(path, basestring):
 			dirname = os.path.dirname(path)
 			if not os.path.exists(dirname):
 				os.makedirs(dirname)
 
-			with open(path, 'w') as fle:
-				fle.write(self.toXML())
+			if binary:
+				with open(path, 'wb') as fle:
+					fle.write(self.toBinary())
+			else:
+				with open(path, 'w') as fle:
+					fle.write(self.toXML())
 
 	def read(self, path):
-		with open(path) as fle:
-			self.fromXML(fle.read())
+		""" Reads a curve file written by write, detecting whether it is binary or XML.
+
+		Binary files are memory mapped. On a columnar curve the keys are then only read from disk
+		as they are accessed, and the file stays open while the curve uses it.
+		"""
+		with open(path, 'rb') as fle:
+			binary = fle.read(len(self._BINARY_MAGIC)) == self._BINARY_MAGIC
+		if binary:
+			import numpy as np
+			# Copy on write, editing the keys never modifies the file.
+			self._loadBinary(np.memmap(path, dtype=np.uint8, mode='c'))
+		else:
+			with open(path) as fle:
+				self.fromXML(fle.read())
 		return True
 
 	def extrapolateValue(self, time):
@@ -364,7 +878,7 @@ class FCurve(object):
 		Returns:
 		    float: Extrapolated value for the curve at the specified time.
 		"""
-		sortedKeys = sorted(self._keys, key=lambda k: k.time)
+		sortedKeys = self._keyIndex()[0]
 		if time >= sortedKeys[0].time and time <= sortedKeys[-1].time:
 			raise ValueError('Unable to extrapolate value for time within keyframed curve.')
 		t0, t1 = sortedKeys[0].time, sortedKeys[-1].time
@@ -445,6 +959,72 @@ class FCurve(object):
 		else:
 			raise ValueError('Unable to extrapolate values: invalid ExtrapolationType found.')
 
+	def _extrapolateValues(self, times, before):
+		"""Vectorized extrapolateValue for a 1D array of times that are all before (or all after)
+			the range of keyframes.
+
+		Args:
+		    times (numpy.ndarray): times at which to calculate the curve's value
+		    before (bool): whether the times are before the first keyframe.
+
+		Returns:
+		    numpy.ndarray: Extrapolated values for the curve at the specified times.
+		"""
+		import numpy as np
+		sortedKeys = self._keyIndex()[0]
+		t0, t1 = sortedKeys[0].time, sortedKeys[-1].time
+		dt = t1 - t0
+		if before:
+			mode = self._inExtrapolation
+			dtx = t0 - times
+		else:
+			mode = self._outExtrapolation
+			dtx = times - t1
+		if mode == ExtrapolationType.Constant:
+			return np.full(times.shape, sortedKeys[0].value if before else sortedKeys[-1].value)
+
+		elif mode == ExtrapolationType.Linear:
+			v = sortedKeys[0].value if before else sortedKeys[-1].value
+			tangentLength = sortedKeys[0].outTangentLength if before else sortedKeys[-1].inTangentLength
+			if tangentLength:
+				# See extrapolateValue, we move along the inverse of the opposite tangent.
+				theta = sortedKeys[0].outTangentAngle if before else sortedKeys[-1].inTangentAngle
+				theta = math.pi - theta
+				return dtx * math.tan(theta) + v
+			if len(sortedKeys) == 1:
+				return np.full(times.shape, sortedKeys[0].value)
+			if before:
+				x = sortedKeys[1].time - sortedKeys[0].time
+				y = sortedKeys[0].value - sortedKeys[1].value
+				offset = sortedKeys[0].value
+			else:
+				x = sortedKeys[-1].time - sortedKeys[-2].time
+				y = sortedKeys[-1].value - sortedKeys[-2].value
+				offset = sortedKeys[-1].value
+			return (y / x) * dtx + offset
+
+		elif mode in (ExtrapolationType.Cycled, ExtrapolationType.CycledWithOffset, ExtrapolationType.PingPong):
+			# A single key curve has a zero length cycle, every value will be NaN.
+			with np.errstate(divide='ignore', invalid='ignore'):
+				tp = np.mod(dtx, dt)
+				repetitions = np.floor(dtx / dt)
+				offset = 0.0
+				if mode == ExtrapolationType.PingPong:
+					# Reverse the looping direction with each cycle, as extrapolateValue does.
+					oddRep = (repetitions % 2) == 0
+					tp = np.where(oddRep != before, dt - tp, tp)
+				else:
+					if before:
+						tp = dt - tp
+					if mode == ExtrapolationType.CycledWithOffset:
+						offset = (repetitions + 1) * (sortedKeys[-1].value - sortedKeys[0].value)
+						offset *= (-1 if before else 1)
+			# Recurse through valuesAtTimes like extrapolateValue does through valueAtTime, float
+			# error may land a sample just outside of the keyframed range.
+			return self.valuesAtTimes(tp + t0) + offset
+		else:
+			raise ValueError('Unable to extrapolate values: invalid ExtrapolationType found.')
+
 	@staticmethod
 	def bezierEvaluation(key0, key1, frame):
 		"""Finds the point on a cubic bezier spline at time frame between two keys.
@@ -458,6 +1038,19 @@ class FCurve(object):
 		    Tuple: Tuple of float values for the x (time) and y (value) coordinates of the resulting
 		    		point.
 		"""
+		return FCurve._bezierSolve(FCurve._bezierCoefficients(key0, key1), frame)
+
+	@staticmethod
+	def _bezierCoefficients(key0, key1):
+		"""Computes the part of the bezier evaluation that only depends on the two keys.
+
+		Args:
+		    key0 (Key): Starting key for the spline
+		    key1 (Key): Ending key for the spline
+
+		Returns:
+		    tuple: Coefficients to pass to _bezierSolve.
+		"""
 		# Implementation by Tyler Fox, modified by Will Cavanagh.
 		# Based on method described at
 		# http://edmund.birotanker.com/monotonic-bezier-curves-for-animation.html
@@ -469,14 +1062,33 @@ class FCurve(object):
 		totalXRecip = 1.0 / (p3x - p0x)
 		f = (p1x - p0x) * totalXRecip
 		g = (p3x - p2x)  * totalXRecip
-		xVal = (frame - p0x) * totalXRecip
 
 		d = 3*f + 3*g - 2
 		n = 2*f + g - 1
 		r = (n*n - f*d) / (d*d)
-		q = ((3*f*d*n - 2*n*n*n) / (d*d*d)) - xVal/d
+		qBase = (3*f*d*n - 2*n*n*n) / (d*d*d)
+
+		# The trigonometric branch of the solve is only reached when r is positive.
+		rSqrt = r**(0.5) if r > 0 else None
+		rPow = r**(3/2.0) if r > 0 else None
+		return (p0x, totalXRecip, d, n/d, r, 4*r*r*r, qBase, rSqrt, rPow, p0y, p1y, p2y, p3y)
+
+	@staticmethod
+	def _bezierSolve(coefficients, frame):
+		"""Solves a segment whose coefficients were computed by _bezierCoefficients at time frame.
+
+		Args:
+		    coefficients (tuple): Coefficients returned by _bezierCoefficients.
+		    frame (float): Time (as a frame) to solve for
+
+		Returns:
+		    float: The value of the segment at the specified time.
+		"""
+		p0x, totalXRecip, d, nOverD, r, r3, qBase, rSqrt, rPow, p0y, p1y, p2y, p3y = coefficients
+		xVal = (frame - p0x) * totalXRecip
+		q = qBase - xVal/d
 
-		discriminant = q*q - 4*r*r*r
+		discriminant = q*q - r3
 
 		if discriminant >= 0:
 			pm = (discriminant**0.5)/2 #plus/minus portion of equation
@@ -485,10 +1097,10 @@ class FCurve(object):
 			w = (-q/2 + pm)**(1/3.0)
 			u = w + r/w
 		else:
-			theta = math.acos(-q / ( 2*r**(3/2.0)) )
+			theta = math.acos(-q / ( 2*rPow) )
 			phi = theta/3 + 4*math.pi/3 
-			u = 2 * r**(0.5) * math.cos(phi)
+			u = 2 * rSqrt * math.cos(phi)
 
-		t = u + n/d
+		t = u + nOverD
 		t1 = 1-t
 		return (t1**3*p0y + 3*t1**2*t*p1y + 3*t1*t**2*p2y + t**3*p3y)
@@ -0,0 +1,232 @@
+##
+#	\namespace	cross3d.classes.fileoperations
+#
+#	\remarks	This module defines the FileOperations class that runs batches of file copies, moves,
+#				links and deletions on a bounded pool of threads.
+#
+#	\author		Blur Studio
+#
+
+#------------------------------------------------------------------------------------------------------------------------
+
+import os
+import sys
+import errno
+import Queue
+import shutil
+import threading
+
+from exceptions import Exceptions
+
+#------------------------------------------------------------------------------------------------------------------------
+
+# ioctl request cloning a whole file on Linux filesystems supporting reflinks (btrfs, xfs...).
+_FICLONE = 0x40049409
+
+# Errors meaning a link or clone is not possible between two locations, in which case we copy.
+_UNSUPPORTED = (errno.EXDEV, errno.EPERM, errno.EINVAL, errno.ENOTTY, errno.EOPNOTSUPP, errno.ENOSYS)
+
+
+class FileOperations(object):
+	""" Runs file operations on a bounded pool of threads.
+
+	File operations on network storage are bound by latency, running them concurrently speeds them
+	up almost linearly. Every method takes a list of paths or (source, destination) pairs, keeps
+	going when a file fails and raises Exceptions.FileOperationFailed at the end if any did.
+
+	Example:
+		operations = FileOperations(workers=16, progress=lambda done, total: ...)
+		operations.copy(zip(sources, destinations))
+	"""
+
+	# Amount of threads used when none is provided.
+	defaultWorkers = 8
+
+	def __init__(self, workers=None, progress=None):
+		"""
+		Args:
+			workers(int): The maximum amount of files processed at the same time.
+			progress(callable): Called as progress(done, total) on the calling thread after each file.
+		"""
+		self._workers = max(1, workers or self.defaultWorkers)
+		self._progress = progress
+		# These are turned off the first time the filesystem refuses them, to avoid paying for a
+		# failed attempt on every file.
+		self._reflink = sys.platform.startswith('linux')
+		self._hardLink = True
+
+	def workers(self):
+		return self._workers
+
+	def run(self, function, items):
+		""" Calls function(*item) for each item using the pool.
+
+		Args:
+			function(callable): The operation to run.
+			items(list): The arguments of each call, as tuples.
+
+		Raises:
+			Exceptions.FileOperationFailed: Once every item was processed, if any of them failed.
+				Exceptions that do not derive from Exception, like KeyboardInterrupt, are raised as
+				they are instead.
+		"""
+		items = list(items)
+		total = len(items)
+		if not total:
+			return
+
+		pending = Queue.Queue()
+		for item in items:
+			pending.put(item)
+		results = Queue.Queue()
+
+		def work():
+			while True:
+				try:
+					item = pending.get_nowait()
+				except Queue.Empty:
+					return
+				try:
+					function(*item)
+					results.put((item, None))
+				except BaseException as e:
+					# Every item must put a result, or the collection below would wait forever.
+					results.put((item, e))
+
+		threads = [threading.Thread(target=work) for i in xrange(min(self._workers, total))]
+		for thread in threads:
+			thread.daemon = True
+			thread.start()
+
+		# Results are collected here so the progress callback runs on the calling thread.
+		errors = []
+		for done in xrange(1, total + 1):
+			item, error = results.get()
+			if error is not None:
+				errors.append((item, error))
+			if self._progress:
+				self._progress(done, total)
+
+		for thread in threads:
+			thread.join()
+		for item, error in errors:
+			# Interruptions like KeyboardInterrupt and SystemExit are raised as they are.
+			if not isinstance(error, Exception):
+				raise error
+		if errors:
+			raise Exceptions.FileOperationFailed(errors)
+
+	def copy(self, pairs, hardLink=False, metadata=False):
+		""" Copies each source to its destination.
+
+		When possible files are cloned with a reflink, which is as fast as a link but safe to modify.
+
+		Args:
+			pairs(list): (source, destination) tuples.
+			hardLink(bool): Hard link the destinations to the sources when the filesystem allows it.
+				Only use this if neither file will be modified in place. Defaults to False.
+			metadata(bool): Also copy the modification times like shutil.copy2. Defaults to False.
+		"""
+		self.run(lambda source, destination: self._copy(source, destination, hardLink, metadata), pairs)
+
+	def move(self, pairs):
+		""" Moves each source to its destination, renaming when they are on the same filesystem.
+		"""
+		self.run(self._move, pairs)
+
+	def link(self, pairs):
+		""" Creates a symbolic link at each destination pointing to its source.
+		"""
+		self.run(self._symlink, pairs)
+
+	def delete(self, paths):
+		""" Deletes the files, paths that do not exist are ignored.
+		"""
+		self.run(self._remove, [(path,) for path in paths])
+
+	def _copy(self, source, destination, hardLink=False, metadata=False):
+		if hardLink and self._hardLink:
+			try:
+				try:
+					self._createHardLink(source, destination)
+				except EnvironmentError as e:
+					# Like copies, links replace existing files.
+					if e.errno != errno.EEXIST:
+						raise
+					os.remove(destination)
+					self._createHardLink(source, destination)
+				return
+			except EnvironmentError as e:
+				if e.errno not in _UNSUPPORTED:
+					raise
+				self._hardLink = False
+		# The destination is replaced rather than written through, as it may be a link to another
+		# file. Copying a file onto itself is left to shutil to report.
+		if os.path.normcase(os.path.abspath(source)) != os.path.normcase(os.path.abspath(destination)):
+			self._remove(destination)
+		if self._reflink:
+			try:
+				self._clone(source, destination)
+				if metadata:
+					shutil.copystat(source, destination)
+				else:
+					shutil.copymode(source, destination)
+				return
+			except EnvironmentError as e:
+				if e.errno not in _UNSUPPORTED:
+					raise
+				self._reflink = False
+		if metadata:
+			shutil.copy2(source, destination)
+		else:
+			shutil.copy(source, destination)
+
+	def _move(self, source, destination):
+		try:
+			os.rename(source, destination)
+		except OSError as e:
+			# Windows does not replace existing files and renames do not work across devices.
+			if e.errno not in (errno.EXDEV, errno.EEXIST):
+				raise
+			self._copy(source, destination, metadata=True)
+			os.remove(source)
+
+	@staticmethod
+	def _remove(path):
+		try:
+			os.remove(path)
+		except OSError as e:
+			if e.errno != errno.ENOENT:
+				raise
+
+	@staticmethod
+	def _clone(source, destination):
+		import fcntl
+		with open(source, 'rb') as sourceFile:
+			with open(destination, 'wb') as destinationFile:
+				try:
+					fcntl.ioctl(destinationFile.fileno(), _FICLONE, sourceFile.fileno())
+				except EnvironmentError:
+					destinationFile.close()
+					os.remove(destination)
+					raise
+
+	@staticmethod
+	def _createHardLink(source, destination):
+		if hasattr(os, 'link'):
+			os.link(source, destination)
+		else:
+			# Python 2 does not provide os.link on Windows.
+			import ctypes
+			if not ctypes.windll.kernel32.CreateHardLinkW(unicode(destination), unicode(source), None):
+				raise ctypes.WinError()
+
+	@staticmethod
+	def _symlink(source, destination):
+		if hasattr(os, 'symlink'):
+			os.symlink(source, destination)
+		else:
+			# Python 2 does not provide os.symlink on Windows.
+			import ctypes
+			if not ctypes.windll.kernel32.CreateSymbolicLinkW(unicode(destination), unicode(source), 0):
+				raise ctypes.WinError()
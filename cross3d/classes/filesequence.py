@@ -14,13 +14,16 @@ import os
 import re
 import copy
 import glob
-import shutil
+import fnmatch
+import stat
+import fractions
 import subprocess
 import time
 import warnings
 
 import cross3d
 from framerange import FrameRange
+from fileoperations import FileOperations
 from cross3d.constants import VideoCodec, PaddingStyle
 
 #------------------------------------------------------------------------------------------------------------------------
@@ -41,6 +44,13 @@ class FileSequence(object):
 
 	_regex = re.compile(r'^(?P<baseName>[A-Za-z0-9 _.\-\[\]]+?)((?P<separator>[^\da-zA-Z\[]?)\[?(?P<range>(?P<start>[0-9]+)[\-\:](?P<end>[0-9]+)))\]?(\.(?P<extension>[a-zA-Z0-9]+))$')
 
+	# Splits a frame file name like Path/Sequence.0001.abc, using the same name rules as _regex.
+	_frameRegex = re.compile(r'^(?P<baseName>[A-Za-z0-9 _.\-\[\]]+?)(?P<separator>[^\da-zA-Z\[]?)(?P<frame>[0-9]+)\.(?P<extension>[a-zA-Z0-9]+)$')
+
+	# Directory listings used by the existence checks, see setListingCacheTimeout.
+	_listingCache = {}
+	_listingCacheTimeout = 0
+
 	@classmethod
 	def fromFileName(cls, fileName, step=1):
 		"""
@@ -68,6 +78,101 @@ class FileSequence(object):
 			else:
 				return cls(fileName)
 
+	@classmethod
+	def scanDirectory(cls, path, recursive=False):
+		""" Lists a directory once and returns every file sequence it contains.
+
+		Files are grouped by base name, separator, extension and padding. Frame numbers longer than
+		the padding, like 1000 in a 0998-1001 sequence, join the padded sequence. The step is the
+		largest one matching every frame and frames missing from the range are reported by
+		missingFrames. Single frame files are returned as sequences of one frame.
+
+		Args:
+			path(str): The directory to scan.
+			recursive(bool): Also scan the sub directories. Defaults to False.
+
+		Returns:
+			list: The FileSequence objects sorted by path. Their frames method returns the frames
+			found by the scan without listing the directory again.
+		"""
+		sequences = []
+		for directory, fileNames in cls._listDirectories(path, recursive):
+			# Frames per (baseName, separator, extension), split by padding. A padding of 0 is
+			# used for numbers without leading zeros, which are compatible with any shorter padding.
+			groups = {}
+			for fileName in fileNames:
+				match = cls._frameRegex.match(fileName)
+				if not match:
+					continue
+				baseName, separator, number, extension = match.group('baseName', 'separator', 'frame', 'extension')
+				key = os.path.normcase(baseName + separator + '.' + extension)
+				padding = len(number) if len(number) > 1 and number[0] == '0' else 0
+				paddings = groups.setdefault(key, ((baseName, separator, extension), {}))[1]
+				paddings.setdefault(padding, set()).add(int(number))
+
+			for (baseName, separator, extension), paddings in groups.itervalues():
+				widths = sorted(padding for padding in paddings if padding)
+				for frame in paddings.pop(0, ()):
+					length = len(str(frame))
+					fitting = [width for width in widths if width <= length]
+					paddings.setdefault(fitting[-1] if fitting else 0, set()).add(frame)
+
+				for padding, frames in paddings.iteritems():
+					frames = sorted(frames)
+					steps = [b - a for a, b in zip(frames, frames[1:])]
+					step = reduce(fractions.gcd, steps) if steps else 1
+					fileName = '{}{}{}-{}.{}'.format(baseName, separator, str(frames[0]).zfill(padding), str(frames[-1]).zfill(padding), extension)
+					sequence = cls(os.path.join(directory, fileName), step)
+					sequence._scan = (sequence._path, frames)
+					sequences.append(sequence)
+
+		return sorted(sequences, key=lambda sequence: sequence.path())
+
+	@classmethod
+	def _listDirectories(cls, path, recursive=False):
+		""" Yields (directory, fileNames) for the directory and, if recursive, its sub directories.
+
+		Entries are not stated one by one. With scandir their types come with the listing, otherwise
+		names that cannot be frames are left to the frame regex of scanDirectory and only the other
+		names are checked for directories to descend into. Like os.walk, links to directories are
+		not followed.
+		"""
+		scandir = getattr(os, 'scandir', None)
+		if scandir is None:
+			try:
+				from scandir import scandir
+			except ImportError:
+				pass
+
+		directories = [path]
+		while directories:
+			directory = directories.pop()
+			subDirectories = []
+			if scandir is not None:
+				try:
+					entries = list(scandir(directory))
+				except OSError:
+					continue
+				fileNames = [entry.name for entry in entries if not entry.is_dir()]
+				if recursive:
+					subDirectories = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+			else:
+				try:
+					fileNames = os.listdir(directory)
+				except OSError:
+					continue
+				if recursive:
+					for name in fileNames:
+						if not cls._frameRegex.match(name):
+							subDirectory = os.path.join(directory, name)
+							try:
+								if stat.S_ISDIR(os.lstat(subDirectory).st_mode):
+									subDirectories.append(subDirectory)
+							except OSError:
+								pass
+			yield directory, fileNames
+			directories.extend(reversed(subDirectories))
+
 	@classmethod
 	def fromMovie(cls, inpt, output, padding=4, ffmpeg='ffmpeg', shell=False):
 		''' Output is a path like this "C:\Output.jpg
@@ -122,6 +227,8 @@ class FileSequence(object):
 		"""
 		self._path = unicode(self.buildPath(path, frameRange) if frameRange else path)
 		self._step = step
+		# The path and frames found by scanDirectory.
+		self._scan = None
 
 	@classmethod
 	def isValidSequencePath(cls, path):
@@ -293,69 +400,155 @@ class FileSequence(object):
 		start = self.start()
 		end = self.end()
 		if start <= frame <= end:
-			return self.uniquePath(PaddingStyle.Percent) % frame
+			return self._framePath(frame)
 		raise ValueError('The frame provided is outside the range of the FileSequence. {start}, {end}'.format(start=start, end=end))
 
+	def _framePath(self, frame):
+		# Padded like paths, the Percent style pads with spaces.
+		return os.path.join(self.basePath(), '{}{}{}.{}'.format(self.baseName(), self.separator(), str(frame).zfill(self.padding()), self.extension()))
+
 	def uniquePath(self, paddingStyle=None):
 		return os.path.join(self.basePath(), self.uniqueName(paddingStyle))
 
+	@classmethod
+	def setListingCacheTimeout(cls, seconds):
+		""" exists, existingPaths, isComplete and missingFrames read a single listing of the sequence
+		directory. Listings can be reused for the given amount of seconds as long as the directory
+		modification time does not change. The default of 0 lists the directory on every call.
+		"""
+		cls._listingCacheTimeout = seconds
+		cls._listingCache.clear()
+
+	@classmethod
+	def clearListingCache(cls):
+		cls._listingCache.clear()
+
+	@classmethod
+	def _listDirectory(cls, directory):
+		""" Returns the normcased names of the entries of a directory, empty if it does not exist.
+		"""
+		directory = os.path.abspath(directory or os.curdir)
+		timeout = cls._listingCacheTimeout
+		if timeout:
+			try:
+				mtime = os.stat(directory).st_mtime
+			except OSError:
+				return []
+			cached = cls._listingCache.get(directory)
+			if cached and cached[0] == mtime and time.time() - cached[1] < timeout:
+				return cached[2]
+		try:
+			names = [os.path.normcase(name) for name in os.listdir(directory)]
+		except OSError:
+			names = []
+		if timeout:
+			cls._listingCache[directory] = (mtime, time.time(), names)
+		return names
+
+	def existingFrames(self):
+		""" Returns the set of frames of the sequence that exist on disk, whether or not they are
+		within the range. Like paths, only file names using the sequence padding are considered.
+		"""
+		prefix = os.path.normcase(self.baseName() + self.separator())
+		suffix = os.path.normcase('.' + self.extension())
+		padding = self.padding()
+		frames = set()
+		for name in self._listDirectory(self.basePath()):
+			if len(name) > len(prefix) + len(suffix) and name.startswith(prefix) and name.endswith(suffix):
+				number = name[len(prefix):-len(suffix)]
+				try:
+					frame = int(number)
+				except ValueError:
+					continue
+				if str(frame).zfill(padding) == number:
+					frames.add(frame)
+		return frames
+
+	def frames(self):
+		""" Returns the sorted list of frames of the sequence that exist on disk. Sequences returned by
+		scanDirectory answer from their scan until their path is changed or their frames deleted.
+		"""
+		if self._scan and self._scan[0] == self._path:
+			return list(self._scan[1])
+		existingFrames = self.existingFrames()
+		return [frame for frame in range(self.start(), self.end() + 1, self._step) if frame in existingFrames]
+
 	def exists(self):
-		paths = glob.glob(os.path.join(self.basePath(), self.baseName() + self.nameToken('separator') + '*.' + self.extension()))
-		if len(paths) > 0:
-			return True
-		return False
+		pattern = os.path.normcase(self.baseName() + self.nameToken('separator') + '*.' + self.extension())
+		return bool(fnmatch.filter(self._listDirectory(self.basePath()), pattern))
 
 	def existingPaths(self):
-		existingPaths = []
-		for path in self.paths():
-			if os.path.exists(path):
-				existingPaths.append(path)
-		return existingPaths
+		existingFrames = self.existingFrames()
+		frames = range(self.start(), self.end() + 1, self._step)
+		return [path for frame, path in zip(frames, self.paths()) if frame in existingFrames]
 		
 	def paths(self):
-		paths = []
-		for frame in range(self.start(), self.end() + 1, self._step):
-			name = self.baseName() + self.nameToken('separator') + str(frame).zfill(self.padding()) + '.' + self.extension()
-			paths.append(os.path.normpath(os.path.join(self.basePath(), name)))
-		return paths
+		prefix = os.path.join(self.basePath(), self.baseName() + self.nameToken('separator'))
+		suffix = '.' + self.extension()
+		padding = self.padding()
+		return [os.path.normpath(prefix + str(frame).zfill(padding) + suffix) for frame in range(self.start(), self.end() + 1, self._step)]
 
 	def isComplete(self):
-		if len(self.missingFrames()) > 0:
-			return False
+		existingFrames = self.existingFrames()
+		for frame in range(self.start(), self.end() + 1, self._step):
+			if frame not in existingFrames:
+				return False
 		return True
 
 	def missingFrames(self):
-		frames = []
-		for frame in range(self.start(), self.end() + 1, self._step):
-			name = self.baseName() + self.nameToken('separator') + str(frame).zfill(self.padding()) + '.' + self.extension()
-			path = os.path.join(self.basePath(), name)
-			if not os.path.exists(path):
-				frames.append(frame)
-		return frames
+		existingFrames = self.existingFrames()
+		return [frame for frame in range(self.start(), self.end() + 1, self._step) if frame not in existingFrames]
 
 	def offsetRange(self, offset):
 		self.setRange(self.frameRange().offseted(offset))
 		return True
 
-	def move(self, output):
-		self.copy(output)
-		self.delete()
+	def move(self, output, workers=None, progress=None):
+		""" Moves the frames to the output sequence.
+
+		Args:
+			output(FileSequence): The sequence to move to.
+			workers(int): The amount of frames moved at the same time.
+			progress(callable): Called as progress(done, total) after each frame.
+
+		Raises:
+			Exceptions.FileOperationFailed: If some frames could not be moved.
+		"""
+		if output.path() == self.path() and output.frameRange().overlaps(self.frameRange()):
+			raise Exception('Cannot move to same location.')
+
+		if self.count() != output.count():
+			raise Exception('Cannot move to sequence with different frame count.')
+
+		output.delete(workers=workers)
+		FileOperations(workers, progress).move(zip(self.paths(), output.paths()))
+		self.clearListingCache()
 		self._path = output.path()
 
-	def copy(self, output):
+	def copy(self, output, workers=None, progress=None, hardLink=False):
+		""" Copies the frames to the output sequence.
+
+		Args:
+			output(FileSequence): The sequence to copy to.
+			workers(int): The amount of frames copied at the same time.
+			progress(callable): Called as progress(done, total) after each frame.
+			hardLink(bool): Hard link the frames instead of copying them when the filesystem allows it.
+
+		Raises:
+			Exceptions.FileOperationFailed: If some frames could not be copied.
+		"""
 		if output.path() == self.path() and output.frameRange().overlaps(self.frameRange()):
 			raise Exception('Cannot copy to same location.')
 
 		if self.count() != output.count():
-			Exception('Cannot copy to sequence with different frame count.')
+			raise Exception('Cannot copy to sequence with different frame count.')
 
 		# We need to delete everything we are going to copy.
 		# Otherwise shutil might cry.
-		output.delete()
-
-		for source, cpy in zip(self.paths(), output.paths()):
-			shutil.copy(source, cpy)
+		output.delete(workers=workers)
 
+		FileOperations(workers, progress).copy(zip(self.paths(), output.paths()), hardLink=hardLink)
+		self.clearListingCache()
 		return True
 
 	def convert(self, output):
@@ -375,14 +568,24 @@ class FileSequence(object):
 		else:
 			raise Exception('FileSequence.convert only supports outputting to a complete sequence.')
 
-	def delete(self, deletesBasePath=False):
+	def delete(self, deletesBasePath=False, workers=None, progress=None):
+		""" Deletes the existing frames of the sequence.
+
+		Args:
+			deletesBasePath(bool): Also remove the folder and its empty parents.
+			workers(int): The amount of frames deleted at the same time.
+			progress(callable): Called as progress(done, total) after each frame.
+
+		Raises:
+			Exceptions.FileOperationFailed: If some frames could not be deleted.
+		"""
+		FileOperations(workers, progress).delete(self.existingPaths())
+		self.clearListingCache()
+		self._scan = None
 		if deletesBasePath:
 			basePath = self.basePath()
 			if os.path.exists(basePath):
 				os.removedirs(basePath)
-		for path in self.paths():
-			if os.path.exists(path):
-				os.remove(path)
 
 	def generateMovie(self, outputPath=None, fps=30, ffmpeg='ffmpeg', videoCodec=VideoCodec.PhotoJPEG, audioPath=''):
 
@@ -412,6 +615,7 @@ class FileSequence(object):
 		# Sometimes there is delay due to the servers. Wait for a reasonable ammount of time
 		# before raising a exception.
 		for i in xrange(15):
+			normalisedSequence.clearListingCache()
 			if normalisedSequence.isComplete():
 				break
 			time.sleep(0.1)
@@ -471,50 +675,100 @@ class FileSequence(object):
 
 		return success
 
-	def retime(self, outputPath, retimeCurve):
+	def retimePlan(self, retimeCurve):
+		""" Computes which source frame each frame of a retimed sequence is made of, without touching
+		any file. This is what retime would do, so it can be used as a dry run.
+
+		Args:
+			retimeCurve (cross3d.FCurve): The curve mapping the target frames to the source frames.
+
+		Returns:
+			list: (targetFrame, sourceFrame) tuples ordered by target frame.
+
+		Raises:
+			ValueError: If the curve cannot be evaluated on the range.
+		"""
+		import numpy as np
+
+		def roundFrames(values):
+			if np.isnan(values).any():
+				raise ValueError('The retime curve cannot be evaluated on the range of the sequence.')
+			# Rounding half away from zero like the builtin round.
+			return np.where(values < 0, np.ceil(values - 0.5), np.floor(values + 0.5)).astype(np.int64)
+
+		# We'll invert the curve to find the bounds of our target output from the input range.
+		invertedCurve = copy.deepcopy(retimeCurve)
+		invertedCurve.invert()
+		targetFrames = roundFrames(invertedCurve.valuesAtTimes(np.arange(self.start(), self.end() + 1, self.step())))
+
+		# Then look up the source frames of the whole target range.
+		targetFrames = np.arange(targetFrames.min(), targetFrames.max() + 1)
+		sourceFrames = np.clip(roundFrames(retimeCurve.valuesAtTimes(targetFrames)), self.start(), self.end())
+		return zip(targetFrames.tolist(), sourceFrames.tolist())
+
+	def retime(self, outputPath, retimeCurve, workers=None, progress=None, hardLink=True):
 		"""Retimes the filesequence using the specified retimeCurve.  Outputs the retimed sequence
 			to the specified location.
+
+		Each source frame is copied once, the other target frames using the same source frame, like
+		in holds and slow motions, are hard linked to that copy.
 		
 		Args:
 			outputPath (str): The unique path to output the retimed FileSequence to.
 			retimeCurve (cross3d.FCurve): The curve to evaluate to retime the file sequence
 			by mapping frames to frames.
+			workers (int): The amount of frames copied at the same time.
+			progress (callable): Called as progress(done, total) after each frame.
+			hardLink (bool): Hard link the repeated frames when the filesystem allows it, otherwise
+				they are copied. Defaults to True.
 		
 		Returns:
 		    FileSequence: The newly created FileSequence.
 		"""	
 		# We cannot initialize a FileSequence with a unique path.
 		retimedSequence = FileSequence('{}.0-0{}'.format(*os.path.splitext(outputPath)))
+		plan = self.retimePlan(retimeCurve)
+
+		copies = []
+		links = []
+		firstTargets = {}
+		for targetFrame, sourceFrame in plan:
+			name = retimedSequence._framePath(targetFrame)
+			if sourceFrame in firstTargets:
+				links.append((firstTargets[sourceFrame], name))
+			else:
+				firstTargets[sourceFrame] = name
+				copies.append((self._framePath(sourceFrame), name))
 
-		# We'll prescan the input range to find the bounds of our target output
-		start = None
-		end = None
+		total = len(plan)
+		operations = FileOperations(workers, progress and (lambda done, count: progress(done, total)))
+		operations.copy(copies, metadata=True)
+		if links:
+			operations = FileOperations(workers, progress and (lambda done, count: progress(len(copies) + done, total)))
+			operations.copy(links, hardLink=hardLink, metadata=True)
+		self.clearListingCache()
 
-		invertedCurve = copy.deepcopy(retimeCurve)
-		invertedCurve.invert()
+		# Update start/end of returned Sequence
+		retimedSequence.setRange((plan[0][0], plan[-1][0]))
+		return retimedSequence
 
-		for frame in xrange(self.start(), self.end() + 1, self.step()):
-			targetFrame = int(round(invertedCurve.valueAtTime(frame)))
-			start = targetFrame if start is None else min(targetFrame, start)
-			end = targetFrame if end is None else max(targetFrame, end)
+	def link(self, output, workers=None, progress=None):
+		""" Creates symbolic links to the frames at the output sequence location.
 
-		# We'll invert the curve so we can lookup in the opposite direction, and
-		# find the source frames for our target range.
-		for frame in xrange(start, end + 1):
-			sourceFrame = int(round(retimeCurve.valueAtTime(frame)))
-			sourceName = self.uniquePath(PaddingStyle.Percent) % min(self.end(), max(self.start(), sourceFrame)) 
-			name = retimedSequence.uniquePath(PaddingStyle.Percent) % frame
-			shutil.copy2(sourceName, name)
+		Args:
+			output(FileSequence): The sequence to link from.
+			workers(int): The amount of links created at the same time.
+			progress(callable): Called as progress(done, total) after each frame.
 
-		# Update start/end of returned Sequence
-		retimedSequence.setRange((start, end))
-		return retimedSequence
+		Returns:
+			bool: False if the sequence is incomplete or has a different frame count than the output.
 
-	def link(self, output):
+		Raises:
+			Exceptions.FileOperationFailed: If some links could not be created.
+		"""
 		if self.isComplete():
 			if self.count() == output.count():
-				for inp, output in zip(self.paths(), output.paths()):
-					command = " ".join(["mklink", output, inp])
-					subprocess.Popen(command, shell=True)
+				FileOperations(workers, progress).link(zip(self.paths(), output.paths()))
+				self.clearListingCache()
 				return True
 		return False
@@ -0,0 +1,298 @@
+##
+#   \namespace  cross3d.classes.framerangeset
+#
+#   \remarks    This module holds the FrameRangeSet class to handle sets of frames as sorted disjoint
+#				frame ranges.
+#
+#   \author     Blur Studio
+#
+
+#------------------------------------------------------------------------------------------------------------------------
+
+import re
+import bisect
+import heapq
+
+from framerange import FrameRange
+
+#------------------------------------------------------------------------------------------------------------------------
+
+class FrameRangeSet(object):
+	"""
+		\remarks	A set of integer frames stored as sorted, disjoint and non adjacent inclusive ranges.
+					Set operations run in linear time in the amount of ranges and containment queries
+					bisect them, which is what merging the ranges of many clips or render passes needs.
+
+					FrameRangeSet([FrameRange([1, 100]), (120, 130), 150]).string() == '1-100,120-130,150'
+					FrameRangeSet(sequence.missingFrames()) lists the frames that still need rendering.
+	"""
+
+	_rangeRegex = re.compile(r'^\s*(-?\d+)(?:\s*-\s*(-?\d+)(?:\s*x\s*(\d+))?)?\s*$')
+
+	def __init__(self, ranges=None):
+		"""
+			\remarks	Initialize the class.
+			\param		ranges <list>	FrameRanges, (start, end) pairs or single frames, in any order
+										and overlapping or not.
+		"""
+		starts = []
+		ends = []
+		if ranges:
+			items = []
+			for item in ranges:
+				if isinstance(item, (int, long)):
+					items.append((item, item))
+				else:
+					start, end = FrameRange(list(item))
+					items.append((start, end) if start <= end else (end, start))
+			items.sort()
+			self._merge(items, starts, ends)
+		self._starts = starts
+		self._ends = ends
+
+	@classmethod
+	def fromString(cls, string):
+		"""
+			\remarks	Returns the set described by a range string as returned by string, like
+						'1-100,120-200x2'.
+			\param		string <string>
+		"""
+		ranges = []
+		for token in string.split(','):
+			if not token.strip():
+				continue
+			match = cls._rangeRegex.match(token)
+			if not match:
+				raise ValueError('Invalid frame range string: %s' % string)
+			start, end, step = match.groups()
+			start = int(start)
+			end = start if end is None else int(end)
+			step = int(step or 1)
+			if step < 1:
+				raise ValueError('Invalid frame range string: %s' % string)
+			if step == 1:
+				ranges.append((start, end))
+			else:
+				ranges.extend(xrange(start, end + 1, step))
+		return cls(ranges)
+
+	@classmethod
+	def _fromLists(cls, starts, ends):
+		frameRangeSet = cls.__new__(cls)
+		frameRangeSet._starts = starts
+		frameRangeSet._ends = ends
+		return frameRangeSet
+
+	@staticmethod
+	def _merge(items, starts, ends):
+		"""
+			\remarks	Appends sorted (start, end) items to starts and ends, merging the ones that
+						overlap or touch.
+		"""
+		for start, end in items:
+			if ends and start <= ends[-1] + 1:
+				if end > ends[-1]:
+					ends[-1] = end
+			else:
+				starts.append(start)
+				ends.append(end)
+
+	def __repr__(self):
+		"""
+			\remarks	Affects the class representation.
+		"""
+		return 'cross3d.FrameRangeSet( %r )' % self.string()
+
+	def __eq__(self, other):
+		if isinstance(other, FrameRangeSet):
+			return self._starts == other._starts and self._ends == other._ends
+		return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __nonzero__(self):
+		return bool(self._starts)
+
+	def __len__(self):
+		"""
+			\remarks	Returns the amount of ranges, see count for the amount of frames.
+		"""
+		return len(self._starts)
+
+	def __iter__(self):
+		"""
+			\remarks	Iterates over the ranges as FrameRanges.
+		"""
+		for start, end in zip(self._starts, self._ends):
+			yield FrameRange([start, end])
+
+	def __contains__(self, frame):
+		return self.contains(frame)
+
+	def __or__(self, other):
+		return self.union(other)
+
+	def __and__(self, other):
+		return self.intersection(other)
+
+	def __sub__(self, other):
+		return self.difference(other)
+
+	def ranges(self):
+		"""
+			\remarks	Returns the list of FrameRanges of the set.
+		"""
+		return list(self)
+
+	def frames(self):
+		"""
+			\remarks	Returns the sorted list of frames of the set.
+		"""
+		frames = []
+		for start, end in zip(self._starts, self._ends):
+			frames.extend(xrange(start, end + 1))
+		return frames
+
+	def count(self):
+		"""
+			\remarks	Returns the amount of frames in the set.
+		"""
+		return sum(self._ends) - sum(self._starts) + len(self._starts)
+
+	def bounds(self):
+		"""
+			\remarks	Returns the FrameRange from the first to the last frame, or None if the set is
+						empty.
+		"""
+		if not self._starts:
+			return None
+		return FrameRange([self._starts[0], self._ends[-1]])
+
+	def contains(self, frameRange):
+		"""
+			\remarks	Returns whether a frame or all the frames of a FrameRange are in the set.
+			\param		frameRange <int>|<FrameRange>
+		"""
+		if isinstance(frameRange, (int, long)):
+			start = end = frameRange
+		else:
+			start, end = frameRange[0], frameRange[1]
+		index = bisect.bisect_right(self._starts, start) - 1
+		return index >= 0 and end <= self._ends[index]
+
+	def overlaps(self, frameRange):
+		"""
+			\remarks	Returns whether any frame of the FrameRange is in the set.
+			\param		frameRange <FrameRange>
+		"""
+		index = bisect.bisect_right(self._starts, frameRange[1]) - 1
+		return index >= 0 and self._ends[index] >= frameRange[0]
+
+	def union(self, other):
+		"""
+			\remarks	Returns the frames in either set.
+			\param		other <FrameRangeSet>
+		"""
+		starts = []
+		ends = []
+		self._merge(heapq.merge(zip(self._starts, self._ends), zip(other._starts, other._ends)), starts, ends)
+		return self._fromLists(starts, ends)
+
+	def intersection(self, other):
+		"""
+			\remarks	Returns the frames in both sets.
+			\param		other <FrameRangeSet>
+		"""
+		starts = []
+		ends = []
+		i = j = 0
+		while i < len(self._starts) and j < len(other._starts):
+			start = max(self._starts[i], other._starts[j])
+			end = min(self._ends[i], other._ends[j])
+			if start <= end:
+				starts.append(start)
+				ends.append(end)
+			# The range ending first cannot overlap anything else.
+			if self._ends[i] < other._ends[j]:
+				i += 1
+			else:
+				j += 1
+		return self._fromLists(starts, ends)
+
+	def difference(self, other):
+		"""
+			\remarks	Returns the frames of this set that are not in the other.
+			\param		other <FrameRangeSet>
+		"""
+		starts = []
+		ends = []
+		j = 0
+		for start, end in zip(self._starts, self._ends):
+			# Skipping the ranges of other that end before this one.
+			while j < len(other._starts) and other._ends[j] < start:
+				j += 1
+			k = j
+			while k < len(other._starts) and other._starts[k] <= end:
+				if other._starts[k] > start:
+					starts.append(start)
+					ends.append(other._starts[k] - 1)
+				start = other._ends[k] + 1
+				k += 1
+			if start <= end:
+				starts.append(start)
+				ends.append(end)
+		return self._fromLists(starts, ends)
+
+	def complemented(self, frameRange):
+		"""
+			\remarks	Returns the frames of the FrameRange that are not in the set.
+			\param		frameRange <FrameRange>
+		"""
+		return FrameRangeSet([frameRange]).difference(self)
+
+	def gaps(self, frameRange=None):
+		"""
+			\remarks	Iterates over the FrameRanges missing between the ranges of the set, within
+						frameRange if provided and between the first and last frames otherwise.
+			\param		frameRange <FrameRange>|None
+		"""
+		if frameRange is None:
+			for index in xrange(1, len(self._starts)):
+				yield FrameRange([self._ends[index - 1] + 1, self._starts[index] - 1])
+		else:
+			for gap in self.complemented(frameRange):
+				yield gap
+
+	def string(self, separator='-', delimiter=','):
+		"""
+			\remarks	Returns the set in its compact string form. Runs of at least three single frames
+						with a constant step are written as 'start-endxstep', like '120-200x2'.
+			\param		separator <string>	Between the start and end of a range.
+			\param		delimiter <string>	Between the ranges.
+		"""
+		tokens = []
+		starts = self._starts
+		ends = self._ends
+		count = len(starts)
+		index = 0
+		while index < count:
+			start = starts[index]
+			end = ends[index]
+			if start != end:
+				tokens.append('%i%s%i' % (start, separator, end))
+				index += 1
+				continue
+			# Looking for single frames following this one with a constant step.
+			last = index
+			if index + 1 < count and starts[index + 1] == ends[index + 1]:
+				step = starts[index + 1] - start
+				while last + 1 < count and starts[last + 1] == ends[last + 1] and starts[last + 1] - starts[last] == step:
+					last += 1
+			if last - index >= 2:
+				tokens.append('%i%s%ix%i' % (start, separator, starts[last], step))
+				index = last + 1
+			else:
+				tokens.append('%i' % start)
+				index += 1
+		return delimiter.join(tokens)
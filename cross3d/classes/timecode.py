@@ -19,14 +19,56 @@
 """
 import re
 import math
+import fractions
+import collections
 from cross3d.constants import TimeUnit
 
+class _TimecodeFormat(object):
+	"""A format string of Timecode, translated once into a str.format template and a parser regex.
+
+	Args:
+		formatString(str):	The format string, like 'hh:mm:ss:ff'.
+		tokenRegex(re.RegexObject):	Matches the tokens of the format string.
+		formatKey(dict):	The str.format field of each token.
+		parseKey(dict):	The regular expression group of each token.
+	"""
+	def __init__(self, formatString, tokenRegex, formatKey, parseKey):
+		self.template = tokenRegex.sub(lambda x: formatKey[x.group()], formatString)
+		self.regex = re.compile(tokenRegex.sub(lambda x: parseKey[x.group()], formatString))
+		groups = self.regex.groupindex
+		self.parsable = 'hours' in groups and 'minutes' in groups and 'seconds' in groups and 'frames' in groups
+
+	def format(self, timecode):
+		return self.formatLabels(*timecode._labels())
+
+	def formatLabels(self, hours, minutes, seconds, frames):
+		return self.template.format(hours=hours, minutes=minutes, seconds=seconds, frames=frames)
+
+	def parse(self, timecodeString):
+		"""Returns the hours, minutes, seconds and frames strings of a timecode string.
+
+		Raises:
+			ValueError: If the string does not match the format.
+		"""
+		match = self.regex.match(timecodeString)
+		if not match or not self.parsable:
+			raise ValueError('Invalid format string specified.')
+		return match.group('hours', 'minutes', 'seconds', 'frames')
+
 class Timecode(object):
 	"""Timcode class for dealing with timecode, including conversions from/to different formats.
 
+	A Timecode is stored as an absolute integer number of frames and an exact rational framerate,
+	NTSC framerates like 29.97 being stored as 30000/1001. The hours, minutes, seconds and frames
+	places are labels counting frames at the nominal framerate (30 for 29.97) like SMPTE timecode,
+	skipping the first frames of each minute but every tenth one for drop-frame timecodes. Real time
+	values like toSeconds are the number of frames divided by the framerate.
+
 	Attributes:
+		dropFrame:	Whether this timecode instance uses drop-frame labels.
 		formatString: String used for generating and parsing string representations of this Timecode
 			instance.
+		frameCount:	The absolute number of frames of this timecode instance.
 		framerate:	The framerate used for calculations involving this timecode instance.
 		frames:	The frames place value for this timecode instance.
 		hours:	The hours place value for this timecode instance.
@@ -63,6 +105,10 @@ class Timecode(object):
 		'F'  : r'(?P<frames>\d+)',
 		'Ff' : r'(?P<frames>\d+(?:\.\d+)?)',
 	}
+	_TOKEN_REGEX = re.compile(r'\b(' + '|'.join(_FORMAT_KEY.keys()) + r')\b')
+	# The most recently used formats, see _format.
+	_FORMATS = collections.OrderedDict()
+	_FORMATS_CACHE_SIZE = 64
 	_TIME_UNIT_CONVERSION = {
 		TimeUnit.Frames : None,
 		TimeUnit.Seconds : 1,
@@ -74,7 +120,7 @@ class Timecode(object):
 	_MIN_PER_HOUR = 60
 	_SEC_PER_HOUR = 3600
 
-	def __init__(self, hours=0, minutes=0, seconds=0, frames=0, framerate=29.97):
+	def __init__(self, hours=0, minutes=0, seconds=0, frames=0, framerate=29.97, dropFrame=False):
 		"""
 			Args:
 				hours(float):	The number of hours for the new Timecode instance.
@@ -83,25 +129,18 @@ class Timecode(object):
 				frames(float):	The number of frames for the new Timecode instance.
 				framerate(float):	The framerate for the new Timecode instance.  If not specified,
 					a default of 29.97 (NTSC) will be assumed.
+				dropFrame(bool):	Use drop-frame labels, only supported for multiples of 29.97.
+
+			Raises:
+				ValueError: If dropFrame is requested for a framerate that does not support it.
 		"""
-		# Initialize hmsf and framerate to 0 and then use property functions to
-		# set so that we can ensure we store a valid timecode.
-		self._hours = 0
-		self._minutes = 0
-		self._seconds = 0
-		self._frames = 0
 		self._framerate = framerate
-		self._formatString = 'hh:mm:ss:ff'
-		secs = float(hours) * float(self._SEC_PER_HOUR)
-		secs += float(minutes) * float(self._SEC_PER_MIN)
-		secs += float(seconds)
-		secs += float(frames) / float(framerate)
-		self.setFromSeconds(secs)
-
-		self.hours = hours
-		self.minutes = minutes
-		self.seconds = seconds
-		self.frames = frames
+		self._rate = self._rationalFramerate(framerate)
+		self._nominal = int(round(float(self._rate)))
+		self._dropFrame = bool(dropFrame)
+		self._drop = self._droppedFrames(self._rate, dropFrame)
+		self._formatString = 'hh:mm:ss;ff' if dropFrame else 'hh:mm:ss:ff'
+		self._frameCount = self._countFromLabels(float(hours), float(minutes), float(seconds), float(frames))
 
 	def __str__(self):
 		return self.toString()
@@ -112,7 +151,7 @@ class Timecode(object):
 		# framerate information.
 		if other.framerate != self.framerate:
 			raise ValueError('Timecode framerates do not match.  Perhaps call convertToFramerate first.')
-		return Timecode.fromValue(self.toSeconds() + other.toSeconds(), framerate=self.framerate)
+		return self._fromFrameCount(self._frameCount + other._frameCount)
 
 	def __sub__(self, other):
 		# We don't need to operate only on timecodes with matching framerates, but it seems safest
@@ -120,7 +159,7 @@ class Timecode(object):
 		# framerate information.
 		if other.framerate != self.framerate:
 			raise ValueError('Timecode framerates do not match.  Perhaps call convertToFramerate first.')
-		return Timecode.fromValue(self.toSeconds() - other.toSeconds(), framerate=self.framerate)
+		return self._fromFrameCount(self._frameCount - other._frameCount)
 
 	def __div__(self, other):
 		# We don't need to operate only on timecodes with matching framerates, but it seems safest
@@ -128,7 +167,9 @@ class Timecode(object):
 		# framerate information.
 		if other.framerate != self.framerate:
 			raise ValueError('Timecode framerates do not match.  Perhaps call convertToFramerate first.')
-		return Timecode.fromValue(self.toSeconds() / other.toSeconds(), framerate=self.framerate)
+		# The ratio of the durations in seconds, converted back to frames.
+		rate = self._rate
+		return self._fromFrameCount(self._roundRatio(self._frameCount * rate.numerator, other._frameCount * rate.denominator))
 
 	def __mul__(self, other):
 		# We don't need to operate only on timecodes with matching framerates, but it seems safest
@@ -136,7 +177,9 @@ class Timecode(object):
 		# framerate information.
 		if other.framerate != self.framerate:
 			raise ValueError('Timecode framerates do not match.  Perhaps call convertToFramerate first.')
-		return Timecode.fromValue(self.toSeconds() * other.toSeconds(), framerate=self.framerate)
+		# The product of the durations in seconds, converted back to frames.
+		rate = self._rate
+		return self._fromFrameCount(self._roundRatio(self._frameCount * other._frameCount * rate.denominator, rate.numerator))
 
 	def __eq__(self, other):
 		"""Equivalency test.  For this we will compare all values directly.  This means that
@@ -146,10 +189,8 @@ class Timecode(object):
 			will compare the time value, as this is the most likely expected behavior."""
 		if isinstance(other, Timecode):
 			return (
-				other.hours == self.hours and
-				other.minutes == self.minutes and
-				other.seconds == self.seconds and
-				other.frames == self.frames and 
+				other._frameCount == self._frameCount and
+				other._dropFrame == self._dropFrame and
 				other.framerate == self.framerate
 			)
 		return False
@@ -159,26 +200,33 @@ class Timecode(object):
 
 	def __lt__(self, other):
 		if isinstance(other, Timecode):
-			return self.toSeconds() < other.toSeconds()
+			return self._compare(other) < 0
 		return False
 
 	def __gt__(self, other):
 		if isinstance(other, Timecode):
-			return self.toSeconds() > other.toSeconds()
+			return self._compare(other) > 0
 		return False
 
 	def __le__(self, other):
 		if isinstance(other, Timecode):
-			return self.toSeconds() <= other.toSeconds()
+			return self._compare(other) <= 0
 		return False
 
 	def __ge__(self, other):
 		if isinstance(other, Timecode):
-			return self.toSeconds() >= other.toSeconds()
+			return self._compare(other) >= 0
 		return False
 
+	def _compare(self, other):
+		# Comparing frameCount / rate exactly.
+		return cmp(
+			self._frameCount * self._rate.denominator * other._rate.numerator,
+			other._frameCount * other._rate.denominator * self._rate.numerator
+		)
+
 	@classmethod
-	def fromString(cls, timecodeString, formatString='hh:mm:ss:ff', framerate=29.97):
+	def fromString(cls, timecodeString, formatString='hh:mm:ss:ff', framerate=29.97, dropFrame=False):
 		"""Construct an instance of Timecode given a string representation of the desired timecode.
 
 			Args:
@@ -187,35 +235,81 @@ class Timecode(object):
 					timecode's string representation.
 				framerate(float):	The framerate for the new Timecode instance.  If not specified,
 					a default of 29.97 (NTSC) will be assumed.
+				dropFrame(bool):	Whether the string uses drop-frame labels.
 
 			Returns:
 				Timecode: The newly constructed Timecode instance.
 		"""
-		pattern = re.compile(r'\b(' + '|'.join(cls._PARSE_KEY.keys()) + r')\b')
-		parserRegex = pattern.sub(lambda x: cls._PARSE_KEY[x.group()], formatString)
-		match = re.match(parserRegex, timecodeString)
-		if not match:
-			raise ValueError('Invalid format string specified.')
-		groupdict = match.groupdict()
-		if not (
-			'hours' 	in groupdict and
-			'minutes' 	in groupdict and
-			'seconds' 	in groupdict and
-			'frames' 	in groupdict
-			):
-			raise ValueError('Invalid format string specified.')
+		hours, minutes, seconds, frames = cls._format(formatString).parse(timecodeString)
 		instance = cls(
-			hours=groupdict['hours'],
-			minutes=groupdict['minutes'],
-			seconds=groupdict['seconds'],
-			frames=groupdict['frames'],
-			framerate=framerate
+			hours=hours,
+			minutes=minutes,
+			seconds=seconds,
+			frames=frames,
+			framerate=framerate,
+			dropFrame=dropFrame
 		)
 		instance.formatString = formatString
 		return instance
 
 	@classmethod
-	def fromValue(cls, value, timeUnit=TimeUnit.Seconds, framerate=29.97):
+	def parseMany(cls, timecodeStrings, formatString='hh:mm:ss:ff', framerate=29.97, dropFrame=False):
+		"""Construct Timecode instances from a list of string representations sharing the same
+			format, interpreting the format only once.
+
+			Args:
+				timecodeStrings(list):	The string representations of the desired timecodes.
+				formatString(str):	An optional formatting string used to interpret the
+					timecodes' string representations.
+				framerate(float):	The framerate for the new Timecode instances.  If not
+					specified, a default of 29.97 (NTSC) will be assumed.
+				dropFrame(bool):	Whether the strings use drop-frame labels.
+
+			Returns:
+				list: The newly constructed Timecode instances.
+		"""
+		prototype = cls(framerate=framerate, dropFrame=dropFrame)
+		prototype.formatString = formatString
+		parse = cls._format(formatString).parse
+		instances = []
+		for timecodeString in timecodeStrings:
+			hours, minutes, seconds, frames = parse(timecodeString)
+			instances.append(prototype._fromFrameCount(prototype._countFromLabels(float(hours), float(minutes), float(seconds), float(frames))))
+		return instances
+
+	@classmethod
+	def formatMany(cls, timecodes, formatString=None):
+		"""Convert a list of Timecode objects to strings.
+
+			Args:
+				timecodes(list):	The Timecode instances to convert.
+				formatString(str):	The string that will be used to generate formatting.  If not
+					specified, the formatString attribute of each instance will be used.
+
+			Returns:
+				list: The string representation of each Timecode instance.
+		"""
+		if formatString:
+			return map(cls._format(formatString).format, timecodes)
+		return [cls._format(timecode.formatString).format(timecode) for timecode in timecodes]
+
+	@classmethod
+	def _format(cls, formatString):
+		"""Returns the _TimecodeFormat of a format string, from a cache of the most recently used
+			ones.
+		"""
+		formats = cls._FORMATS
+		try:
+			timecodeFormat = formats.pop(formatString)
+		except KeyError:
+			timecodeFormat = _TimecodeFormat(formatString, cls._TOKEN_REGEX, cls._FORMAT_KEY, cls._PARSE_KEY)
+			if len(formats) >= cls._FORMATS_CACHE_SIZE:
+				formats.popitem(last=False)
+		formats[formatString] = timecodeFormat
+		return timecodeFormat
+
+	@classmethod
+	def fromValue(cls, value, timeUnit=TimeUnit.Seconds, framerate=29.97, dropFrame=False):
 		"""Construct an instance of Timecode given a float representation of the desired timecode
 			in a specified TimeUnit.
 
@@ -225,20 +319,89 @@ class Timecode(object):
 					seconds will be assumed.
 				framerate(float):	The framerate for the new Timecode instance.  If not specified,
 					a default of 29.97 (NTSC) will be assumed.
+				dropFrame(bool):	Use drop-frame labels for the new Timecode instance.
 
 			Returns:
 				Timecode: The newly constructed Timecode instance.
 		"""
 		if not timeUnit in cls._TIME_UNIT_CONVERSION:
 			raise ValueError('Invalid type for argument timeUnit.')
+		instance = cls(framerate=framerate, dropFrame=dropFrame)
 		if timeUnit == TimeUnit.Frames:
-			value /= float(framerate)
+			instance._frameCount = cls._round(value)
 		else:
-			value /= float(cls._TIME_UNIT_CONVERSION[timeUnit])
-		instance = cls(framerate=framerate)
-		instance.setFromSeconds(value)
+			instance.setFromSeconds(float(value) / cls._TIME_UNIT_CONVERSION[timeUnit])
 		return instance
 
+	@classmethod
+	def convertValues(cls, values, fromUnit, toUnit, framerate=29.97):
+		"""Convert an array of time values between two TimeUnits at once using numpy.
+
+			Args:
+				values(array_like):	The values to convert.
+				fromUnit(TimeUnit):	The time units of the provided values.
+				toUnit(TimeUnit):	The time units to convert to.  Frames are rounded to the
+					nearest integer.
+				framerate(float):	The framerate used to convert from and to frames.  If not
+					specified, a default of 29.97 (NTSC) will be assumed.
+
+			Returns:
+				numpy.ndarray: The converted values, int64 for frames and float64 otherwise.
+		"""
+		import numpy as np
+		if not (fromUnit in cls._TIME_UNIT_CONVERSION and toUnit in cls._TIME_UNIT_CONVERSION):
+			raise ValueError('Invalid type for argument timeUnit.')
+		rate = cls._rationalFramerate(framerate)
+		values = np.asarray(values, dtype=np.float64)
+		if fromUnit == TimeUnit.Frames:
+			seconds = values * rate.denominator / rate.numerator
+		else:
+			seconds = values / cls._TIME_UNIT_CONVERSION[fromUnit]
+		if toUnit == TimeUnit.Frames:
+			return np.floor(seconds * rate.numerator / rate.denominator + 0.5).astype(np.int64)
+		return seconds * cls._TIME_UNIT_CONVERSION[toUnit]
+
+	@classmethod
+	def framesToStrings(cls, frameCounts, formatString=None, framerate=29.97, dropFrame=False):
+		"""Convert absolute frame numbers to timecode strings, computing the labels of all the
+			frames at once using numpy.
+
+			Args:
+				frameCounts(array_like):	The absolute frame numbers to convert.
+				formatString(str):	The string that will be used to generate formatting.  If not
+					specified, 'hh:mm:ss:ff' or 'hh:mm:ss;ff' for drop-frame is used.
+				framerate(float):	If not specified, a default of 29.97 (NTSC) will be assumed.
+				dropFrame(bool):	Use drop-frame labels.
+
+			Returns:
+				list: The timecode strings.
+		"""
+		import numpy as np
+		prototype = cls(framerate=framerate, dropFrame=dropFrame)
+		labels = prototype._labelsFromCounts(np.asarray(frameCounts, dtype=np.int64))
+		formatLabels = cls._format(formatString or prototype.formatString).formatLabels
+		return [formatLabels(*label) for label in zip(*[component.tolist() for component in labels])]
+
+	@classmethod
+	def stringsToFrames(cls, timecodeStrings, formatString='hh:mm:ss:ff', framerate=29.97, dropFrame=False):
+		"""Convert timecode strings to absolute frame numbers, parsing each string and then
+			converting all the labels at once using numpy.
+
+			Args:
+				timecodeStrings(list):	The timecode strings to convert.
+				formatString(str):	The formatting string used to interpret the strings.
+				framerate(float):	If not specified, a default of 29.97 (NTSC) will be assumed.
+				dropFrame(bool):	Whether the strings use drop-frame labels.
+
+			Returns:
+				numpy.ndarray: The int64 absolute frame numbers.
+		"""
+		import numpy as np
+		prototype = cls(framerate=framerate, dropFrame=dropFrame)
+		parse = cls._format(formatString).parse
+		labels = np.array([parse(timecodeString) for timecodeString in timecodeStrings], dtype=np.float64).reshape(-1, 4)
+		return prototype._countsFromLabels(*labels.T)
+
 	@property
 	def formatString(self):
 		"""Get the current formatString."""
@@ -255,72 +418,83 @@ class Timecode(object):
 		"""Get Timcode Framerate."""
 		return self._framerate
 
+	@property
+	def dropFrame(self):
+		"""Whether the Timecode uses drop-frame labels."""
+		return self._dropFrame
+
+	@property
+	def frameCount(self):
+		"""Get the absolute number of frames of the Timecode."""
+		return self._frameCount
+	@frameCount.setter
+	def frameCount(self, value):
+		"""Set the absolute number of frames of the Timecode, rounded to the nearest frame."""
+		self._frameCount = self._round(value)
+
 	@property
 	def frames(self):
 		"""Get Timecode Frames place."""
-		return self._frames
+		return self._labels()[3]
 	@frames.setter
 	def frames(self, value):
 		"""Set Timecode Frames place.  Any overflow or fractional part of the specified value will
 			be added to the appropriate timecode component."""
-		value = float(value)
-		# We're supposed to be overwriting our frames place, so reset it.
-		self._frames = 0
-		self.setFromSeconds(self.toSeconds() + (value / float(self.framerate)))
+		hours, minutes, seconds, frames = self._labels()
+		self._frameCount = self._countFromLabels(hours, minutes, seconds, float(value))
 
 	@property
 	def hours(self):
 		"""Get Timecode Hours place."""
-		return self._hours
+		return self._labels()[0]
 	@hours.setter
 	def hours(self, value):
-		"""Set Timecode Hours place.  If a non-integer value is passed it will be cast to a float,
-			converted to seconds and added to the current value before being converted to hmsf."""
-		if isinstance(value, int):
-			self._hours = value
-		else:
-			value = float(value)
-			# We're supposed to be overwriting our hours place, so reset it.
-			self._hours = 0
-			self.setFromSeconds(self.toSeconds() + (value * float(self._SEC_PER_HOUR)))
+		"""Set Timecode Hours place.  Any fractional part of the specified value will be added to
+			the appropriate timecode component."""
+		hours, minutes, seconds, frames = self._labels()
+		self._frameCount = self._countFromLabels(float(value), minutes, seconds, frames)
 
 	@property
 	def minutes(self):
 		"""Get Timecode Minutes place."""
-		return self._minutes
+		return self._labels()[1]
 	@minutes.setter
 	def minutes(self, value):
 		"""Set Timecode Minutes place.  Any overflow or fractional part of the specified value will
 			be added to the appropriate timecode component."""
-		value = float(value)
-		# We're supposed to be overwriting our minutes place, so reset it.
-		self._minutes = 0
-		self.setFromSeconds(self.toSeconds() + (value * float(self._SEC_PER_MIN)))
+		hours, minutes, seconds, frames = self._labels()
+		self._frameCount = self._countFromLabels(hours, float(value), seconds, frames)
 
 	@property
 	def seconds(self):
 		"""Get Timecode Seconds place."""
-		return self._seconds
+		return self._labels()[2]
 	@seconds.setter
 	def seconds(self, value):
 		"""Set Timecode Seconds place.  Any overflow or fractional part of the specified value will
 			be added to the appropriate timecode component."""
-		value = float(value)
-		# We're supposed to be overwriting our seconds place, so reset it.
-		self._seconds = 0
-		self.setFromSeconds(self.toSeconds() + value)
+		hours, minutes, seconds, frames = self._labels()
+		self._frameCount = self._countFromLabels(hours, minutes, float(value), frames)
 
 	def convertToFramerate(self, newFramerate):
 		"""Sets the Timecode value for the new framerate, based on the time value calculated based
-			on the current current framerate.
+			on the current current framerate.  The number of frames is rounded to the nearest
+			frame of the new framerate.
 
 		Args:
 					newFramerate(float): The new framerate to be set.
+
+		Raises:
+			ValueError: If the Timecode uses drop-frame labels and the new framerate does not
+				support them.
 		"""
-		secs = self.toSeconds()
-		secs *= (float(self.framerate) / float(newFramerate))
-		self.setFromSeconds(secs)
+		rate = self._rationalFramerate(newFramerate)
+		drop = self._droppedFrames(rate, self._dropFrame)
+		self._frameCount = self._roundRatio(self._frameCount * self._rate.denominator * rate.numerator, self._rate.numerator * rate.denominator)
 		self._framerate = newFramerate
+		self._rate = rate
+		self._nominal = int(round(float(rate)))
+		self._drop = drop
 
 	def setFramerate(self, newFramerate):
 		"""Sets the Timcode Framerate, leaving the frames value unaffected, but converting any
@@ -328,27 +502,28 @@ class Timecode(object):
 
 		Args:
 					newFramerate(float): The new framerate to be set.
+
+		Raises:
+			ValueError: If the Timecode uses drop-frame labels and the new framerate does not
+				support them.
 		"""
+		labels = self._labels()
+		rate = self._rationalFramerate(newFramerate)
+		self._drop = self._droppedFrames(rate, self._dropFrame)
 		self._framerate = newFramerate
+		self._rate = rate
+		self._nominal = int(round(float(rate)))
 		# This will make sure that any overflow in our frames caused by a framerate change is
 		# accounted for.
-		self.setFromSeconds(self.toSeconds())
+		self._frameCount = self._countFromLabels(*labels)
 
 	def setFromSeconds(self, sec):
-		"""Set the timecode component values given a number of seconds.
+		"""Set the timecode value given a number of seconds, rounded to the nearest frame.
 
 		Args:
 					secs(float): The number of seconds to set this Timecode instance based on.
 		"""
-		self._hours = int(sec // self._SEC_PER_HOUR)
-		self._minutes = int(sec // self._SEC_PER_MIN % self._MIN_PER_HOUR)
-		self._seconds = int(sec % self._SEC_PER_MIN)
-		f = (sec * self.framerate) % self.framerate
-		# check for floating point error in the mod function
-		if math.fabs(f - self.framerate) < 1E-10:
-			self._frames = 0.0
-		else:
-			self._frames = f
+		self._frameCount = self._round(float(sec) * self._rate.numerator / self._rate.denominator)
 
 	def toSeconds(self):
 		"""Convert the Timecode object to a float quantity of seconds.
@@ -356,11 +531,7 @@ class Timecode(object):
 		Returns:
 					float: This Timecode instance converted to a float quantity of seconds.
 		"""
-		secs = self.seconds
-		secs += self.hours * self._SEC_PER_HOUR
-		secs += self.minutes * self._SEC_PER_MIN
-		secs += float(self.frames) / self.framerate
-		return secs
+		return float(self._frameCount * self._rate.denominator) / self._rate.numerator
 
 	def toString(self, formatString=None):
 		"""Convert the Timecode object to a string, using the provided formatString.  If no
@@ -375,14 +546,7 @@ class Timecode(object):
 		"""
 		if not formatString:
 			formatString = self.formatString
-		pattern = re.compile(r'\b(' + '|'.join(self._FORMAT_KEY.keys()) + r')\b')
-		formatting = pattern.sub(lambda x: self._FORMAT_KEY[x.group()], formatString)
-		return formatting.format(
-			hours=self.hours,
-			minutes=self.minutes,
-			seconds=self.seconds,
-			frames=self.frames
-		)
+		return self._format(formatString).format(self)
 
 	def toValue(self, timeUnit=TimeUnit.Seconds):
 		"""Convert the Timecode object to a float quantity of the specified TimeUnit.  If no
@@ -397,5 +561,101 @@ class Timecode(object):
 		# We won't have framerate stored in our unit conversion dictionary since it depends on this
 		# instance's framerate.
 		if timeUnit == TimeUnit.Frames:
-			return self.toSeconds() * self.framerate
+			return float(self._frameCount)
 		return self.toSeconds() * self._TIME_UNIT_CONVERSION[timeUnit]
+
+	def _fromFrameCount(self, frameCount):
+		"""Returns a new Timecode with the same framerate, labels and format at frameCount."""
+		instance = object.__new__(type(self))
+		instance.__dict__.update(self.__dict__)
+		instance._frameCount = frameCount
+		return instance
+
+	def _labels(self):
+		"""Returns the hours, minutes, seconds and frames places of the Timecode."""
+		count = self._frameCount
+		nominal = self._nominal
+		drop = self._drop
+		if drop:
+			# Adding back the frame numbers skipped by drop-frame labels.
+			framesPer10Minutes = nominal * 600 - drop * 9
+			framesPerMinute = nominal * 60 - drop
+			tens, remainder = divmod(count, framesPer10Minutes)
+			count += drop * 9 * tens
+			if remainder > drop:
+				count += drop * ((remainder - drop) // framesPerMinute)
+		seconds, frames = divmod(count, nominal)
+		minutes, seconds = divmod(seconds, self._SEC_PER_MIN)
+		hours, minutes = divmod(minutes, self._MIN_PER_HOUR)
+		return hours, minutes, seconds, frames
+
+	def _labelsFromCounts(self, counts):
+		"""Vectorized _labels for an int64 numpy array of frame counts."""
+		import numpy as np
+		nominal = self._nominal
+		drop = self._drop
+		if drop:
+			framesPer10Minutes = nominal * 600 - drop * 9
+			framesPerMinute = nominal * 60 - drop
+			tens, remainder = np.divmod(counts, framesPer10Minutes)
+			counts = counts + drop * 9 * tens + np.where(remainder > drop, drop * ((remainder - drop) // framesPerMinute), 0)
+		seconds, frames = np.divmod(counts, nominal)
+		minutes, seconds = np.divmod(seconds, self._SEC_PER_MIN)
+		hours, minutes = np.divmod(minutes, self._MIN_PER_HOUR)
+		return hours, minutes, seconds, frames
+
+	def _countFromLabels(self, hours, minutes, seconds, frames):
+		"""Returns the frame count of the given places, which may overflow or be fractional."""
+		nominal = self._nominal
+		count = self._round(((hours * self._MIN_PER_HOUR + minutes) * self._SEC_PER_MIN + seconds) * nominal + frames)
+		drop = self._drop
+		if drop:
+			totalMinutes, frame = divmod(count, nominal * self._SEC_PER_MIN)
+			# Labels skipped by drop-frame are moved to the next existing label.
+			if frame < drop and totalMinutes % 10:
+				count += drop - frame
+			count -= drop * (totalMinutes - totalMinutes // 10)
+		return count
+
+	def _countsFromLabels(self, hours, minutes, seconds, frames):
+		"""Vectorized _countFromLabels for numpy arrays of places."""
+		import numpy as np
+		nominal = self._nominal
+		counts = np.floor(((hours * self._MIN_PER_HOUR + minutes) * self._SEC_PER_MIN + seconds) * nominal + frames + 0.5).astype(np.int64)
+		drop = self._drop
+		if drop:
+			totalMinutes, frame = np.divmod(counts, nominal * self._SEC_PER_MIN)
+			counts = counts + np.where((frame < drop) & (totalMinutes % 10 != 0), drop - frame, 0)
+			counts -= drop * (totalMinutes - totalMinutes // 10)
+		return counts
+
+	@staticmethod
+	def _round(value):
+		"""Rounds half up to an integer number of frames."""
+		return int(math.floor(value + 0.5))
+
+	@staticmethod
+	def _roundRatio(numerator, denominator):
+		"""Rounds half up the ratio of two integers without going through floats."""
+		return (2 * numerator + denominator) // (2 * denominator)
+
+	@staticmethod
+	def _rationalFramerate(framerate):
+		"""Returns the exact framerate as a Fraction, NTSC framerates like 29.97 and 23.976 being
+			understood as 30000/1001 and 24000/1001.
+		"""
+		if isinstance(framerate, fractions.Fraction):
+			return framerate
+		nominal = int(round(framerate))
+		if abs(framerate - nominal) > 1E-6 and abs(framerate - nominal * 1000 / 1001.0) < 0.005:
+			return fractions.Fraction(nominal * 1000, 1001)
+		return fractions.Fraction(framerate).limit_denominator(1001)
+
+	@staticmethod
+	def _droppedFrames(rate, dropFrame):
+		"""Returns the number of frame labels skipped each minute by drop-frame timecode."""
+		if not dropFrame:
+			return 0
+		if rate.denominator != 1001 or rate.numerator % 30000:
+			raise ValueError('Drop-frame timecode is only supported for multiples of 29.97.')
+		return rate.numerator // 15000
@@ -14,6 +14,7 @@ class _MetaEnumGroup(type):
 	def __new__(cls, className, bases, classDict):
 		newCls = type.__new__(cls, className, bases, classDict)
 		newCls.__init_enums__()
+		newCls._LEGACYHITS = {}
 		newCls._cls = cls
 		newCls._clsName = className
 		newCls._clsBases = bases
@@ -22,6 +23,10 @@ class _MetaEnumGroup(type):
 
 	def __call__(self, number):
 		number = int(number)
+		try:
+			return self._COMPOSITES[number]
+		except KeyError:
+			pass
 		e = None
 		for enum in self._ENUMERATORS:
 			if enum & number:
@@ -29,6 +34,9 @@ class _MetaEnumGroup(type):
 					e = e | enum
 				else:
 					e = enum
+		# Only valid combinations of the enumerators are cached, so arbitrary numbers cannot grow it.
+		if e is not None and int(e) == number:
+			self._COMPOSITES[number] = e
 		return e
 
 	def __getitem__(self, key):
@@ -69,22 +77,30 @@ class _MetaEnumGroup(type):
 		of time when trax.api is going out using the new EnumGroup
 		setup, but there will be a time when not everyone has the
 		update installed.
+
+		The old enum is built once and kept until the enumerators change.
+		Every access is counted by name in legacyHits so the callers
+		can be found and migrated.
 		"""
-		# Construct an old enum from our EnumGroup.  If we have
-		# descriptions for our new-style Enums, which is not
-		# guaranteed, then we will set them.  Otherwise we will
-		# give it an empty string.
-		kwargs = dict()
-		descriptions = dict()
-		for e in self._ENUMERATORS:
-			kwargs[e.name] = e.number
-			try:
-				descriptions[e.name] = e.description
-			except AttributeError:
-				descriptions[e.number] = ''
-		oldEnum = enum(**kwargs)
-		for number, desc in descriptions.iteritems():
-			oldEnum.setDescription(number, desc)
+		self._LEGACYHITS[name] = self._LEGACYHITS.get(name, 0) + 1
+		oldEnum = self.__dict__.get('_LEGACYENUM')
+		if oldEnum is None:
+			# Construct an old enum from our EnumGroup.  If we have
+			# descriptions for our new-style Enums, which is not
+			# guaranteed, then we will set them.  Otherwise we will
+			# give it an empty string.
+			kwargs = dict()
+			descriptions = dict()
+			for e in self._ENUMERATORS:
+				kwargs[e.name] = e.number
+				try:
+					descriptions[e.name] = e.description
+				except AttributeError:
+					descriptions[e.number] = ''
+			oldEnum = enum(**kwargs)
+			for number, desc in descriptions.iteritems():
+				oldEnum.setDescription(number, desc)
+			self._LEGACYENUM = oldEnum
 		# Try and return the attribute from the old-style enum.
 		try:
 			return getattr(oldEnum, name)
@@ -353,6 +369,15 @@ class EnumGroup(object):
 	"""
 	__metaclass__ = _MetaEnumGroup
 	_ENUMERATORS = None
+	# Lookup tables built by __init_enums__.
+	_ENUMSBYLABEL = None
+	_ENUMSBYLOWERLABEL = None
+	_ENUMSBYVALUE = None
+	_COMPOSITES = None
+	# The old-style enum built by the metaclass for backwards compatibility
+	# and the count of its accesses per attribute name.
+	_LEGACYENUM = None
+	_LEGACYHITS = None
 	_copyCount = 1
 	All = 0
 	Nothing = 0
@@ -414,7 +439,7 @@ class EnumGroup(object):
 		return type(name, cls.__bases__, dict(cls.__dict__)) 
 
 	@classmethod
-	def fromLabel(cls, label, default=None):
+	def fromLabel(cls, label, default=None, caseSensitive=True):
 		"""Gets an enumerator based on the given label.
 
 		If a default is provided and is not None, that value will be returned
@@ -424,6 +449,8 @@ class EnumGroup(object):
 		Args:
 			label(str): The label to look up.
 			default(*): The default value to return if the label is not found.
+			caseSensitive(bool): Whether the case of the label must match.
+				Default is True.
 
 		Raises:
 			ValueError: Raised if default is None and the given label does not
@@ -432,10 +459,12 @@ class EnumGroup(object):
 		Returns:
 			Enum
 		"""
-		label = str(label)
-		for e in cls._ENUMERATORS:
-			if e.label == label:
-				return e
+		if caseSensitive:
+			e = cls._ENUMSBYLABEL.get(str(label))
+		else:
+			e = cls._ENUMSBYLOWERLABEL.get(str(label).lower())
+		if e is not None:
+			return e
 		if default is not None:
 			return default
 		raise ValueError('No enumerators exist with the given label.')
@@ -459,10 +488,9 @@ class EnumGroup(object):
 		Returns:
 			Enum
 		"""
-		value = int(value)
-		for e in cls._ENUMERATORS:
-			if int(e) == value:
-				return e
+		e = cls._ENUMSBYVALUE.get(int(value))
+		if e is not None:
+			return e
 		if default is not None:
 			return default
 		raise ValueError('No enumerators exist with the given value.')
@@ -485,6 +513,16 @@ class EnumGroup(object):
 		include = include == None and cls.All or include
 		return str(separator).join([str(e) for e in cls._ENUMERATORS if e & int(include)])
 
+	@classmethod
+	def legacyHits(cls):
+		"""The number of times each attribute was looked up through the
+		old-style enum compatibility layer, like DebugLevels.labelByValue.
+
+		Returns:
+			dict: The number of lookups by attribute name.
+		"""
+		return dict(cls._LEGACYHITS or {})
+
 	@classmethod
 	def labels(cls):
 		"""A generator containing all Enum labels in the EnumGroup."""
@@ -550,6 +588,18 @@ class EnumGroup(object):
 				enum._labelIndex = labelIndex
 				labelIndex += 1
 		cls._ENUMERATORS = enums
+		# When enumerators share a label or value, the first one wins like
+		# a scan of the enumerators would.
+		cls._ENUMSBYLABEL = {}
+		cls._ENUMSBYLOWERLABEL = {}
+		cls._ENUMSBYVALUE = {}
+		cls._COMPOSITES = {}
+		cls._LEGACYENUM = None
+		for enum in enums:
+			if enum.label is not None:
+				cls._ENUMSBYLABEL.setdefault(enum.label, enum)
+				cls._ENUMSBYLOWERLABEL.setdefault(enum.label.lower(), enum)
+			cls._ENUMSBYVALUE.setdefault(int(enum), enum)
 		# Build the All object if its not defined
 		if isinstance(cls.All, int):
 			for e in enums:
@@ -640,6 +690,7 @@ class enum(object):
 		'Blue'
 	"""
 	INDICES = xrange(sys.maxint)  # indices constant to use for looping
+	_LOOKUPS = ('_labelByKey', '_indexByValue', '_keyByLowerKey')
 
 	def __call__(self, key):
 		return self.value(key)
@@ -647,9 +698,19 @@ class enum(object):
 	def __getattr__(self, key):
 		if key == '__name__':
 			return 'enum'
+		elif key in self._LOOKUPS:
+			# The lookup tables are built on first use, most enums are never looked up.
+			self._buildLookups()
+			return self.__dict__[key]
 		else:
 			raise AttributeError, key
 
+	def __setattr__(self, key, value):
+		super(enum, self).__setattr__(key, value)
+		# Rebuild the lookup tables on their next use.
+		for name in self._LOOKUPS:
+			self.__dict__.pop(name, None)
+
 	def __init__(self, *args, **kwds):
 		""" Takes the provided arguments adds them as properties of this object. For each argument you
 		pass in it will assign binary values starting with the first argument, 1, 2, 4, 8, 16, ....
@@ -689,6 +750,24 @@ class enum(object):
 					out |= self.__dict__[k]
 			self.__dict__['All'] = out
 
+	def _buildLookups(self):
+		""" Builds the tables used to look up keys, labels and indices in constant time. When several
+		keys share a value the first one wins, like a scan of the keys would.
+		"""
+		self.__dict__['_labelByKey'] = dict((key, ' '.join(re.findall('[A-Z]+[^A-Z]*', key))) for key in self._keys)
+		indexByValue = {}
+		for index, key in enumerate(self._keys):
+			try:
+				indexByValue.setdefault(self.__dict__[key], index)
+			except TypeError:
+				# Unhashable values are only found by scanning.
+				pass
+		self.__dict__['_indexByValue'] = indexByValue
+		keyByLowerKey = {}
+		for key in self.__dict__:
+			keyByLowerKey.setdefault(key.lower(), key)
+		self.__dict__['_keyByLowerKey'] = keyByLowerKey
+
 	def count(self):
 		return len(self._keys)
 
@@ -715,15 +794,15 @@ class enum(object):
 		:returns: A list of labels as strings
 		"""
 		if byVal:
-			return [' '.join(re.findall('[A-Z]+[^A-Z]*', key)) for key in sorted(self.keys(), key=lambda i:getattr(self, i))]
-		return [' '.join(re.findall('[A-Z]+[^A-Z]*', key)) for key in self.keys()]
+			return [self._labelByKey[key] for key in sorted(self.keys(), key=lambda i:getattr(self, i))]
+		return [self._labelByKey[key] for key in self.keys()]
 
 	def labelByValue(self, value):
 		""" Returns the label for a specific value. Labels automatically add spaces
 		for every capital letter after the first.
 		:param value: The value you want the label for
 		"""
-		return ' '.join(re.findall('[A-Z]+[^A-Z]*', self.keyByValue(value)))
+		return self._labelByKey.get(self.keyByValue(value), '')
 
 	def isValid(self, value):
 		""" Returns True if this value is stored in the parameters.
@@ -748,10 +827,10 @@ class enum(object):
 		:param value: The value to find the parameter name of.
 		:returns: String. The parameter name or empty string.
 		"""
-		for key in self._keys:
-			if self.__dict__[key] == value:
-				return key
-		return ''
+		index = self.indexByValue(value)
+		if index == -1:
+			return ''
+		return self._keys[index]
 
 	def keys(self):
 		""" Returns a list of parameter names
@@ -767,11 +846,10 @@ class enum(object):
 		if caseSensitive:
 			return self.__dict__.get(str(key), 0)
 		else:
-			key = str(key).lower()
-			for k in self.__dict__.keys():
-				if k.lower() == key:
-					return self.__dict__[k]
-			return 0
+			key = self._keyByLowerKey.get(str(key).lower())
+			if key is None:
+				return 0
+			return self.__dict__[key]
 
 	def values(self):
 		""" Returns a list of all values for stored parameters
@@ -810,10 +888,13 @@ class enum(object):
 		:returns: Int, the index of the value or -1
 		.. seealso:: :meth:`keyByValue`
 		"""
-		for index in range(len(self._keys)):
-			if (self.__dict__[ self._keys[index] ] == value):
-				return index
-		return -1
+		try:
+			return self._indexByValue.get(value, -1)
+		except TypeError:
+			for index in range(len(self._keys)):
+				if (self.__dict__[ self._keys[index] ] == value):
+					return index
+			return -1
 
 	def toString(self, value, default='None', sep=' '):
 		""" For the provided value return the parameter name(s) seperated by sep. If you provide
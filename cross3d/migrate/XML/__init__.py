@@ -24,6 +24,17 @@ type conversion to and from Qt types.
 The blurdev XML module defines two classes -- :class:`XMLElement` and 
 :class:`XMLDocument`
 
+They are provided by one of two backends.  The default ``minidom`` backend
+wraps :mod:`xml.dom.minidom`.  The ``etree`` backend provides the same API on
+top of :mod:`xml.etree.cElementTree`, which parses and serializes large
+documents an order of magnitude faster and does not require Qt unless Qt
+values are recorded.  The backend is selected by the ``CROSS3D_XML_BACKEND``
+environment variable or by calling :func:`setBackend`, and its classes are
+always available as :class:`ETreeElement` and :class:`ETreeDocument`.
+
+Documents too large to hold in memory are read one element at a time with
+:func:`iterElements` and written one element at a time with :class:`XMLWriter`.
+
 
 .. autoclass:: XMLElement
    :members:
@@ -38,7 +49,43 @@ The blurdev XML module defines two classes -- :class:`XMLElement` and
 
 from __future__ import absolute_import
 
-from .xmlelement import XMLElement
-from .xmldocument import XMLDocument
+import os
+
 from .minidom import escape, unescape
+from .etreeelement import ETreeElement
+from .etreedocument import ETreeDocument
+from .xmlstream import iterElements, XMLWriter
+
+_backend = None
+
+def backend():
+	"""Returns the name of the backend providing XMLElement and XMLDocument."""
+	return _backend
+
+def setBackend(name):
+	"""Selects the classes XMLElement and XMLDocument refer to.
+
+	Modules importing them from this package when they need them, like cross3d does, pick up the change.
+
+	Args:
+		name(str): 'minidom' or 'etree'.
+	"""
+	global XMLElement, XMLDocument, _backend
+	if name == 'etree':
+		XMLElement, XMLDocument = ETreeElement, ETreeDocument
+	elif name == 'minidom':
+		from .xmlelement import XMLElement
+		from .xmldocument import XMLDocument
+	else:
+		raise ValueError('Unknown XML backend: {}'.format(name))
+	_backend = name
+
+if os.environ.get('CROSS3D_XML_BACKEND'):
+	setBackend(os.environ['CROSS3D_XML_BACKEND'])
+else:
+	try:
+		setBackend('minidom')
+	except ImportError:
+		# The minidom backend requires blurdev and Qt.
+		setBackend('etree')
 
@@ -0,0 +1,242 @@
+##
+#	\namespace	cross3d.migrate.XML.etreedocument
+#
+#	\remarks	Defines ETreeDocument, an XMLDocument backed by xml.etree.cElementTree instead of minidom
+#
+#	\author		Blur Studio
+#
+
+import os
+import xml.dom
+import xml.etree.cElementTree as ElementTree
+
+from etreeelement import ETreeElement, _ETree
+
+# The tag of the element holding the root element and the comments of a document.
+_DOCUMENT = '#document'
+
+def _escapeText(text):
+	if '&' in text:
+		text = text.replace('&', '&amp;')
+	if '<' in text:
+		text = text.replace('<', '&lt;')
+	if '>' in text:
+		text = text.replace('>', '&gt;')
+	return text
+
+def _escapeAttribute(text):
+	text = _escapeText(text)
+	if '"' in text:
+		text = text.replace('"', '&quot;')
+	if '\n' in text:
+		text = text.replace('\n', '&#10;')
+	return text
+
+def _serialize(element, write):
+	""" Writes the xml of the element by calling write with unicode strings.
+
+	This is equivalent to ElementTree.write, which spends most of its time on namespaces that these
+	documents do not use.
+	"""
+	tag = element.tag
+	if not isinstance(tag, basestring):
+		write(u'<!--%s-->' % _escapeText(element.text or ''))
+	else:
+		items = element.items()
+		if items:
+			items.sort()
+			write(u'<%s %s' % (tag, u' '.join([u'%s="%s"' % (key, _escapeAttribute(value)) for key, value in items])))
+		else:
+			write(u'<' + tag)
+		text = element.text
+		if text or len(element):
+			write(u'>')
+			if text:
+				write(_escapeText(text))
+			for child in element:
+				_serialize(child, write)
+			write(u'</%s>' % tag)
+		else:
+			write(u' />')
+	if element.tail:
+		write(_escapeText(element.tail))
+
+
+class ETreeDocument(ETreeElement):
+	""" class to ease the handling of XML documents, see ETreeElement """
+	__slots__ = ()
+
+	def __init__(self, object=None):
+		document = ElementTree.Element(_DOCUMENT)
+		if isinstance(object, ElementTree.ElementTree):
+			object = object.getroot()
+		if object is not None:
+			document.append(object)
+		ETreeElement.__init__(self, document, '', _ETree(document, document=True))
+
+	def _setRoot(self, root):
+		document = ElementTree.Element(_DOCUMENT)
+		document.append(root)
+		self._object = document
+		self._tree = _ETree(document, document=True)
+
+	def addNode(self, nodeName):
+		"""Adds the root element of the document.
+
+		:raises xml.dom.HierarchyRequestErr: if the document already has a root element, like minidom.
+
+		"""
+		if self._children():
+			raise xml.dom.HierarchyRequestErr('two document elements disallowed')
+		return ETreeElement.addNode(self, nodeName)
+
+	def findElementById(self, childId):
+		split = childId.split('::')
+		outTemplate = None
+		if split:
+			outTemplate = self.root().findChildById(split[0])
+			index = 1
+
+			while index < len(split) and outTemplate:
+				outTemplate = outTemplate.findChildById(split[index])
+				index += 1
+		return outTemplate
+
+	def load(self, fileName):
+		"""
+		Loads the given xml file by calling xml.etree.cElementTree.parse,
+		setting this instances object to the resulting value.
+
+		"""
+		fileName = unicode(fileName)
+		if os.path.exists(fileName):
+			try:
+				root = ElementTree.parse(fileName).getroot()
+			except Exception, e:
+				print 'Unable to parse filename!!!!', fileName
+				print e
+				return False
+			self.removeWitespaceNodes(root)
+			self._setRoot(root)
+			self.__file__ = fileName
+			return True
+		return False
+
+	def parse(self, xmlString):
+		if type(xmlString).__name__ == 'QString':
+			xmlString = unicode(xmlString)
+		if isinstance(xmlString, unicode):
+			xmlString = xmlString.encode('utf-8')
+		if xmlString:
+			self._setRoot(ElementTree.fromstring(xmlString))
+			return True
+		return False
+
+	@staticmethod
+	def removeWitespaceNodes(node):
+		"""
+		Removes any text that is simply whitespace around child elements. Because we are saving to disk
+		using pretty xml the new lines get read into the xml leading to files getting alot of empty whitespace.
+		"""
+		for element in node.iter():
+			if len(element):
+				if element.text and not element.text.strip(' \t\n'):
+					element.text = None
+				for child in element:
+					if child.tail and not child.tail.strip(' \t\n'):
+						child.tail = None
+
+	def root(self):
+		"""Returns the root xml node for this document.
+
+		"""
+		children = self._children()
+		if children:
+			return self._wrap(children[0])
+		return None
+
+	def save(self, fileName, pretty=True, showDialog=False):
+		"""
+		Saves the xml document to the given file, converting it to a
+		pretty XML document if so desired.
+
+		:param fileName: path to the save location
+		:param pretty: if set to True, will format spaces and line breaks.
+		:param showDialog: if set to True, if an error occurs while saving,
+		                   a dialog will be displayed showing the errors.
+		:type fileName: str
+		:type pretty: bool
+		:type showDialog: bool
+
+		"""
+		if os.path.exists(os.path.split(fileName)[0]):
+			self.__file__ = fileName
+			try:
+				text = self._serialize('<?xml version="1.0" encoding="utf-8"?>\n', ' ' * 4 if pretty else None).encode('utf-8')
+			except:
+				print 'Encoding error while saving XML'
+				if showDialog:
+					from PyQt4.QtGui import QMessageBox
+					QMessageBox.critical(None, 'Encoding Error', 'Unable to save xml data, please check for unsupported characters.')
+				return False
+			f = open(fileName, 'wb')
+			f.write(text)
+			f.close()
+			return True
+		if showDialog:
+			from PyQt4.QtGui import QMessageBox
+			QMessageBox.warning(None, 'Unable to Save', 'Unable to save xml data, please verify you have the correct privileges.')
+		return False
+
+	def _serialize(self, declaration, indent=None, newl='\n'):
+		"""Returns the document as unicode, indented if indent is provided."""
+		changes = []
+		if indent is not None:
+			for child in self._object:
+				self._indent(child, indent, newl, 0, changes)
+		try:
+			parts = [unicode(declaration)]
+			for child in self._object:
+				_serialize(child, parts.append)
+				if indent is not None:
+					parts.append(newl)
+			return u''.join(parts)
+		finally:
+			# Restoring the text the indentation replaced, leaving the document untouched.
+			for element, attribute, value in reversed(changes):
+				setattr(element, attribute, value)
+
+	@classmethod
+	def _indent(cls, element, indent, newl, level, changes):
+		if len(element):
+			padding = newl + indent * (level + 1)
+			if not (element.text and element.text.strip()):
+				changes.append((element, 'text', element.text))
+				element.text = padding
+			for child in element:
+				cls._indent(child, indent, newl, level + 1, changes)
+				if not (child.tail and child.tail.strip()):
+					changes.append((child, 'tail', child.tail))
+					child.tail = padding
+			if not (child.tail and child.tail.strip()):
+				child.tail = newl + indent * level
+
+	def toxml(self, encoding='utf-8'):
+		text = self._serialize('<?xml version="1.0" encoding="utf-8"?>')
+		if encoding == 'utf-8':
+			return text
+		else:
+			return text.encode('utf-8')
+
+	def toprettyxml(self, indent='\t', newl='\n', encoding=None):
+		if encoding is None:
+			return self._serialize('<?xml version="1.0" ?>' + newl, indent, newl)
+		return self._serialize('<?xml version="1.0" encoding="%s" ?>%s' % (encoding, newl), indent, newl).encode(encoding)
+
+	@staticmethod
+	def formatXml(xmltext, indented=4):
+		if isinstance(xmltext, unicode):
+			xmltext = xmltext.encode('utf-8')
+		document = ETreeDocument(ElementTree.fromstring(xmltext))
+		document.removeWitespaceNodes(document._object)
+		return document._serialize('<?xml version="1.0" encoding="utf-8"?>\n', ' ' * indented)
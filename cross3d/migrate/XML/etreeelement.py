@@ -0,0 +1,576 @@
+##
+#	\namespace	cross3d.migrate.XML.etreeelement
+#
+#	\remarks	Defines ETreeElement, an XMLElement backed by xml.etree.cElementTree instead of minidom
+#
+#	\author		Blur Studio
+#
+
+import re
+import copy
+import xml.etree.cElementTree as ElementTree
+
+from minidom import escape, unescape
+
+# Characters escape replaces, so attributes without them skip the replacements.
+_escapeRegex = re.compile(u'[&<>"\r\n\t]')
+
+class _ETree(object):
+	""" State shared by the wrappers of the elements of a tree.
+
+	ElementTree elements do not know their parent and cannot hold attributes, so the parents and the
+	name to children index of each element are kept here. Both are built the first time they are needed
+	and updated by the ETreeElement methods modifying the tree. Modifying the underlying elements
+	directly requires calling clear.
+	"""
+	__slots__ = ('root', 'document', '_parents', '_indexes')
+
+	def __init__(self, root, document=False):
+		self.root = root
+		# Like minidom documents, the element holding the root element of a document is not an element.
+		self.document = root if document else None
+		self.clear()
+
+	def clear(self):
+		self._parents = None
+		self._indexes = {}
+
+	def index(self, element):
+		""" Returns the {name: [children]} index of the element children, comments excluded. """
+		index = self._indexes.get(element)
+		if index is None:
+			index = {}
+			for child in element:
+				if isinstance(child.tag, basestring):
+					index.setdefault(child.tag, []).append(child)
+			self._indexes[element] = index
+		return index
+
+	def parent(self, element):
+		if self._parents is None:
+			self._parents = dict((child, parent) for parent in self.root.iter() for child in parent)
+		return self._parents.get(element)
+
+	def appended(self, parent, child):
+		index = self._indexes.get(parent)
+		if index is not None and isinstance(child.tag, basestring):
+			index.setdefault(child.tag, []).append(child)
+		if self._parents is not None:
+			self._parents[child] = parent
+			for descendant in child.iter():
+				for grandChild in descendant:
+					self._parents[grandChild] = descendant
+
+	def removed(self, parent, child):
+		self._indexes.pop(parent, None)
+		if self._parents is not None:
+			self._parents.pop(child, None)
+
+
+class ETreeElement(object):
+	"""Ease of use wrapper class for :class:`xml.etree.cElementTree.Element`
+
+	ETreeElement provides the API of :class:`XMLElement` on top of cElementTree, which parses and
+	serializes an order of magnitude faster than minidom. Children are looked up by name through an
+	index built once per element, rather than by scanning the child nodes on every call. Qt types are
+	only imported when recording or restoring Qt values.
+
+	"""
+	__slots__ = ('_object', '_tree', '__file__', 'allowEmptyAttrs')
+
+	def __init__(self, object, filename='', tree=None):
+		""" initialize the class with an <xml.etree.cElementTree.Element> instance """
+		if object is None:
+			object = ElementTree.Element(None)
+		self._object = object
+		self._tree = tree or _ETree(object)
+		self.__file__ = filename
+		# Used to allow saving empty attributes.
+		self.allowEmptyAttrs = False
+
+	def __eq__(self, other):
+		""" checks to see if the wrapped <xml.etree.cElementTree.Element> instance is the same """
+		if isinstance(other, ETreeElement):
+			return self._object is other._object
+		return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def _wrap(self, element):
+		return ETreeElement(element, self.__file__, self._tree)
+
+	def _children(self):
+		""" collects the child elements, leaving out comments """
+		return [child for child in self._object if isinstance(child.tag, basestring)]
+
+	def _findPoint(self, name, cls, method):
+		child = self.findChild(name)
+		if child:
+			x = method(child.attribute('x', 0))
+			y = method(child.attribute('y', 0))
+			return cls(x, y)
+		return cls()
+
+	def _findRect(self, name, cls, method):
+		child = self.findChild(name)
+		if child:
+			x = method(child.attribute('x', 0))
+			y = method(child.attribute('y', 0))
+			w = method(child.attribute('width', 0))
+			h = method(child.attribute('height', 0))
+			return cls(x, y, w, h)
+		return cls()
+
+	def _findSize(self, name, cls, method):
+		child = self.findChild(name)
+		if child:
+			w = method(child.attribute('width', 0))
+			h = method(child.attribute('height', 0))
+			return cls(w, h)
+		return cls()
+
+	@property
+	def nodeName(self):
+		return self._object.tag
+
+	def clear(self):
+		for child in list(self._object):
+			self._object.remove(child)
+			self._tree.removed(self._object, child)
+		self._object.text = None
+
+	def recordValue(self, value):
+		valtype = type(value)
+		qtType = valtype.__name__ if valtype.__module__.startswith('PyQt4') else None
+
+		# Convert Qt basics to python basics where possible
+		if qtType == 'QString':
+			value = unicode(value)
+			valtype = unicode
+			qtType = None
+
+		# Record a list of properties
+		if valtype in (list, tuple):
+			self.setAttribute('type', 'list')
+			for val in value:
+				entry = self.addNode('entry')
+				entry.recordValue(val)
+
+		# Record a dictionary of properties
+		elif valtype == dict:
+			self.setAttribute('type', 'dict')
+			for key, val in value.items():
+				entry = self.addNode('entry')
+				entry.setAttribute('key', key)
+				entry.recordValue(val)
+
+		elif qtType == 'QDateTime':
+			self.setAttribute('type', 'QDateTime')
+			self.setAttribute('value', value.toString('yyyy-MM-dd hh:mm:ss'))
+
+		elif qtType == 'QDate':
+			self.setAttribute('type', 'QDate')
+			self.setAttribute('value', value.toString('yyyy-MM-dd'))
+
+		elif qtType in ('QRect', 'QRectF'):
+			self.setAttribute('type', qtType)
+			self.setRect('rect', value)
+
+		elif qtType in ('QPoint', 'QPointF'):
+			self.setAttribute('type', qtType)
+			self.setPoint('point', value)
+
+		elif qtType == 'QFont':
+			self.setAttribute('type', 'QFont')
+			self.setAttribute('value', value.toString())
+
+		elif qtType in ('QSize', 'QSizeF'):
+			self.setAttribute('type', qtType)
+			self.setSize('size', value)
+
+		elif qtType == 'QColor':
+			self.setAttribute('type', 'QColor')
+			self.setColor('color', value)
+
+		# Record a QByteArray (Experimental)
+		elif qtType == 'QByteArray':
+			self.setAttribute('type', 'QByteArray')
+			self.setAttribute('value', value.toPercentEncoding())
+
+		# Record a basic property
+		else:
+			self.setAttribute('value', value)
+			typ = valtype.__name__
+			if typ == 'unicode':
+				typ = 'str'
+			self.setAttribute('type', typ)
+
+	def restoreValue(self, fail=None):
+		valtype = self.attribute('type')
+		value = None
+
+		# Restore a list item
+		if valtype == 'list':
+			value = []
+			for child in self.children():
+				value.append(child.restoreValue())
+
+		# Restore a dictionary item
+		elif valtype == 'dict':
+			value = {}
+			for child in self.children():
+				value[child.attribute('key')] = child.restoreValue()
+
+		elif valtype == 'QDateTime':
+			from PyQt4.QtCore import QDateTime
+			value = QDateTime.fromString(self.attribute('value'), 'yyyy-MM-dd hh:mm:ss')
+
+		elif valtype == 'QDate':
+			from PyQt4.QtCore import QDate
+			value = QDate.fromString(self.attribute('value'), 'yyyy-MM-dd')
+
+		elif valtype == 'QRect':
+			value = self.findRect('rect')
+
+		elif valtype == 'QRectF':
+			value = self.findRectF('rect')
+
+		elif valtype == 'QSize':
+			value = self.findSize('size')
+
+		elif valtype == 'QSizeF':
+			value = self.findSizeF('size')
+
+		elif valtype == 'QPoint':
+			value = self.findPoint('point')
+
+		elif valtype == 'QPointF':
+			value = self.findPointF('point')
+
+		elif valtype == 'QColor':
+			value = self.findColor('color')
+
+		elif valtype == 'QFont':
+			from PyQt4.QtGui import QFont
+			value = QFont()
+			value.fromString(self.attribute('value'))
+
+		# Restore a string
+		elif valtype in ('str', 'unicode', 'QString'):
+			value = unicode(self.attribute('value'))
+
+		elif valtype == 'ViewMode':
+			# If treated as a basic value would return fail
+			value = int(self.attribute('value'))
+
+		# Restore a QByteArray (Experimental)
+		elif valtype == 'QByteArray':
+			from PyQt4.QtCore import QByteArray
+			value = QByteArray.fromPercentEncoding(self.attribute('value', ''))
+
+		# Restore a Qt.CheckState
+		elif valtype == 'CheckState':
+			from PyQt4.QtCore import Qt
+			value = Qt.CheckState(self.attribute('value', 0))
+
+		# Restore a basic value
+		else:
+			try:
+				value = eval('%s(%s)' % (valtype, self.attribute('value')))
+			except:
+				value = fail
+
+		return value
+
+	def addComment(self, comment):
+		out = ElementTree.Comment(comment)
+		self._object.append(out)
+		self._tree.appended(self._object, out)
+		return True
+
+	def addNode(self, nodeName):
+		"""Adds a new node child to the current element with the given node name.
+
+		:param nodeName: name of the child to add
+		:type nodeName: str
+		:rtype: :class:`ETreeElement`
+
+		"""
+		out = ElementTree.SubElement(self._object, nodeName)
+		self._tree.appended(self._object, out)
+		return self._wrap(out)
+
+	def addChild(self, child, clone=True, deep=True):
+		if isinstance(child, ETreeElement):
+			child = child._object
+
+		if clone:
+			if deep:
+				child = copy.deepcopy(child)
+			else:
+				child = ElementTree.Element(child.tag, dict(child.attrib))
+		self._object.append(child)
+		self._tree.appended(self._object, child)
+
+	def attribute(self, attr, fail=''):
+		"""Gets the attribute value of the element by the given attribute id
+		:param attr: Name of the atribute you want to recover.
+		:param fail: If the atribute does not exist return this.
+		"""
+		out = self._object.get(attr)
+		if out:
+			out = unicode(out)
+			if '&' in out:
+				out = unescape(out)
+			return out
+		return fail
+
+	def attributeDict(self):
+		"""
+			\Remarks	Returns a dictionary of attributes
+			\Return		<dict>
+		"""
+		return dict(self._object.attrib)
+
+	def childAt(self, index):
+		"""Finds the child at the given index, provided the index is within the child range
+		"""
+		childList = self._children()
+		if 0 <= index and index < len(childList):
+			return self._wrap(childList[index])
+		return None
+
+	def childNames(self):
+		"""Collects all the names of the children of this element
+
+		"""
+		return [child.tag for child in self._children()]
+
+	def children(self):
+		"""Collects all the child elements of this element, wrapping each child as an
+		:class:`ETreeElement`.
+
+		"""
+		return [self._wrap(child) for child in self._children()]
+
+	def index(self, object):
+		"""Finds the index of the inputed child object in this instance's
+		children, returning -1 if it cannot be found.
+
+		"""
+		if isinstance(object, ETreeElement):
+			object = object._object
+		for index, child in enumerate(self._children()):
+			if child is object:
+				return index
+		return -1
+
+	def findChild(self, childName, recursive=False, autoCreate=False):
+		"""Finds the first instance of the child of this instance whose nodeName is the given child name.
+		:param childName: Name to search for.
+		:param recursive: Recursively search each child node for more child nodes. Default is False
+		:param autoCreate: Create the node if it is not found.
+		"""
+		if recursive:
+			for child in self._object.iter(childName):
+				if child is not self._object:
+					return self._wrap(child)
+		else:
+			children = self._tree.index(self._object).get(childName)
+			if children:
+				return self._wrap(children[0])
+
+		if autoCreate:
+			return self.addNode(childName)
+
+		return None
+
+	def findChildById(self, key):
+		key = '_'.join(re.findall('[a-zA-Z0-9]*', key)).lower()
+		for child in self.children():
+			if key == child.getId() or key == '_'.join(re.findall('[a-zA-Z0-9]*', child.nodeName)).lower():
+				return child
+		return None
+
+	def findChildren(self, childName, recursive=False):
+		"""Finds all the children of this instance whose nodeName is the given child name.
+
+		:param childName: The name of the child nodes to look for.
+		:param recursive: Recursively search each child node for more child nodes. Default is False
+		"""
+		if recursive:
+			return [self._wrap(child) for child in self._object.iter(childName) if child is not self._object]
+		return [self._wrap(child) for child in self._tree.index(self._object).get(childName, ())]
+
+	def findColor(self, name, fail=None):
+		from PyQt4.QtGui import QColor
+
+		element = self.findChild(name)
+		if element:
+			return QColor(float(element.attribute('red')), float(element.attribute('green')), float(element.attribute('blue')), float(element.attribute('alpha')))
+		elif fail:
+			return fail
+		else:
+			return QColor()
+
+	def findFont(self, name, fail=None):
+		from PyQt4.QtGui import QFont
+
+		element = self.findChild(name)
+		if element:
+			font = QFont()
+			font.fromString(element.attribute('value'))
+			return font
+		elif fail:
+			return fail
+		else:
+			return QFont()
+
+	def findProperty(self, propName, fail=''):
+		child = self.findChild(propName)
+		if child:
+			return child.value()
+		return fail
+
+	def findPoint(self, name):
+		from PyQt4.QtCore import QPoint
+		return self._findPoint(name, QPoint, int)
+
+	def findPointF(self, name):
+		from PyQt4.QtCore import QPointF
+		return self._findPoint(name, QPointF, float)
+
+	def findRect(self, name):
+		from PyQt4.QtCore import QRect
+		return self._findRect(name, QRect, int)
+
+	def findRectF(self, name):
+		from PyQt4.QtCore import QRectF
+		return self._findRect(name, QRectF, float)
+
+	def findSize(self, name):
+		from PyQt4.QtCore import QSize
+		return self._findSize(name, QSize, int)
+
+	def findSizeF(self, name):
+		from PyQt4.QtCore import QSizeF
+		return self._findSize(name, QSizeF, float)
+
+	def getId(self):
+		out = self.attribute('id')
+		if not out:
+			out = '_'.join(re.findall('[a-zA-Z0-9]*', self.attribute('name'))).lower()
+		return out
+
+	def name(self):
+		return self._object.tag
+
+	def parent(self):
+		parent = self._tree.parent(self._object)
+		if parent is None or parent is self._tree.document:
+			return None
+		return self._wrap(parent)
+
+	def recordProperty(self, name, value):
+		element = self.findChild(name)
+		if element:
+			element.remove()
+
+		element = self.addNode(name)
+		element.recordValue(value)
+
+	def restoreProperty(self, name, fail=None):
+		element = self.findChild(name)
+		if element:
+			return element.restoreValue(fail)
+		return fail
+
+	def remove(self):
+		parent = self._tree.parent(self._object)
+		if parent is not None:
+			parent.remove(self._object)
+			self._tree.removed(parent, self._object)
+		return True
+
+	def setAttribute(self, attr, val):
+		"""Sets the attribute of this instance to the inputed value,
+		automatically converting the value to a string.
+
+		"""
+		if val != '' or self.allowEmptyAttrs:
+			val = unicode(val)
+			# Values are stored escaped like the minidom backend does, so both write the same files.
+			if _escapeRegex.search(val):
+				val = escape(val)
+			self._object.set(attr, val)
+			return True
+		return False
+
+	def setColor(self, name, color):
+		element = self.addNode(name)
+		if element:
+			element.setAttribute('red', color.red())
+			element.setAttribute('green', color.green())
+			element.setAttribute('blue', color.blue())
+			element.setAttribute('alpha', color.alpha())
+
+	def setProperty(self, propName, val):
+		prop = self.findChild(propName)
+		if not prop:
+			prop = self.addNode(propName)
+		prop.setValue(val)
+
+	def setFont(self, name, font):
+		element = self.addNode(name)
+		element.setAttribute('value', font.toString())
+		return element
+
+	def setPoint(self, name, point):
+		element = self.addNode(name)
+		element.setAttribute('x', point.x())
+		element.setAttribute('y', point.y())
+		return element
+
+	def setRect(self, name, rect):
+		element = self.addNode(name)
+		element.setAttribute('x', rect.x())
+		element.setAttribute('y', rect.y())
+		element.setAttribute('width', rect.width())
+		element.setAttribute('height', rect.height())
+		return element
+
+	def setSize(self, name, size):
+		element = self.addNode(name)
+		element.setAttribute('width', size.width())
+		element.setAttribute('height', size.height())
+		return element
+
+	def setValue(self, val):
+		"""Sets the text value for this instance, automatically converting the inputed value to a
+		string.
+
+		"""
+		self._object.text = unicode(val)
+		return True
+
+	def uri(self):
+		out = []
+		temp = self
+		while temp:
+			name = temp.getId()
+			if not name:
+				name = temp.nodeName
+			out.insert(0, name)
+			temp = temp.parent()
+
+		return '::'.join(out)
+
+	def value(self):
+		"""Returns the text value of this instance, or a blank string if it has none.
+
+		"""
+		text = self._object.text
+		if text:
+			return unicode(text)
+		return ''
@@ -0,0 +1,147 @@
+##
+#	\namespace	cross3d.migrate.XML.xmlstream
+#
+#	\remarks	Reads and writes large XML documents one element at a time, keeping memory flat
+#
+#	\author		Blur Studio
+#
+
+import xml.etree.cElementTree as ElementTree
+
+from etreeelement import ETreeElement
+from etreedocument import ETreeDocument, _serialize, _escapeAttribute
+
+
+def iterElements(source, tag=None, depth=1):
+	"""Yields the elements of a document as they are parsed, freeing each one once the next is requested.
+
+	Only the yielded element and its ancestors are in memory, so documents of any size can be read.
+	Whitespace around child elements is removed like XMLDocument.load does. Keep the values needed
+	rather than the yielded elements, which are emptied afterwards.
+
+		for element in iterElements(path, 'layer'):
+			layers[element.attribute('id')] = element.findChild('propSetOverride').restoreValue()
+
+	:param source: path or file object of the document
+	:param tag: only yield the elements with this name. Default is None, for all of them.
+	:param depth: depth of the yielded elements, 1 for the children of the root element and 0 for
+		the root element itself.
+	:rtype: generator of :class:`ETreeElement`
+
+	"""
+	fileName = source if isinstance(source, basestring) else getattr(source, 'name', '')
+	ancestors = []
+	for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+		if event == 'start':
+			ancestors.append(element)
+			continue
+		ancestors.pop()
+		if len(ancestors) == depth:
+			if tag is None or element.tag == tag:
+				ETreeDocument.removeWitespaceNodes(element)
+				yield ETreeElement(element, fileName)
+			element.clear()
+		elif len(ancestors) < depth and ancestors:
+			# Elements above the streamed depth are freed as well, once their children were yielded.
+			element.clear()
+		else:
+			continue
+		# Detaching the element rather than leaving an empty element per yielded one in its parent.
+		# The root element, yielded for a depth of 0, has none.
+		if ancestors:
+			ancestors[-1].remove(element)
+
+
+class XMLWriter(object):
+	"""Writes an XML document to a file one element at a time.
+
+	The writer acts as the root element of the document: each element added with addNode is written
+	when the next one is added or when the writer is closed, so code recording itself with addNode
+	works unchanged and only one child of the root is in memory at a time.
+
+		with XMLWriter(path, 'layerState') as writer:
+			for layer in scene.layers():
+				layer.recordLayerState(writer)
+
+	"""
+
+	def __init__(self, target, rootName, attributes=None, pretty=False):
+		"""
+		:param target: path or file object to write the utf-8 encoded document to.
+		:param rootName: name of the root element.
+		:param attributes: attributes of the root element, escaped like XMLElement.setAttribute does.
+		:param pretty: if set to True, will format spaces and line breaks.
+
+		"""
+		if isinstance(target, basestring):
+			self._file = open(target, 'wb')
+			self._ownsFile = True
+		else:
+			self._file = target
+			self._ownsFile = False
+		self._rootName = rootName
+		self._indent = ' ' * 4 if pretty else None
+		self._pending = None
+		self.__file__ = target if self._ownsFile else getattr(target, 'name', '')
+
+		root = ETreeElement(ElementTree.Element(rootName))
+		for key, value in (attributes or {}).items():
+			root.setAttribute(key, value)
+		head = u''.join([u' %s="%s"' % (key, _escapeAttribute(value)) for key, value in sorted(root._object.items())])
+		self._write(u'<?xml version="1.0" encoding="utf-8"?>\n<%s%s>' % (rootName, head))
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exceptionType, exceptionValue, traceback):
+		self.close()
+
+	def _write(self, text):
+		self._file.write(text.encode('utf-8'))
+
+	def _flush(self):
+		element = self._pending
+		if element is None:
+			return
+		self._pending = None
+		if self._indent is not None:
+			self._write(u'\n' + self._indent)
+			# The element is discarded once written, the text the indentation replaces is not restored.
+			ETreeDocument._indent(element, self._indent, u'\n', 1, [])
+		parts = []
+		_serialize(element, parts.append)
+		self._write(u''.join(parts))
+
+	def addNode(self, nodeName):
+		"""Adds a child to the root element, writing the previous one.
+
+		:param nodeName: name of the child to add
+		:type nodeName: str
+		:rtype: :class:`ETreeElement`
+
+		"""
+		self._flush()
+		self._pending = ElementTree.Element(nodeName)
+		return ETreeElement(self._pending, self.__file__)
+
+	def write(self, element):
+		"""Writes an element as a child of the root element.
+
+		:param element: :class:`ETreeElement` or xml.etree element.
+
+		"""
+		self._flush()
+		if isinstance(element, ETreeElement):
+			element = element._object
+		self._pending = element
+		self._flush()
+
+	def close(self):
+		"""Writes the last element and the end of the document, closing the file if the writer opened it."""
+		if self._file is None:
+			return
+		self._flush()
+		self._write(u'\n</%s>\n' % self._rootName if self._indent is not None else u'</%s>' % self._rootName)
+		if self._ownsFile:
+			self._file.close()
+		self._file = None
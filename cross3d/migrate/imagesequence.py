@@ -1,5 +1,6 @@
 import os
 import re
+import collections
 
 # define the default environment variables
 OS_TYPE = ''
@@ -10,6 +11,29 @@ elif (os.name == 'nt'):
 elif (os.name == 'osx'):
 	OS_TYPE = 'MacOS'
 
+# Look for ScXXX or SXXXX.XX to include in the prefix. This prevents problems with incorrectly
+# identifying a shot number as a image sequence. Thanks willc.
+_INFO_PATTERN = r'(?P<pre>^.+?(?:Sc\d{3}_S\d{4}\.\d{2})?\D*)(?P<frame>\d+)(?P<post>\D*\.[A-Za-z0-9]+?$)'
+_REPR_PATTERN = r'(?P<pre>^.+?)\[(?P<start>\d+)(?P<separator>[^\da-zA-Z]?)(?P<end>\d+)\](?P<post>\.[A-Za-z0-9]+?$)'
+
+# The compiled patterns for each os, Windows paths are case insensitive.
+_INFO_REGEXES = {'Windows': re.compile(_INFO_PATTERN, flags=re.I)}
+_INFO_REGEX = re.compile(_INFO_PATTERN)
+_REPR_REGEXES = {'Windows': re.compile(_REPR_PATTERN, flags=re.I)}
+_REPR_REGEX = re.compile(_REPR_PATTERN)
+
+# Least recently used imageSequenceInfo results, see setInfoCacheSize.
+_infoCache = collections.OrderedDict()
+_infoCacheSize = 0
+
+def setInfoCacheSize(size):
+	""" Caches the results of imageSequenceInfo for up to size paths, which helps callers parsing
+	the same paths over and over. The default of 0 disables the cache.
+	"""
+	global _infoCacheSize
+	_infoCacheSize = size
+	_infoCache.clear()
+
 def imageSequenceFromFileName(fileName):
 	r"""
 	Gets a list of files that belong to the same image sequence as the 
@@ -56,16 +80,38 @@ def imageSequenceInfo(path, osystem=None):
 	Returns:
 		match: Returns the results of the re.match call or None
 	"""
-	flags = 0
 	if osystem == None:
 		osystem = OS_TYPE
-	if osystem == 'Windows':
-		flags = re.I
-	# Look for ScXXX or SXXXX.XX to include in the prefix. This prevents problems with incorrectly
-	# identifying a shot number as a image sequence. Thanks willc.
-	regex = re.compile(r'(?P<pre>^.+?(?:Sc\d{3}_S\d{4}\.\d{2})?\D*)(?P<frame>\d+)(?P<post>\D*\.[A-Za-z0-9]+?$)', flags=flags)
-	path = os.path.normpath(path)
-	return regex.match(path)
+	if not _infoCacheSize:
+		return _INFO_REGEXES.get(osystem, _INFO_REGEX).match(os.path.normpath(path))
+	key = (path, osystem)
+	try:
+		match = _infoCache.pop(key)
+	except KeyError:
+		match = _INFO_REGEXES.get(osystem, _INFO_REGEX).match(os.path.normpath(path))
+		if len(_infoCache) >= _infoCacheSize:
+			_infoCache.popitem(last=False)
+	_infoCache[key] = match
+	return match
+
+def imageSequenceInfos(paths, osystem=None):
+	""" Returns the imageSequenceInfo of each path in a single pass.
+
+	Args:
+		paths (list): The paths to split.
+		osystem (str): pass 'Windows' to make the check case insensitive. If None(the default) is
+			passed in it will default to the contents of OS_TYPE.
+
+	Returns:
+		list: The re.match object or None of each path.
+	"""
+	if osystem == None:
+		osystem = OS_TYPE
+	if _infoCacheSize:
+		return [imageSequenceInfo(path, osystem) for path in paths]
+	match = _INFO_REGEXES.get(osystem, _INFO_REGEX).match
+	normpath = os.path.normpath
+	return [match(normpath(path)) for path in paths]
 
 def imageSequenceRepr(files, strFormat='{pre}[{firstNum}:{lastNum}]{post}', forceRepr=False):
 	""" Takes a list of files and creates a string that represents the sequence.
@@ -81,11 +127,11 @@ def imageSequenceRepr(files, strFormat='{pre}[{firstNum}:{lastNum}]{post}', forc
 		str: A string representation of the Image Sequence.
 	"""
 	if len(files) > 1 or (forceRepr and files):
-		match = imageSequenceInfo(files[0])
+		infos = imageSequenceInfos(files)
+		match = infos[0]
 		if match:
 			info = {}
-			for f in files:
-				frame = imageSequenceInfo(f)
+			for frame in infos:
 				if frame and frame.group('frame'):
 					frame = frame.group('frame')
 					info.update({int(frame):frame})
@@ -119,8 +165,7 @@ def imageSequenceForRepr(fileName):
 	if OS_TYPE == 'Windows':
 		flags = re.I
 	fileName = unicode(fileName)
-	filter = re.compile(r'(?P<pre>^.+?)\[(?P<start>\d+)(?P<separator>[^\da-zA-Z]?)(?P<end>\d+)\](?P<post>\.[A-Za-z0-9]+?$)', flags=flags)
-	match = re.match(filter, fileName)
+	match = _REPR_REGEXES.get(OS_TYPE, _REPR_REGEX).match(fileName)
 	if match:
 		import glob
 		start = int(match.group('start'))
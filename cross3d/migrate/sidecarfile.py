@@ -0,0 +1,117 @@
+"""
+This is a pure python replacement for :mod:`cross3d.migrate.dsofile` storing the
+custom properties of a file in a json file next to it, named after the file with
+a .props.json extension. It has the interface of DSOFile so FileProps can use it
+where dsofile.dll is not available, see :attr:`AbstractFileProps.storeClass`.
+
+	from cross3d.abstract.abstractuserprops import AbstractFileProps
+	from cross3d.migrate.sidecarfile import SidecarFile
+	AbstractFileProps.storeClass = SidecarFile
+
+"""
+
+import os
+import json
+
+
+class SidecarCustProperty(object):
+
+	def __init__(self, properties, name):
+		super(SidecarCustProperty, self).__init__()
+		self._properties = properties
+		self._name = name
+
+	def name(self):
+		return self._name
+
+	def setName(self, name):
+		self._properties[name] = self._properties.pop(self._name)
+		self._name = name
+
+	def setValue(self, value):
+		self._properties[self._name] = value
+
+	def type(self):
+		return type(self.value())
+
+	def value(self):
+		return self._properties[self._name]
+
+
+class SidecarFile(object):
+
+	extension = '.props.json'
+
+	def __init__(self):
+		super(SidecarFile, self).__init__()
+		self._fileName = None
+		self._properties = None
+
+	def addCustomProperty(self, key, value):
+		"""Adds a custom property with the given key, value pair.
+		"""
+		self._properties[key] = value
+		return SidecarCustProperty(self._properties, key)
+
+	def clear(self):
+		self._properties.clear()
+
+	def close(self):
+		self._fileName = None
+		self._properties = None
+
+	def customProperties(self):
+		return [SidecarCustProperty(self._properties, name) for name in sorted(self._properties)]
+
+	def customProperty(self, key):
+		"""
+		Finds the key with the provided name and returns a custom Property.
+		If the key is not found it returns None.
+
+		:rtype: :class:`SidecarCustProperty`
+		"""
+		if key in self._properties:
+			return SidecarCustProperty(self._properties, key)
+		return None
+
+	def customPropertyNames(self):
+		return sorted(self._properties)
+
+	def open(self, filename):
+		"""
+		:return: Returns True if the provided file exists.
+		:rtype: bool
+		"""
+		if self._fileName is not None:
+			# The file is already open
+			return True
+		if not os.path.isfile(filename):
+			return False
+		path = self.sidecarPath(filename)
+		if os.path.exists(path):
+			with open(path, 'rb') as f:
+				self._properties = json.load(f)
+		else:
+			self._properties = {}
+		self._fileName = filename
+		return True
+
+	def removeCustomProperty(self, key):
+		if key in self._properties:
+			del self._properties[key]
+			return True
+		return False
+
+	def save(self):
+		path = self.sidecarPath(self._fileName)
+		if self._properties:
+			with open(path, 'wb') as f:
+				json.dump(self._properties, f, indent=4, sort_keys=True)
+		elif os.path.exists(path):
+			os.remove(path)
+
+	@classmethod
+	def sidecarPath(cls, filename):
+		"""Returns the path of the json file storing the properties of the file.
+		"""
+		return filename + cls.extension
@@ -35,7 +35,10 @@ class SoftimageUserProps(AbstractUserProps):
 	
 	def __setitem__(self, key, value):
 		prop = self._nativePointer.Properties(key)
-		if type(value) == tuple:
+		if self.typedValues:
+			# UserDataBlobs store line breaks, the value is not escaped.
+			value = self.encodeValue(value)
+		elif type(value) == tuple:
 			# json.dumps encodes tuple's as lists
 			value = unicode(value)
 		else:
@@ -18,40 +18,148 @@ import re
 import json
 
 class StudiomaxUserProps(AbstractUserProps):
+	"""
+		\remarks	Reads of the user prop buffer are parsed once per buffer string and shared by all the
+					instances, only the values that are read get decoded. Changes made in a batch block are
+					stored with a single setUserPropBuffer call, see AbstractUserProps.batch.
+	"""
+
+	# The parsed buffers keyed by the buffer string they were parsed from, which validates them as any
+	# change to the buffer misses the cache. Each is a list of (line, key) pairs and a dictionary of the
+	# escaped values by key.
+	_bufferCache = {}
+	_bufferCacheSize = 4096
+
 	def __init__(self, nativePointer):
 		super(StudiomaxUserProps, self).__init__(nativePointer)
 		self._nativePointer = nativePointer
+		# The escaped values set in the current batch by key, None for the removed keys.
+		self._pending = {}
+		self._pendingKeys = []
+		self._changedKeys = set()
 	
+	def __contains__(self, key):
+		return key in self._escapedValues()
+
 	def __delitem__(self, key):
 		"""
-			\remarks	There is no build in way to remove keys from userProp's so we create a copy of our userProps dictionary
-						clear userProps on the object, remove the item we want to remove and restore the remaining data to the object.
+			\remarks	There is no build in way to remove keys from userProp's so the buffer is rewritten
+						without the line of the key.
 		"""
-		#key = self.typeCheck(key)
-		data = self.lookupProps()
-		if key in data:
-			self.clear()
-			data.pop(key)
-			self.update(data)
+		if key in self._escapedValues():
+			with self.batch():
+				self._setPending(key, None)
 	
 	def __getitem__(self, key):
-		return self.lookupProps()[key]
+		return self.unescapeValue(self._escapedValues()[key])
 	
 	def __setitem__(self, key, value):
-		if isinstance(value, float):
+		if isinstance(value, float) and not self.typedValues:
 			value = '%f' % value
-		mxs.setUserProp(self._nativePointer, self.escapeKey(key), self.escapeValue(value))
-		self.emitChange(key)
+		if self._batchDepth:
+			self._setPending(key, self.escapeValue(value))
+		else:
+			mxs.setUserProp(self._nativePointer, self.escapeKey(key), self.escapeValue(value))
+			self.emitChange(key)
+
+	def _setPending(self, key, value):
+		if key not in self._pending:
+			self._pendingKeys.append(key)
+		self._pending[key] = value
+		self._changedKeys.add(key)
+
+	def _commitBatch(self):
+		pending, self._pending = self._pending, {}
+		pendingKeys, self._pendingKeys = self._pendingKeys, []
+		changedKeys, self._changedKeys = self._changedKeys, set()
+		if not pending:
+			return
+		# Rewriting the lines of the changed keys in place, keeping the others as they are.
+		lines = []
+		written = set()
+		for line, key in self._parseBuffer(mxs.getUserPropBuffer(self._nativePointer))[0]:
+			if key not in pending:
+				lines.append(line)
+			elif key not in written:
+				written.add(key)
+				if pending[key] is not None:
+					lines.append('%s = %s' % (self.escapeKey(key), pending[key]))
+		for key in pendingKeys:
+			if key not in written and pending[key] is not None:
+				lines.append('%s = %s' % (self.escapeKey(key), pending[key]))
+		mxs.setUserPropBuffer(self._nativePointer, ''.join([line + '\r\n' for line in lines]))
+		if 'Tags' in changedKeys:
+			self.emitChange('Tags')
+		if changedKeys.difference(['Tags']):
+			self.emitChange()
+
+	def _escapedValues(self):
+		"""
+			\remarks	Returns the escaped values by key, including the changes pending in a batch. The
+						dictionary is shared and must not be modified.
+		"""
+		values = self._parseBuffer(mxs.getUserPropBuffer(self._nativePointer))[1]
+		if self._pending:
+			values = dict(values)
+			for key, value in self._pending.iteritems():
+				if value is None:
+					values.pop(key, None)
+				else:
+					values[key] = value
+		return values
+
+	@classmethod
+	def _parseBuffer(cls, string):
+		parsed = cls._bufferCache.get(string)
+		if parsed is not None:
+			return parsed
+		lines = []
+		values = {}
+		for kv in string.split('\r\n'):
+			split = kv.split(' = ', 1)
+			if not len(split) == 2:
+				split = kv.split('=', 1)
+				if not len(split) == 2:
+					split = kv.split(' ', 1)
+					if not len(split) == 2:
+						if kv:
+							lines.append((kv, None))
+						continue
+			key = cls.unescapeKey(split[0])
+			lines.append((kv, key))
+			values[key] = split[1]
+		parsed = (lines, values)
+		if cls._bufferCacheSize:
+			if len(cls._bufferCache) >= cls._bufferCacheSize:
+				cls._bufferCache.popitem()
+			cls._bufferCache[string] = parsed
+		return parsed
 
 	def clear(self):
 		"""
 			\remarks	remove all userProps from the object
 		"""
-		mxs.setUserPropBuffer(self._nativePointer, '')
-	
+		if self._batchDepth:
+			for key in self._escapedValues().keys():
+				self._setPending(key, None)
+		else:
+			mxs.setUserPropBuffer(self._nativePointer, '')
+
+	def get(self, key, default=None):
+		values = self._escapedValues()
+		if key in values:
+			return self.unescapeValue(values[key])
+		return default
+
+	def has_key(self, key):
+		return key in self._escapedValues()
+
+	def keys(self):
+		return self._escapedValues().keys()
+
 	def pop(self, key, default = None):
 		#key = self.typeCheck(key)
-		if not key in self.lookupProps():
+		if not key in self._escapedValues():
 			if default:
 				return default
 			raise KeyError(self.unescapeKey(key))
@@ -68,27 +176,19 @@ class StudiomaxUserProps(AbstractUserProps):
 		return item
 
 	def lookupProps(self):
-		string = mxs.getUserPropBuffer(self._nativePointer)
-		keyValues = string.split('\r\n')
-		props = {}
-		for kv in keyValues:
-			split = kv.split(' = ', 1)
-			if not len(split) == 2:
-				split = kv.split('=', 1)
-				if not len(split) == 2:
-					split = kv.split(' ', 1)
-					if not len(split) == 2:
-						continue
-			props[self.unescapeKey(split[0])] = self.unescapeValue(split[1])
-		return props
+		return dict([(key, self.unescapeValue(value)) for key, value in self._escapedValues().iteritems()])
+
+	def update(self, *args, **kwargs):
+		with self.batch():
+			for k, v in dict(*args, **kwargs).iteritems():
+				self[k] = v
 	
 	@staticmethod
-	def unescapeValue(string):
+	def _decodeLegacyValue(string):
 		"""
 			\remarks	replaces any html codes with their associated unstorable characters
 			\return		<str>
 		"""
-		string = unicode(string)
 		string, typ = AbstractUserProps._decodeString(string)
 		string = string.replace('&#13;&#10;', '\r\n').replace('&#10;', '\n').replace('&#13;', '\r')
 		if typ == float:
@@ -122,6 +222,9 @@ class StudiomaxFileProps(AbstractFileProps):
 		self.customName = mxs.pyhelper.namify('custom')
 		super(StudiomaxFileProps, self).__init__(None)
 	
+	def __contains__(self, key):
+		return key in self.lookupProps()
+	
 	def __delitem__(self, key):
 		index = mxs.fileProperties.findProperty(self.customName, key)
 		if index:
@@ -170,12 +273,28 @@ class StudiomaxFileProps(AbstractFileProps):
 		for i in range(1, mxs.fileProperties.getNumProperties(self.customName)):
 			mxs.fileProperties.deleteProperty(self.customName, i)
 	
+	def get(self, key, default=None):
+		return self.lookupProps().get(key, default)
+	
+	def has_key(self, key):
+		return key in self.lookupProps()
+	
+	def keys(self):
+		return self.lookupProps().keys()
+	
 	def lookupProps(self):
 		out = {}
 		for i in range(1, mxs.fileProperties.getNumProperties(self.customName) + 1):
 			out.update({mxs.fileProperties.getPropertyName(self.customName, i): self.__getValueForIndex__(i)})
 		return out
 	
+	def pop(self, key, default=None):
+		values = self.lookupProps()
+		if key not in values:
+			return default
+		del self[key]
+		return values[key]
+	
 	def update(self, *args, **kwargs):
 		"""
 		Adds all provided items and imedeately saves the changes. There is no QTimer delay.
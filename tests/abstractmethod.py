@@ -0,0 +1,88 @@
+import pytest
+
+import cross3d
+
+
+@cross3d.abstractmethod
+def moduleFunction(value):
+	return value
+
+
+class AbstractThing(object):
+
+	@cross3d.abstractmethod
+	def method(self):
+		return 'abstract'
+
+	@classmethod
+	@cross3d.abstractmethod
+	def create(cls):
+		return cls()
+
+
+# Named like the classes of a software specific module, which is what the calls are counted by.
+StudiomaxThing = type('StudiomaxThing', (AbstractThing,), {'__module__': 'cross3d.studiomax.studiomaxthing'})
+
+originalFunction = moduleFunction
+originalMethod = vars(AbstractThing)['method']
+
+
+@pytest.fixture
+def mode():
+	previous = cross3d.abstractMethodMode()
+	yield
+	cross3d.setAbstractMethodMode(previous)
+	cross3d.clearAbstractMethodCalls()
+
+
+def test_modes(mode):
+	cross3d.setAbstractMethodMode('raise')
+	assert cross3d.abstractMethodMode() == 'raise'
+	with pytest.raises(NotImplementedError):
+		moduleFunction(1)
+	with pytest.raises(NotImplementedError):
+		StudiomaxThing().method()
+	with pytest.raises(NotImplementedError):
+		StudiomaxThing.create()
+
+	cross3d.setAbstractMethodMode('warn')
+	assert moduleFunction(1) == 1 and StudiomaxThing().method() == 'abstract'
+
+	# Without a mode the functions are put back as they are, calling them costs nothing.
+	cross3d.setAbstractMethodMode(None)
+	assert cross3d.abstractMethodMode() is None
+	assert moduleFunction is originalFunction and vars(AbstractThing)['method'] is originalMethod
+	assert isinstance(StudiomaxThing.create(), StudiomaxThing)
+
+	cross3d.setAbstractMethodMode('raise')
+	with pytest.raises(NotImplementedError):
+		moduleFunction(1)
+	cross3d.setAbstractMethodMode()
+	assert moduleFunction(2) == 2
+
+
+def test_counting(mode):
+	cross3d.clearAbstractMethodCalls()
+	moduleFunction(1)
+	assert cross3d.abstractMethodCalls() == {}
+
+	cross3d.setAbstractMethodMode(counting=True)
+	for index in range(3):
+		StudiomaxThing().method()
+	AbstractThing().method()
+	StudiomaxThing.create()
+	# Module functions count as abstract whatever their arguments.
+	moduleFunction('text')
+	moduleFunction(StudiomaxThing())
+	assert cross3d.abstractMethodCalls() == {
+		('studiomax', __name__ + '.method'): 3,
+		(__name__, __name__ + '.method'): 1,
+		('studiomax', __name__ + '.create'): 1,
+		('abstract', __name__ + '.moduleFunction'): 2,
+	}
+	cross3d.clearAbstractMethodCalls()
+	assert cross3d.abstractMethodCalls() == {}
+
+	cross3d.setAbstractMethodMode()
+	moduleFunction(1)
+	assert cross3d.abstractMethodCalls() == {}
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip('PyQt4')
+import cross3d
+
+
+@pytest.fixture
+def dispatch():
+	dispatch = cross3d.dispatch
+	received = {'objectFreeze': [], 'customPropChanged': [], 'objectRenamed': [], 'eventsCoalesced': []}
+	connections = []
+	for name in received:
+		slot = (lambda name: lambda *args: received[name].append(args))(name)
+		getattr(dispatch, name).connect(slot)
+		connections.append((name, slot))
+	dispatch.resetCoalesceStats()
+	dispatch.received = received
+	yield dispatch
+	for name, slot in connections:
+		getattr(dispatch, name).disconnect(slot)
+	dispatch.flushEvents()
+	del dispatch.received
+
+
+def test_uncoalesced(dispatch):
+	for index in range(3):
+		dispatch.dispatch('objectFreeze', 'node')
+	assert len(dispatch.received['objectFreeze']) == 3
+	assert not dispatch.received['eventsCoalesced']
+	assert dispatch.coalesceStats() == {}
+
+
+def test_batch(dispatch):
+	with dispatch.batch():
+		for index in range(100):
+			dispatch.dispatchObject('customPropChanged', 'node%i' % (index % 10))
+			dispatch.dispatch('objectFreeze', 'node')
+		dispatch.dispatchRename('objectRenamed', 'Box01', 'Crate01', 'node1')
+		with dispatch.batch():
+			dispatch.dispatchRename('objectRenamed', ('Crate01', 'Crate02', 'node1'))
+		assert not dispatch.received['customPropChanged']
+	received = dispatch.received
+	assert len(received['customPropChanged']) == 10
+	assert len(received['objectFreeze']) == 1
+	assert [args[:2] for args in received['objectRenamed']] == [('Box01', 'Crate02')]
+	coalesced = dict([(unicode(signal), events) for signal, events in received['eventsCoalesced']])
+	assert [unicode(signal) for signal, events in received['eventsCoalesced']] == ['customPropChanged', 'objectFreeze', 'objectRenamed']
+	assert len(coalesced['customPropChanged']) == 10
+	assert coalesced['objectFreeze'] == [('node',)]
+	assert dispatch.coalesceStats() == {'customPropChanged': (100, 90), 'objectFreeze': (100, 99), 'objectRenamed': (2, 1)}
+
+
+def test_window(dispatch):
+	dispatch.setCoalesceWindow('objectFreeze', 50)
+	try:
+		assert dispatch.coalesceWindow('objectFreeze') == 50
+		for index in range(5):
+			dispatch.dispatch('objectFreeze', 'node%i' % (index % 2))
+		dispatch.dispatch('customPropChanged', 'node')
+		assert not dispatch.received['objectFreeze']
+		assert len(dispatch.received['customPropChanged']) == 1
+	finally:
+		# Stopping coalescing delivers the pending events without waiting for the event loop.
+		dispatch.setCoalesceWindow('objectFreeze', None)
+	assert dispatch.received['objectFreeze'] == [('node0',), ('node1',)]
+	assert dispatch.coalesceStats() == {'objectFreeze': (5, 3)}
+
+
+def test_staleWindow(dispatch, monkeypatch):
+	from cross3d.classes import dispatch as module
+	timers = []
+	monkeypatch.setattr(module.QTimer, 'singleShot', staticmethod(lambda msec, callback: timers.append(callback)))
+	dispatch.setCoalesceWindow('objectFreeze', 50)
+	try:
+		dispatch.dispatch('objectFreeze', 'node0')
+		dispatch.flushEvents()
+		assert dispatch.received['objectFreeze'] == [('node0',)]
+		dispatch.dispatch('objectFreeze', 'node1')
+		assert len(timers) == 2
+		# The timer of the events flushed already does not cut the window of the next ones short.
+		timers[0]()
+		assert dispatch.received['objectFreeze'] == [('node0',)]
+		timers[1]()
+		assert dispatch.received['objectFreeze'] == [('node0',), ('node1',)]
+		timers[1]()
+		assert len(dispatch.received['objectFreeze']) == 2
+	finally:
+		dispatch.setCoalesceWindow('objectFreeze', None)
@@ -0,0 +1,87 @@
+import time
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip('PyQt4')
+from cross3d.classes.dispatchprocess import DispatchProcess
+
+
+class StandInDispatch(object):
+	""" Records the events dispatched to it, like cross3d.dispatch would emit them. """
+
+	def __init__(self):
+		self.events = []
+		self.batches = 0
+
+	@contextmanager
+	def batch(self):
+		self.batches += 1
+		yield
+
+	def dispatchObject(self, signal, *args):
+		self.events.append((signal,) + args)
+
+
+def deliverAll(process, count, timeout=5):
+	delivered = 0
+	end = time.time() + timeout
+	while delivered < count and time.time() < end:
+		delivered += process.deliverEvents()
+		time.sleep(0.001)
+	return delivered
+
+
+def test_pipeline():
+	dispatch = StandInDispatch()
+	process = DispatchProcess(dispatch=dispatch, batchSize=100)
+	process.start()
+	try:
+		for index in range(1000):
+			process.processEvent('customPropChanged', index)
+		process.processEvent(['objectRenamed', 'Box01', 'Crate01', 'node'])
+		assert deliverAll(process, 1001) == 1001
+	finally:
+		process.stop()
+		process.wait()
+	assert dispatch.events[:3] == [('customPropChanged', 0), ('customPropChanged', 1), ('customPropChanged', 2)]
+	assert dispatch.events[-1] == ('objectRenamed', 'Box01', 'Crate01', 'node')
+	# Batches of at most 100 events, each delivery coalescing all the batches ready.
+	assert 1 <= dispatch.batches <= 11
+	stats = process.stats()
+	assert stats['depth'] == 0
+	assert stats['signals']['customPropChanged']['delivered'] == 1000
+	assert 0 <= stats['signals']['customPropChanged']['meanLatency'] <= stats['signals']['customPropChanged']['maxLatency']
+
+
+@pytest.mark.parametrize('overflow, kept', [
+	(DispatchProcess.OverflowDropOldest, [2, 3, 4]),
+	(DispatchProcess.OverflowDropNewest, [0, 1, 2]),
+])
+def test_overflow(overflow, kept):
+	dispatch = StandInDispatch()
+	process = DispatchProcess(dispatch=dispatch, maxDepth=3, overflow=overflow)
+	results = [process.processEvent('valueChanged', index) for index in range(5)]
+	assert results.count(False) == (2 if overflow == DispatchProcess.OverflowDropNewest else 0)
+	stats = process.stats()
+	assert stats['depth'] == 3 and stats['maxDepth'] == 3
+	assert stats['signals']['valueChanged']['dropped'] == 2
+	process.start()
+	process.stop()
+	process.wait()
+	assert deliverAll(process, 3) == 3
+	assert [args[1] for args in dispatch.events] == kept
+
+
+def test_invalidOverflow():
+	created = []
+
+	class Process(DispatchProcess):
+		def __init__(self, *args, **kwargs):
+			created.append(self)
+			DispatchProcess.__init__(self, *args, **kwargs)
+
+	with pytest.raises(ValueError):
+		Process(dispatch=StandInDispatch(), overflow='explode')
+	# The half built process is collected without errors.
+	created[0].__del__()
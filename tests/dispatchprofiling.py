@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+pytest.importorskip('PyQt4')
+import cross3d
+
+
+class Listener(object):
+	def __init__(self):
+		self.objects = []
+
+	def slowSelection(self):
+		time.sleep(0.01)
+
+	def frozen(self, obj):
+		self.objects.append(obj)
+
+
+def failing(obj):
+	raise RuntimeError('badly written listener')
+
+
+@pytest.fixture
+def dispatch():
+	dispatch = cross3d.dispatch
+	listener = Listener()
+	connections = [('selectionChanged', listener.slowSelection), ('objectFreeze', listener.frozen)]
+	for signal, function in connections:
+		dispatch.connect(signal, function)
+	dispatch.resetStats()
+	dispatch.listener = listener
+	yield dispatch
+	dispatch.setProfiling(False)
+	for signal, function in connections:
+		dispatch.disconnect(signal, function)
+	del dispatch.listener
+
+
+def test_disabled(dispatch):
+	dispatch.dispatch('selectionChanged')
+	assert not dispatch.isProfiling()
+	assert dispatch.stats() == []
+
+
+def test_profiling(dispatch):
+	dispatch.setProfiling(True)
+	for index in range(3):
+		dispatch.dispatch('selectionChanged')
+	dispatch.dispatch('objectFreeze', 'node')
+	dispatch.connect('objectFreeze', failing)
+	try:
+		# Qt hands the exceptions of slots to sys.excepthook, the slot emit calls is called directly.
+		slot = dispatch._profiledSlots[('objectFreeze', failing)][-1]
+		with pytest.raises(RuntimeError):
+			slot('node')
+	finally:
+		dispatch.disconnect('objectFreeze', failing)
+	stats = dispatch.stats(reset=True)
+	assert stats[0]['handler'] == 'dispatchprofiling.Listener.slowSelection'
+	assert stats[0]['signal'] == 'selectionChanged'
+	assert stats[0]['calls'] == 3
+	assert stats[0]['totalTime'] >= 0.03 and stats[0]['maxTime'] >= 0.01
+	byHandler = dict([(entry['function'], entry) for entry in stats])
+	assert byHandler[failing]['exceptions'] == 1
+	assert byHandler[dispatch.listener.frozen]['calls'] >= 1
+	assert dispatch.listener.objects[0] == 'node'
+	assert dispatch.stats() == []
+
+	# The functions are connected directly again once profiling is disabled.
+	dispatch.setProfiling(False)
+	dispatch.dispatch('objectFreeze', 'other')
+	assert dispatch.listener.objects[-1] == 'other'
+	assert dispatch.stats() == []
@@ -0,0 +1,88 @@
+import pytest
+
+from cross3d.enum import Enum, EnumGroup, enum
+
+
+class Suit(Enum):
+	pass
+
+
+def suits():
+	class Suits(EnumGroup):
+		Hearts = Suit()
+		Spades = Suit()
+		Clubs = Suit(label='Black Clubs')
+		Diamonds = Suit(16)
+	return Suits
+
+
+def test_lookups():
+	Suits = suits()
+	assert [int(e) for e in Suits] == [1, 2, 4, 16]
+	assert Suits.fromLabel('Black Clubs') is Suits.Clubs
+	assert Suits.fromLabel('black clubs', caseSensitive=False) is Suits.Clubs
+	assert Suits.fromLabel('black clubs', default=Suits.Nothing) is Suits.Nothing
+	with pytest.raises(ValueError):
+		Suits.fromLabel('black clubs')
+	assert Suits.fromValue(16) is Suits.Diamonds
+	with pytest.raises(ValueError):
+		Suits.fromValue(8)
+
+	Suits.append(Suit(None, 'Stars'), Moons=Suit(32))
+	assert Suits.fromLabel('Stars') is Suits.Stars and Suits.fromValue(32) is Suits.Moons
+	assert int(Suits.Stars) == 8
+
+
+def test_composites():
+	Suits = suits()
+	composite = Suits(5)
+	assert int(composite) == 5 and composite & Suits.Hearts and not composite & Suits.Spades
+	assert isinstance(composite, Suit)
+	assert Suits(5) is composite and Suits(Suits.Hearts | Suits.Clubs) is composite
+	assert Suits(2) is Suits.Spades
+
+	# Numbers that are not combinations of the enumerators are resolved but not cached.
+	cached = len(Suits._COMPOSITES)
+	for number in xrange(1, 200):
+		assert int(Suits(number << 5 | 3)) == 3
+	assert Suits(8) is None and Suits(0) is None
+	assert len(Suits._COMPOSITES) == cached
+
+	Suits.append(Stars=Suit(8))
+	assert Suits(8) is Suits.Stars
+
+
+def test_legacyEnum():
+	Suits = suits()
+	assert Suits.legacyHits() == {}
+	assert Suits.labelByValue(4) == 'Clubs'
+	assert Suits.keyByValue(16) == 'Diamonds'
+	assert Suits.labelByValue(2) == 'Spades'
+	assert not hasattr(Suits, 'Jokers')
+	assert Suits.legacyHits() == {'labelByValue': 2, 'keyByValue': 1, 'Jokers': 1}
+	legacy = Suits._LEGACYENUM
+	assert Suits.value('Hearts') == 1 and Suits._LEGACYENUM is legacy
+
+	# Appending enumerators rebuilds the legacy enum.
+	Suits.append(Stars=Suit())
+	assert Suits.keyByValue(8) == 'Stars' and Suits._LEGACYENUM is not legacy
+	assert Suits.legacyHits()['keyByValue'] == 2
+	assert suits().legacyHits() == {}
+
+
+def test_enum():
+	Colors = enum('Red', 'Green', 'Blue', White=7, Crimson=1)
+	assert (Colors.Red, Colors.Green, Colors.Blue, Colors.All) == (1, 2, 4, 7)
+	# Shared values resolve to the first key.
+	assert Colors.keyByValue(1) == 'Red' and Colors.labelByValue(7) == 'White'
+	assert Colors.indexByValue(4) == 2 and Colors.indexByValue(8) == -1
+	assert Colors.value('green', caseSensitive=False) == 2 and Colors.value('green') == 0
+	assert Colors.valueByLabel('BLUE', caseSensitive=False) == 4
+	assert sorted(Colors.labels()) == ['Blue', 'Crimson', 'Green', 'Red', 'White']
+
+	# Reassigning a key rebuilds the lookups.
+	Colors.Blue = 8
+	assert Colors.keyByValue(8) == 'Blue' and Colors.keyByValue(4) == ''
+	Colors.Grey = [1, 2]
+	Colors._keys.append('Grey')
+	assert Colors.keyByValue([1, 2]) == 'Grey'
@@ -0,0 +1,165 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+from cross3d.classes.fcurve import FCurve, KeyStore
+from cross3d.constants import ExtrapolationType, TangentType
+
+EXTRAPOLATIONS = [ExtrapolationType.Constant, ExtrapolationType.Linear, ExtrapolationType.Cycled,
+	ExtrapolationType.CycledWithOffset, ExtrapolationType.PingPong]
+
+def buildCurve(columnar=False, extrapolation=ExtrapolationType.Constant, tangentLength=0.0):
+	curve = FCurve(name='translateX', columnar=columnar, inExtrapolation=extrapolation, outExtrapolation=extrapolation)
+	keys = [(0.0, 0.0, 0.3), (10.0, 5.0, -0.2), (15.0, 2.5, 0.0), (30.0, 12.0, 0.5), (31.0, 11.0, -0.4)]
+	# Added out of order, the key index sorts them.
+	for index in (3, 0, 4, 2, 1):
+		time, value, angle = keys[index]
+		curve.addKey(time=time, value=value, inTangentAngle=-angle, outTangentAngle=angle,
+			inTangentLength=tangentLength or 0.25, outTangentLength=tangentLength or 0.25,
+			inTangentType=TangentType.Bezier, outTangentType=TangentType.Bezier)
+	return curve
+
+def scalarValues(curve, times):
+	values = []
+	for time in times:
+		try:
+			values.append(curve.valueAtTime(time))
+		except (ValueError, ZeroDivisionError):
+			values.append(float('nan'))
+	return np.array(values)
+
+@pytest.mark.parametrize('extrapolation', EXTRAPOLATIONS)
+@pytest.mark.parametrize('columnar', [False, True])
+def test_valuesAtTimes(extrapolation, columnar):
+	curve = buildCurve(columnar, extrapolation)
+	times = np.concatenate((np.linspace(-75, 110, 1001), [0.0, 10.0, 15.0, 30.0, 31.0, float('nan')]))
+	values = curve.valuesAtTimes(times)
+	assert values.shape == times.shape
+	# The tolerance valuesAtTimes documents.
+	np.testing.assert_allclose(values, scalarValues(curve, times), rtol=1e-9, atol=1e-12)
+	assert math.isnan(values[-1])
+	assert curve.valueAtTime(10.0) == 5.0
+	assert curve.valuesAtTimes(np.array([[10.0, 30.0]])).shape == (1, 2)
+
+def test_linearTangentExtrapolation():
+	curve = buildCurve(extrapolation=ExtrapolationType.Linear, tangentLength=1.0)
+	times = np.array([-20.0, -0.5, 31.5, 60.0])
+	np.testing.assert_allclose(curve.valuesAtTimes(times), scalarValues(curve, times), rtol=1e-9)
+
+def test_singleKeyCycle():
+	curve = FCurve(inExtrapolation=ExtrapolationType.Cycled, outExtrapolation=ExtrapolationType.Cycled)
+	curve.addKey(time=5.0, value=2.0)
+	with pytest.raises(ZeroDivisionError):
+		curve.valueAtTime(10.0)
+	values = curve.valuesAtTimes([0.0, 5.0, 10.0])
+	assert math.isnan(values[0]) and values[1] == 2.0 and math.isnan(values[2])
+
+def test_segmentCache():
+	curve = buildCurve()
+	first = curve.valueAtTime(12.0)
+	assert curve._segments
+	[key for key in curve.keys() if key.time == 15.0][0].value = 100.0
+	# In place edits are only seen once invalidated.
+	curve.invalidate()
+	assert curve.valueAtTime(12.0) != first
+	curve.offset(5.0)
+	assert curve.valueAtTime(17.0) == pytest.approx(scalarValues(curve, [17.0])[0])
+	assert curve.valueAtTime(5.0) == 0.0
+
+@pytest.mark.parametrize('operation', [
+	lambda curve: curve.offset(2.5),
+	lambda curve: curve.offset(0.3, attr='value', rnd=True),
+	lambda curve: curve.scale(1.5, pivot=10.0),
+	lambda curve: curve.scale(0.5, attr='value', rnd=True),
+	lambda curve: curve.remap((100, 200)),
+	lambda curve: curve.invert(2.0),
+])
+def test_columnarMatchesList(operation):
+	listCurve = buildCurve()
+	columnarCurve = buildCurve(columnar=True)
+	assert isinstance(columnarCurve.keys(), KeyStore)
+	operation(listCurve)
+	operation(columnarCurve)
+	for listKey, columnarKey in zip(listCurve.keys(), columnarCurve.keys()):
+		for name in KeyStore.columnNames():
+			assert getattr(listKey, name) == pytest.approx(getattr(columnarKey, name), rel=1e-12), name
+	assert listCurve.range() == columnarCurve.range()
+	times = np.linspace(-10, 250, 200)
+	np.testing.assert_allclose(listCurve.valuesAtTimes(times), columnarCurve.valuesAtTimes(times), rtol=1e-12)
+
+def test_setColumnar():
+	curve = buildCurve()
+	xml = curve.toXML()
+	curve.setColumnar()
+	assert curve.isColumnar() and curve.toXML() == xml
+	curve.keys()[0].value = 3.0
+	assert curve.keys()[0].value == 3.0
+	curve.setColumnar(False)
+	assert not curve.isColumnar() and curve.keys()[0].value == 3.0
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_binaryRoundTrip(columnar):
+	curve = buildCurve(columnar, ExtrapolationType.PingPong)
+	curve.setName(u'curve \xe9')
+	data = curve.toBinary()
+	assert data[:4] == 'FCRV' and len(data) % 8 == 0
+	# Both storages write the same data.
+	other = buildCurve(not columnar, ExtrapolationType.PingPong)
+	other.setName(u'curve \xe9')
+	assert other.toBinary() == data
+	for loadColumnar in (False, True):
+		loaded = FCurve(columnar=loadColumnar)
+		loaded.fromBinary(data)
+		assert loaded.toBinary() == data
+		assert loaded.name() == u'curve \xe9' and loaded.extrapolation() == curve.extrapolation()
+	with pytest.raises(ValueError):
+		FCurve().fromBinary('XXXX' + data[4:])
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_memoryMappedFile(tmpdir, columnar):
+	curve = buildCurve(columnar=True)
+	path = str(tmpdir.join('curves', 'translateX.fcrv'))
+	curve.write(path, binary=True)
+	with open(path, 'rb') as fle:
+		data = fle.read()
+	loaded = FCurve(columnar=columnar)
+	assert loaded.read(path)
+	assert loaded.toBinary() == data
+	# Copy on write, editing the keys leaves the file untouched.
+	loaded.keys()[0].value = 42.0
+	loaded.offset(10.0)
+	assert loaded.keys()[0].value == 42.0
+	with open(path, 'rb') as fle:
+		assert fle.read() == data
+	xmlPath = str(tmpdir.join('curves', 'translateX.xml'))
+	curve.write(xmlPath)
+	fromXML = FCurve()
+	assert fromXML.read(xmlPath)
+	assert fromXML.toXML() == curve.toXML()
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_equality(columnar):
+	curve = buildCurve(columnar)
+	curve.keys()[0].value = 1.0 / 3.0
+	curve.invalidate()
+	# toXML keeps 12 significant digits, the curve read back still equals its source.
+	loaded = FCurve()
+	loaded.fromXML(curve.toXML())
+	assert loaded.keys()[0].value != curve.keys()[0].value
+	assert loaded == curve and hash(loaded) == hash(curve)
+	assert loaded.digest() == curve.digest()
+	assert buildCurve(not columnar) == buildCurve(columnar)
+
+	# The digest is cached, editing a key in place is seen once invalidated.
+	before = hash(curve)
+	curve.keys()[1].value += 1
+	curve.invalidate()
+	assert curve != loaded and hash(curve) != before
+	# Methods changing the keys drop the cached digest.
+	digest = curve.digest()
+	curve.offset(0.5)
+	assert curve.digest() != digest
+	other = buildCurve(columnar)
+	other.setName('translateY')
+	assert other != buildCurve(columnar)
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+pytest.importorskip('PyQt4')
+from cross3d.abstract.abstractuserprops import AbstractFileProps
+from cross3d.migrate.sidecarfile import SidecarFile
+
+
+class CountingSidecarFile(SidecarFile):
+	opened = 0
+	saved = 0
+
+	def open(self, filename):
+		if self._fileName is None:
+			CountingSidecarFile.opened += 1
+		return super(CountingSidecarFile, self).open(filename)
+
+	def save(self):
+		CountingSidecarFile.saved += 1
+		super(CountingSidecarFile, self).save()
+
+
+class SidecarFileProps(AbstractFileProps):
+	storeClass = CountingSidecarFile
+
+	def emitChange(self, key=None):
+		self.changes = getattr(self, 'changes', 0) + 1
+
+
+@pytest.fixture
+def shot(tmpdir):
+	CountingSidecarFile.opened = CountingSidecarFile.saved = 0
+	paths = []
+	for index in range(5):
+		path = tmpdir.join('shot%i.max' % index)
+		path.write('')
+		paths.append(str(path))
+	return paths
+
+
+def test_access(shot):
+	props = SidecarFileProps(shot[0])
+	props['Version'] = 3
+	props.update(Status='wip', Artist='someone')
+	assert props['Version'] == 3 and props.get('Status') == 'wip'
+	assert sorted(props.keys()) == ['Artist', 'Status', 'Version']
+	del props['Artist']
+	assert 'Artist' not in SidecarFileProps(shot[0])
+	with pytest.raises(KeyError):
+		props['Artist']
+	props.clear()
+	assert SidecarFileProps(shot[0]).lookupProps() == {}
+	assert not os.path.exists(SidecarFile.sidecarPath(shot[0]))
+
+
+def test_session(shot):
+	SidecarFileProps(shot[0]).update(Version=1, Status='wip')
+	CountingSidecarFile.opened = CountingSidecarFile.saved = 0
+	props = SidecarFileProps(shot[0])
+	with props.session():
+		for index in range(10):
+			props['Version'] = props['Version'] + 1
+		del props['Status']
+		props['Frames'] = [1, 100]
+		assert 'Status' not in props
+		with props.session():
+			props['Approved'] = True
+		# Nothing is stored until the outermost session exits.
+		assert 'Frames' not in SidecarFileProps(shot[0]).keys()
+	assert SidecarFileProps(shot[0]).lookupProps() == {'Version': 11, 'Frames': [1, 100], 'Approved': True}
+	# One open for the session and one for each of the two checks above.
+	assert CountingSidecarFile.opened == 3
+	assert CountingSidecarFile.saved == 1
+	assert props.changes == 1
+
+
+def test_pool(shot):
+	for path in shot:
+		SidecarFileProps(path)['Version'] = 1
+	CountingSidecarFile.opened = 0
+	with AbstractFileProps.pool(3):
+		for repeat in range(4):
+			for path in shot[:3]:
+				assert SidecarFileProps(path)['Version'] == 1
+		assert CountingSidecarFile.opened == 3
+		# Writes are saved immediately and seen by the next reads.
+		SidecarFileProps(shot[0])['Version'] = 2
+		assert SidecarFileProps(shot[0])['Version'] == 2
+		# Going past the size closes the least recently used files.
+		for path in shot:
+			SidecarFileProps(path).get('Version')
+		assert len(AbstractFileProps._pool) == 3
+	assert AbstractFileProps._pool is None
+	assert SidecarFileProps(shot[0])['Version'] == 2
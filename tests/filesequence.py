@@ -0,0 +1,282 @@
+import os
+import math
+import sys
+import time
+import errno
+import threading
+
+import pytest
+
+from cross3d.classes import filesequence
+from cross3d.classes.fcurve import FCurve
+from cross3d.classes.filesequence import FileSequence
+from cross3d.classes.fileoperations import FileOperations
+from cross3d.classes.exceptions import Exceptions
+from cross3d.constants import ExtrapolationType, TangentType
+
+
+def writeFrames(directory, name, frames):
+	for frame in frames:
+		directory.join(name % frame).write(str(frame))
+
+
+@pytest.fixture
+def listings(monkeypatch):
+	calls = []
+	listdir = os.listdir
+	monkeypatch.setattr(os, 'listdir', lambda path: calls.append(path) or listdir(path))
+	yield calls
+	FileSequence.setListingCacheTimeout(0)
+
+
+def test_existingFrames(tmpdir, listings):
+	writeFrames(tmpdir, 'plate.%04d.exr', [1, 2, 4, 12])
+	# Frames using another padding or extension are not part of the sequence.
+	writeFrames(tmpdir, 'plate.%d.exr', [3, 10])
+	tmpdir.join('plate.0005.jpg').write('')
+	sequence = FileSequence(str(tmpdir.join('plate.0001-0010.exr')))
+	assert sequence.existingFrames() == set([1, 2, 4, 12])
+	assert sequence.frames() == [1, 2, 4]
+	assert sequence.missingFrames() == [3, 5, 6, 7, 8, 9, 10]
+	assert [os.path.basename(path) for path in sequence.existingPaths()] == ['plate.0001.exr', 'plate.0002.exr', 'plate.0004.exr']
+	assert sequence.exists() and not sequence.isComplete()
+	# Without a timeout every check lists the directory.
+	assert len(listings) == 6
+
+
+def test_listingCache(tmpdir, listings, monkeypatch):
+	writeFrames(tmpdir, 'plate.%04d.exr', [1, 2])
+	sequence = FileSequence(str(tmpdir.join('plate.0001-0003.exr')))
+	FileSequence.setListingCacheTimeout(10)
+	now = [time.time()]
+	monkeypatch.setattr(filesequence.time, 'time', lambda: now[0])
+	for index in range(5):
+		assert sequence.frames() == [1, 2]
+	assert not sequence.isComplete()
+	assert len(listings) == 1
+
+	# A change of the directory modification time lists it again.
+	writeFrames(tmpdir, 'plate.%04d.exr', [3])
+	os.utime(str(tmpdir), (now[0] + 1, now[0] + 1))
+	assert sequence.isComplete()
+	assert len(listings) == 2
+
+	# So does the timeout, changes within the resolution of the modification time are not missed.
+	os.remove(str(tmpdir.join('plate.0003.exr')))
+	os.utime(str(tmpdir), (now[0] + 1, now[0] + 1))
+	assert sequence.isComplete()
+	now[0] += 11
+	assert not sequence.isComplete()
+	assert len(listings) == 3
+
+	FileSequence.clearListingCache()
+	assert sequence.frames() == [1, 2]
+	assert len(listings) == 4
+
+
+def test_fileOperations(tmpdir):
+	sources = []
+	for index in range(20):
+		path = tmpdir.join('source%02d.txt' % index)
+		path.write(str(index))
+		sources.append(str(path))
+	active = [0, 0]
+	lock = threading.Lock()
+	progress = []
+
+	def copy(source, destination):
+		with lock:
+			active[0] += 1
+			active[1] = max(active)
+		time.sleep(0.005)
+		FileOperations()._copy(source, destination)
+		with lock:
+			active[0] -= 1
+
+	operations = FileOperations(workers=4, progress=lambda done, total: progress.append((threading.current_thread(), done, total)))
+	destinations = [path.replace('source', 'copy') for path in sources]
+	operations.run(copy, zip(sources, destinations))
+	assert 1 < active[1] <= 4
+	# Progress is reported on the calling thread.
+	assert progress == [(threading.current_thread(), done, 20) for done in range(1, 21)]
+	assert [open(path).read() for path in destinations] == [str(index) for index in range(20)]
+
+	moved = [path.replace('source', 'moved') for path in sources[:5]]
+	FileOperations(workers=2).move(zip(sources[:5], moved))
+	assert all(os.path.exists(path) for path in moved) and not any(os.path.exists(path) for path in sources[:5])
+	FileOperations(workers=2).delete(moved + [str(tmpdir.join('missing.txt'))])
+	assert not any(os.path.exists(path) for path in moved)
+
+	if hasattr(os, 'symlink'):
+		links = [path.replace('source', 'link') for path in sources[5:8]]
+		FileOperations().link(zip(sources[5:8], links))
+		assert [os.readlink(path) for path in links] == sources[5:8]
+
+
+def test_fileOperationFailed(tmpdir):
+	sources = [str(tmpdir.join('source%i.txt' % index)) for index in range(6)]
+	for path in sources[::2]:
+		open(path, 'w').write('frame')
+	destinations = [path.replace('source', 'copy') for path in sources]
+	progress = []
+	with pytest.raises(Exceptions.FileOperationFailed) as info:
+		FileOperations(workers=3, progress=lambda done, total: progress.append(done)).copy(zip(sources, destinations))
+	# Every frame is attempted and the failed ones are reported.
+	assert progress == range(1, 7)
+	assert sorted(item for item, error in info.value.errors) == zip(sources[1::2], destinations[1::2])
+	assert all(isinstance(error, IOError) for item, error in info.value.errors)
+	assert [os.path.exists(path) for path in destinations] == [True, False] * 3
+
+
+@pytest.mark.parametrize('interruption', [KeyboardInterrupt, SystemExit])
+def test_fileOperationInterrupted(interruption):
+	processed = []
+	def interrupted(index):
+		processed.append(index)
+		if index == 2:
+			raise interruption()
+	# The remaining items are still processed and the interruption is raised rather than waited on.
+	with pytest.raises(interruption):
+		FileOperations(workers=2).run(interrupted, [(index,) for index in range(5)])
+	assert sorted(processed) == range(5)
+
+
+def test_hardLinkFallback(tmpdir, monkeypatch):
+	sources = []
+	for index in range(4):
+		path = tmpdir.join('source%i.txt' % index)
+		path.write(str(index))
+		path.setmtime(1000000000)
+		sources.append(str(path))
+	destinations = [path.replace('source', 'copy') for path in sources]
+	# Existing destinations are replaced rather than written through.
+	open(destinations[0], 'w').write('old')
+
+	if hasattr(os, 'link'):
+		FileOperations().copy(zip(sources, destinations), hardLink=True)
+		assert all(os.path.samefile(source, destination) for source, destination in zip(sources, destinations))
+		FileOperations().delete(destinations)
+
+	attempts = []
+	def unsupported(*args):
+		attempts.append(args)
+		raise OSError(errno.EXDEV, 'Invalid cross-device link')
+	monkeypatch.setattr(FileOperations, '_createHardLink', staticmethod(unsupported))
+	monkeypatch.setattr(FileOperations, '_clone', staticmethod(unsupported))
+	operations = FileOperations(workers=1)
+	operations.copy(zip(sources, destinations), hardLink=True, metadata=True)
+	# The filesystem is only asked once per kind of link.
+	assert len(attempts) == 2
+	assert [open(path).read() for path in destinations] == ['0', '1', '2', '3']
+	assert not any(os.path.samefile(source, destination) for source, destination in zip(sources, destinations))
+	assert os.stat(destinations[1]).st_mtime == 1000000000
+
+	def denied(*args):
+		raise OSError(errno.EACCES, 'Permission denied')
+	monkeypatch.setattr(FileOperations, '_createHardLink', staticmethod(denied))
+	with pytest.raises(Exceptions.FileOperationFailed):
+		FileOperations().copy(zip(sources, destinations), hardLink=True)
+
+
+def test_paddedDelete(tmpdir):
+	writeFrames(tmpdir, 'plate.%04d.exr', [1, 2, 3, 5])
+	tmpdir.join('plate.0004.exr.bak').write('')
+	sequence = FileSequence(str(tmpdir.join('plate.0001-0005.exr')))
+	assert sequence.framePath(2) == str(tmpdir.join('plate.0002.exr'))
+	sequence.delete()
+	assert sorted(os.listdir(str(tmpdir))) == ['plate.0004.exr.bak']
+	assert not sequence.exists()
+
+
+def test_copyFrameCount(tmpdir):
+	writeFrames(tmpdir, 'plate.%04d.exr', [1, 2, 3])
+	sequence = FileSequence(str(tmpdir.join('plate.0001-0003.exr')))
+	with pytest.raises(Exception):
+		sequence.copy(FileSequence(str(tmpdir.join('copy.1-2.exr'))))
+	assert sorted(os.listdir(str(tmpdir))) == ['plate.0001.exr', 'plate.0002.exr', 'plate.0003.exr']
+
+
+def test_moveFrameCount(tmpdir):
+	writeFrames(tmpdir, 'plate.%04d.exr', [1, 2, 3])
+	writeFrames(tmpdir, 'move.%d.exr', [1, 2])
+	sequence = FileSequence(str(tmpdir.join('plate.0001-0003.exr')))
+	with pytest.raises(Exception):
+		sequence.move(FileSequence(str(tmpdir.join('move.1-2.exr'))))
+	# Neither the source nor the existing destination frames are touched.
+	assert sorted(os.listdir(str(tmpdir))) == ['move.1.exr', 'move.2.exr', 'plate.0001.exr', 'plate.0002.exr', 'plate.0003.exr']
+
+
+@pytest.mark.parametrize('scandir', [False, True])
+def test_scanDirectory(tmpdir, monkeypatch, scandir):
+	if scandir:
+		pytest.importorskip('scandir')
+	else:
+		monkeypatch.setitem(sys.modules, 'scandir', None)
+	writeFrames(tmpdir, 'plate.%04d.exr', [1, 3, 5, 7, 1000])
+	writeFrames(tmpdir, 'render_%d.png', [8, 9, 10])
+	tmpdir.join('notes.txt').write('')
+	writeFrames(tmpdir.mkdir('shots').mkdir('010'), 'comp.%03d.jpg', [1, 2])
+	stats = []
+	lstat = os.lstat
+	monkeypatch.setattr(os, 'lstat', lambda path: stats.append(path) or lstat(path))
+	monkeypatch.setattr(os.path, 'isfile', None)
+
+	sequences = FileSequence.scanDirectory(str(tmpdir))
+	assert [os.path.basename(sequence.path()) for sequence in sequences] == ['plate.0001-1000.exr', 'render_8-10.png']
+	assert sequences[0].step() == 1 and sequences[0].frames() == [1, 3, 5, 7, 1000]
+	assert not stats
+
+	sequences = FileSequence.scanDirectory(str(tmpdir), recursive=True)
+	assert [os.path.relpath(sequence.path(), str(tmpdir)) for sequence in sequences] == [
+		'plate.0001-1000.exr', 'render_8-10.png', os.path.join('shots', '010', 'comp.001-002.jpg')]
+	if not scandir:
+		# Only the names that cannot be frames are checked for directories.
+		assert sorted(os.path.basename(path) for path in stats) == ['010', 'notes.txt', 'shots']
+
+
+def retimeCurve(keys, columnar=False):
+	curve = FCurve(columnar=columnar, inExtrapolation=ExtrapolationType.Linear, outExtrapolation=ExtrapolationType.Linear)
+	for (time, value), (nextTime, nextValue) in zip(keys, keys[1:] + keys[-1:]):
+		angle = math.atan2(nextValue - value, nextTime - time) if nextTime != time else 0.0
+		curve.addKey(time=time, value=value, inTangentAngle=angle, outTangentAngle=angle, inTangentLength=1 / 3.0,
+			outTangentLength=1 / 3.0, inTangentType=TangentType.Bezier, outTangentType=TangentType.Bezier)
+	return curve
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_retimePlan(columnar):
+	pytest.importorskip('numpy')
+	sequence = FileSequence('/shots/plate.0001-0011.exr')
+	# Half speed, target frames 0 to 20 show source frames 1 to 11.
+	curve = retimeCurve([(0, 1), (20, 11)], columnar)
+	plan = sequence.retimePlan(curve)
+	assert [target for target, source in plan] == range(21)
+	expected = [int(math.floor(curve.valueAtTime(target) + 0.5)) for target in range(21)]
+	assert [source for target, source in plan] == expected
+	assert plan[0] == (0, 1) and plan[-1] == (20, 11)
+
+	# Source frames are clamped to the range of the sequence.
+	plan = sequence.retimePlan(retimeCurve([(10, 0), (14, 12)], columnar))
+	assert plan[0][1] == 1 and plan[-1][1] == 11
+
+	curve = FCurve(columnar=columnar, inExtrapolation=ExtrapolationType.Cycled, outExtrapolation=ExtrapolationType.Cycled)
+	curve.addKey(time=5.0, value=5.0)
+	with pytest.raises(ValueError):
+		sequence.retimePlan(curve)
+
+
+def test_retime(tmpdir):
+	pytest.importorskip('numpy')
+	writeFrames(tmpdir, 'plate.%04d.exr', range(1, 12))
+	sequence = FileSequence(str(tmpdir.join('plate.0001-0011.exr')))
+	progress = []
+	retimed = sequence.retime(str(tmpdir.join('retimed.exr')), retimeCurve([(0, 1), (20, 11)]), progress=lambda done, total: progress.append((done, total)))
+	assert os.path.basename(retimed.path()) == 'retimed.0-20.exr'
+	assert retimed.isComplete()
+	plan = sequence.retimePlan(retimeCurve([(0, 1), (20, 11)]))
+	assert [open(path).read() for path in retimed.paths()] == [str(source) for target, source in plan]
+	# Each source frame is copied once, the targets showing it again are linked to that copy.
+	if hasattr(os, 'link'):
+		assert os.path.samefile(retimed.framePath(1), retimed.framePath(2))
+		assert not os.path.samefile(retimed.framePath(1), sequence.framePath(2))
+	assert progress[-1] == (21, 21) and len(progress) == 21
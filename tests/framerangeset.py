@@ -0,0 +1,60 @@
+import time
+import random
+
+from cross3d.classes.framerange import FrameRange
+from cross3d.classes.framerangeset import FrameRangeSet
+
+def randomSet(count, bound=10000):
+	ranges = []
+	for index in xrange(count):
+		start = random.randint(0, bound)
+		ranges.append((start, start + random.randint(0, 20)))
+	return FrameRangeSet(ranges)
+
+def test_setOperations():
+	random.seed(0)
+	for index in xrange(50):
+		a = randomSet(200)
+		b = randomSet(200)
+		framesA = set(a.frames())
+		framesB = set(b.frames())
+		assert (a | b).frames() == sorted(framesA | framesB)
+		assert (a & b).frames() == sorted(framesA & framesB)
+		assert (a - b).frames() == sorted(framesA - framesB)
+		assert a.complemented(FrameRange([-10, 5000])).frames() == sorted(set(range(-10, 5001)) - framesA)
+		assert a.count() == len(framesA)
+		assert [frame in a for frame in xrange(-5, 10100)] == [frame in framesA for frame in xrange(-5, 10100)]
+		assert FrameRangeSet.fromString(a.string()) == a
+		gaps = FrameRangeSet(list(a.gaps()))
+		assert gaps == a.complemented(a.bounds())
+
+def test_strings():
+	frames = FrameRangeSet.fromString('1-100,120-200x2, 300')
+	assert frames.count() == 100 + 41 + 1
+	assert frames.string() == '1-100,120-200x2,300'
+	assert FrameRangeSet([5, 3, 4, (1, 2), FrameRange([10, 12])]).string() == '1-5,10-12'
+	assert FrameRangeSet([1, 3, 6]).string() == '1,3,6'
+	assert FrameRangeSet.fromString('-5--1,3').frames() == [-5, -4, -3, -2, -1, 3]
+	assert FrameRangeSet(range(1, 20, 3) + [50]).ranges() == [FrameRange([frame, frame]) for frame in range(1, 20, 3) + [50]]
+	assert FrameRangeSet([(1, 10)]).contains(FrameRange([2, 10]))
+	assert not FrameRangeSet([(1, 10), (12, 20)]).contains(FrameRange([2, 12]))
+	assert FrameRangeSet([(1, 10), (12, 20)]).overlaps(FrameRange([11, 12]))
+	assert not FrameRangeSet([(1, 10), (12, 20)]).overlaps(FrameRange([11, 11]))
+
+def test_unionThroughput():
+	random.seed(1)
+	ranges = [FrameRange([start, start + 50]) for start in random.sample(xrange(50000), 1000)]
+	start = time.time()
+	merged = []
+	for frameRange in ranges:
+		# The pairwise merging FrameRange offers.
+		overlapping = [other for other in merged if frameRange.overlaps(other.padded(1))]
+		for other in overlapping:
+			frameRange = frameRange.merged(other)
+		merged = [other for other in merged if other not in overlapping] + [frameRange]
+	pairwise = time.time() - start
+	start = time.time()
+	frameRangeSet = FrameRangeSet(ranges)
+	batch = time.time() - start
+	assert frameRangeSet.count() == len(set(frame for frameRange in ranges for frame in xrange(frameRange[0], frameRange[1] + 1)))
+	print 'union of {} ranges: {:.1f}ms pairwise, {:.1f}ms FrameRangeSet'.format(len(ranges), pairwise * 1000, batch * 1000)
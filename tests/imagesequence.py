@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from cross3d.migrate import imagesequence
+
+PATHS = [
+	os.path.join('shots', 'plate.0001.exr'),
+	os.path.join('shots', 'Sc001_S0010.00_comp_v2.1001.jpg'),
+	os.path.join('shots', 'notes.txt'),
+	os.path.join('shots', 'PLATE.0002.EXR'),
+	os.path.join('shots', 'render_12.png'),
+]
+
+
+@pytest.fixture
+def cache():
+	yield
+	imagesequence.setInfoCacheSize(0)
+
+
+def groups(match):
+	return match.groupdict() if match else None
+
+
+@pytest.mark.parametrize('size', [0, 2, 100])
+@pytest.mark.parametrize('osystem', [None, 'Windows', 'Linux'])
+def test_imageSequenceInfos(cache, size, osystem):
+	imagesequence.setInfoCacheSize(size)
+	infos = imagesequence.imageSequenceInfos(PATHS * 2, osystem)
+	expected = [imagesequence.imageSequenceInfo(path, osystem) for path in PATHS * 2]
+	assert [groups(match) for match in infos] == [groups(match) for match in expected]
+	assert infos[0].group('frame') == '0001' and infos[2] is None
+	assert infos[1].group('pre').endswith('Sc001_S0010.00_comp_v2.')
+
+
+def test_infoCache(cache):
+	a, b, c = PATHS[0], PATHS[1], PATHS[4]
+	imagesequence.setInfoCacheSize(2)
+	first = imagesequence.imageSequenceInfo(a)
+	second = imagesequence.imageSequenceInfo(b)
+	# Cached results are returned as they are and marked as the most recently used.
+	assert imagesequence.imageSequenceInfo(a) is first
+	imagesequence.imageSequenceInfo(c)
+	assert [path for path, osystem in imagesequence._infoCache] == [a, c]
+	assert imagesequence.imageSequenceInfo(b) is not second
+	assert imagesequence.imageSequenceInfos([c, a])[0] is imagesequence.imageSequenceInfo(c)
+	assert len(imagesequence._infoCache) == 2
+
+	# The operating system is part of the key.
+	imagesequence.setInfoCacheSize(10)
+	windows = imagesequence.imageSequenceInfo(a, 'Windows')
+	assert imagesequence.imageSequenceInfo(a, 'Linux') is not windows
+	assert imagesequence.imageSequenceInfo(a, 'Windows') is windows
+	assert sorted(imagesequence._infoCache) == [(a, 'Linux'), (a, 'Windows')]
+
+
+def test_infoCacheDisabled(cache):
+	imagesequence.setInfoCacheSize(3)
+	imagesequence.imageSequenceInfos(PATHS)
+	assert len(imagesequence._infoCache) == 3
+	imagesequence.setInfoCacheSize(0)
+	assert not imagesequence._infoCache
+	first = imagesequence.imageSequenceInfo(PATHS[0])
+	assert imagesequence.imageSequenceInfo(PATHS[0]) is not first
+	imagesequence.imageSequenceInfos(PATHS)
+	assert not imagesequence._infoCache
@@ -0,0 +1,40 @@
+import os
+import sys
+import subprocess
+
+# The package root, so the interpreters started by the tests import this cross3d.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the modules loaded by the statements it is formatted with, one per line as name and file.
+LOADED = '''
+import sys
+before = set(sys.modules)
+{}
+for name in sorted(set(sys.modules) - before):
+	if sys.modules[name] is not None:
+		print name, getattr(sys.modules[name], '__file__', '')
+'''
+
+def loadedModules(statements):
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join([ROOT] + filter(None, [env.get('PYTHONPATH')]))
+	# -B keeps the interpreter from writing .pyc files into the source tree.
+	output = subprocess.check_output([sys.executable, '-B', '-c', LOADED.format(statements)], env=env)
+	return dict((line.split(' ', 1) + [''])[:2] for line in output.splitlines())
+
+def test_importLoadsStandardLibraryOnly():
+	from distutils import sysconfig
+	standardLibrary = os.path.normcase(os.path.realpath(sysconfig.get_python_lib(standard_lib=True)))
+	sitePackages = os.path.normcase(os.path.realpath(sysconfig.get_python_lib()))
+	modules = loadedModules('import cross3d')
+	assert [name for name in modules if name.startswith('cross3d')] == ['cross3d']
+	for name, path in modules.iteritems():
+		if name == 'cross3d' or not path:
+			continue
+		path = os.path.normcase(os.path.realpath(path))
+		assert path.startswith(standardLibrary) and not path.startswith(sitePackages), name
+
+def test_importIsLazy():
+	modules = loadedModules('import cross3d; cross3d.FileSequence; cross3d.FCurve')
+	assert 'cross3d.classes.filesequence' in modules and 'cross3d.classes.fcurve' in modules
+	assert not [name for name in modules if name.startswith(('PyQt4', 'cross3d.abstract', 'numpy'))]
@@ -0,0 +1,174 @@
+import sys
+import types
+import importlib
+
+import pytest
+
+pytest.importorskip('PyQt4')
+import cross3d
+
+
+class FileProperties(object):
+	""" Stands in for mxs.fileProperties, the properties of the open scene. """
+
+	def __init__(self):
+		self.properties = {'custom': []}
+
+	def addProperty(self, section, key, value, kind=None):
+		index = self.findProperty(section, key)
+		if index:
+			self.properties[section][index - 1] = (key, value)
+		else:
+			self.properties[section].append((key, value))
+
+	def deleteProperty(self, section, key):
+		index = key if isinstance(key, int) else self.findProperty(section, key)
+		del self.properties[section][index - 1]
+		return True
+
+	def findProperty(self, section, key):
+		names = [name for name, value in self.properties[section]]
+		return names.index(key) + 1 if key in names else 0
+
+	def getNumProperties(self, section):
+		return len(self.properties[section])
+
+	def getPropertyName(self, section, index):
+		return self.properties[section][index - 1][0]
+
+	def getPropertyValue(self, section, index):
+		return self.properties[section][index - 1][1]
+
+
+class PyHelper(object):
+
+	def namify(self, name):
+		return name
+
+
+class Mxs(object):
+	""" Stands in for the user prop functions of Py3dsMax.mxs, recording the calls. """
+
+	def __init__(self):
+		self.buffers = {}
+		self.calls = []
+		self.fileProperties = FileProperties()
+		self.pyhelper = PyHelper()
+
+	def getUserPropBuffer(self, node):
+		self.calls.append('getUserPropBuffer')
+		return self.buffers.get(node, '')
+
+	def setUserPropBuffer(self, node, string):
+		self.calls.append('setUserPropBuffer')
+		self.buffers[node] = string
+
+	def setUserProp(self, node, key, value):
+		self.calls.append('setUserProp')
+		lines = [line for line in self.buffers.get(node, '').split('\r\n') if line and line.split(' = ')[0] != key]
+		self.buffers[node] = ''.join(line + '\r\n' for line in lines + ['%s = %s' % (key, value)])
+
+
+@pytest.fixture
+def studiomax(monkeypatch):
+	mxs = Mxs()
+	module = types.ModuleType('Py3dsMax')
+	module.mxs = mxs
+	monkeypatch.setitem(sys.modules, 'Py3dsMax', module)
+	# Importing the module registers its classes, which must not replace the ones of the backend in use.
+	monkeypatch.setattr(cross3d, 'registerSymbol', lambda *args, **kwargs: None)
+	monkeypatch.delitem(sys.modules, 'cross3d.studiomax.studiomaxuserprops', raising=False)
+	studiomaxuserprops = importlib.import_module('cross3d.studiomax.studiomaxuserprops')
+	monkeypatch.delitem(sys.modules, 'cross3d.studiomax.studiomaxuserprops')
+	return studiomaxuserprops
+
+
+@pytest.fixture
+def props(studiomax, monkeypatch):
+	mxs = studiomax.mxs
+	StudiomaxUserProps = studiomax.StudiomaxUserProps
+	changes = []
+	monkeypatch.setattr(StudiomaxUserProps, 'emitChange', lambda self, key=None: changes.append(key))
+	monkeypatch.setattr(StudiomaxUserProps, 'typedValues', False)
+	StudiomaxUserProps._bufferCache.clear()
+	mxs.buffers['node'] = '\r\n'.join([
+		'Asset = Hero',
+		'Version = 1',
+		'Tags = {"a": 1}',
+		'garbage',
+		'',
+		'Version = 2',
+		'Old = 3',
+	]) + '\r\n'
+	props = StudiomaxUserProps('node')
+	props.mxs = mxs
+	props.changes = changes
+	return props
+
+
+def test_read(props):
+	assert props['Asset'] == 'Hero' and props['Old'] == 3
+	# Like maxscript, the last of duplicate keys wins.
+	assert props['Version'] == 2
+	assert 'Tags' in props and props.get('Missing', 5) == 5
+	# The buffer is parsed once for all the instances.
+	assert props._parseBuffer(props.mxs.buffers['node']) is type(props)._parseBuffer(props.mxs.buffers['node'])
+
+
+def test_batch(props):
+	mxs = props.mxs
+	with props.batch():
+		props['Version'] = 3
+		props['Frames'] = [1, 100]
+		del props['Old']
+		props['Tags'] = {'b': 2}
+		props['Version'] = 4
+		# Reads see the pending changes.
+		assert props['Version'] == 4 and 'Old' not in props
+		assert 'setUserPropBuffer' not in mxs.calls and not props.changes
+	assert mxs.calls.count('setUserPropBuffer') == 1 and 'setUserProp' not in mxs.calls
+	# One notification for the tags and one for the other keys.
+	assert sorted(props.changes) == [None, 'Tags']
+	# Duplicate lines collapse into the first, unparseable lines are kept in place.
+	assert mxs.buffers['node'].split('\r\n') == [
+		'Asset = Hero',
+		'Version = 4',
+		"Tags = {'b': 2}",
+		'garbage',
+		'Frames = [1, 100]',
+		'',
+	]
+	assert props.lookupProps() == {'Asset': 'Hero', 'Version': 4, 'Tags': {'b': 2}, 'Frames': [1, 100]}
+
+
+def test_update(props):
+	mxs = props.mxs
+	props.update(Asset='Villain', Status='wip')
+	assert mxs.calls.count('setUserPropBuffer') == 1
+	assert props.changes == [None]
+	assert props['Asset'] == 'Villain' and props['Status'] == 'wip'
+
+	# Outside of a batch each write is stored and notified as it is made.
+	del mxs.calls[:]
+	props['Status'] = 'done'
+	assert mxs.calls.count('setUserProp') == 1 and props.changes == [None, 'Status']
+	with props.batch():
+		pass
+	assert 'setUserPropBuffer' not in mxs.calls
+
+
+def test_fileProps(studiomax, monkeypatch):
+	StudiomaxFileProps = studiomax.StudiomaxFileProps
+	monkeypatch.setattr(StudiomaxFileProps, 'emitChange', lambda self, key=None: None)
+	# The properties of the open scene are read with mxs, without opening a store like dsofile.
+	props = StudiomaxFileProps()
+	props['Version'] = 3
+	props['Frames'] = [1, 100]
+	assert props.get('Version') == 3 and props.get('Missing', 5) == 5
+	assert 'Version' in props and props.has_key('Frames') and 'Missing' not in props
+	assert sorted(props.keys()) == ['Frames', 'Version']
+	assert props['Frames'] == [1, 100] and props.lookupProps() == {'Version': 3, 'Frames': [1, 100]}
+	assert props.pop('Frames') == [1, 100] and props.pop('Frames', 0) == 0
+	assert props.keys() == ['Version']
+	del props['Version']
+	assert props.keys() == [] and studiomax.mxs.fileProperties.properties == {'custom': []}
@@ -0,0 +1,56 @@
+import fractions
+
+import pytest
+
+from cross3d.classes.timecode import Timecode
+from cross3d.constants import TimeUnit
+
+def test_formatCacheEviction():
+	for index in xrange(Timecode._FORMATS_CACHE_SIZE * 2):
+		Timecode(1, 2, 3, 4).toString('hh:mm:ss:ff' + '-' * index)
+	assert len(Timecode._FORMATS) == Timecode._FORMATS_CACHE_SIZE
+
+def test_dropFrame():
+	timecode = Timecode(framerate=29.97, dropFrame=True)
+	for frameCount, string in ((1799, '00:00:59;29'), (1800, '00:01:00;02'), (17982, '00:10:00;00'), (107892, '01:00:00;00')):
+		timecode.frameCount = frameCount
+		assert timecode.toString() == string
+		assert Timecode.fromString(string, 'hh:mm:ss;ff', dropFrame=True).frameCount == frameCount
+	# Skipped labels are moved to the next existing one.
+	assert Timecode(minutes=1, frames=0, dropFrame=True).toString() == '00:01:00;02'
+	timecode = Timecode(framerate=59.94, minutes=1, dropFrame=True)
+	assert (timecode.frameCount, timecode.toString()) == (3600, '00:01:00;04')
+	with pytest.raises(ValueError):
+		Timecode(framerate=25, dropFrame=True)
+
+def test_rationalFramerate():
+	assert Timecode(framerate=29.97)._rate == fractions.Fraction(30000, 1001)
+	assert Timecode(framerate=23.976)._rate == fractions.Fraction(24000, 1001)
+	assert Timecode(framerate=fractions.Fraction(30000, 1001))._rate == fractions.Fraction(30000, 1001)
+	assert Timecode(framerate=24)._rate == 24
+	assert Timecode(framerate=29.97, seconds=1).toSeconds() == 1.001
+	assert Timecode(framerate=fractions.Fraction(30000, 1001), hours=1, dropFrame=True).toString() == '01:00:00;00'
+
+def test_integerFrames():
+	timecode = Timecode(framerate=24, seconds=1.5)
+	assert timecode.frameCount == 36 and isinstance(timecode.frameCount, int)
+	timecode.frameCount = 10.5
+	assert timecode.frameCount == 11 and isinstance(timecode.frameCount, int)
+	timecode.setFromSeconds(1 / 48.0)
+	assert timecode.frameCount == 1
+	assert Timecode.fromValue(1000, TimeUnit.Milliseconds, framerate=29.97).frameCount == 30
+	assert Timecode(framerate=24, frames=30).toString() == '00:00:01:06'
+	timecode = Timecode(framerate=29.97, seconds=1)
+	timecode.convertToFramerate(24)
+	assert timecode.frameCount == 24 and isinstance(timecode.frameCount, int)
+
+def test_exactArithmetic():
+	# Adding frames at 29.97 is exact, where adding 1001 / 30000.0 seconds would drift.
+	frame = Timecode(frames=1, framerate=29.97, dropFrame=True)
+	total = Timecode(framerate=29.97, dropFrame=True)
+	for index in xrange(107892):
+		total = total + frame
+	assert total.frameCount == 107892
+	assert total.toString() == '01:00:00;00'
+	assert total.toSeconds() == 107892 * 1001 / 30000.0
+	assert Timecode(hours=1, framerate=29.97, dropFrame=True) == total
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from cross3d.classes.timecode import Timecode
+
+COUNT = 20000
+FORMATS = ['hh:mm:ss:ff', 'H:M:S:F', 'hh;mm;ss;ff']
+
+def throughput(function):
+	start = time.time()
+	function()
+	return COUNT / max(time.time() - start, 1e-9)
+
+def test_formatThroughput():
+	timecodes = [Timecode(frames=frame, framerate=24) for frame in xrange(COUNT)]
+	for formatString in FORMATS:
+		perCall = [timecode.toString(formatString) for timecode in timecodes]
+		assert Timecode.formatMany(timecodes, formatString) == perCall
+		print 'format {}: {:.0f}/s per call, {:.0f}/s batch'.format(
+			formatString,
+			throughput(lambda: [timecode.toString(formatString) for timecode in timecodes]),
+			throughput(lambda: Timecode.formatMany(timecodes, formatString)),
+		)
+
+def test_parseThroughput():
+	timecodes = [Timecode(frames=frame, framerate=24) for frame in xrange(COUNT)]
+	for formatString in FORMATS:
+		strings = Timecode.formatMany(timecodes, formatString)
+		parsed = Timecode.parseMany(strings, formatString, framerate=24)
+		assert [timecode.toString(formatString) for timecode in parsed] == strings
+		print 'parse {}: {:.0f}/s per call, {:.0f}/s batch'.format(
+			formatString,
+			throughput(lambda: [Timecode.fromString(string, formatString, framerate=24) for string in strings]),
+			throughput(lambda: Timecode.parseMany(strings, formatString, framerate=24)),
+		)
+
+def test_vectorizedThroughput():
+	pytest.importorskip('numpy')
+	frameCounts = range(0, COUNT * 10, 10)
+	timecode = Timecode(framerate=29.97, dropFrame=True)
+	def perCall():
+		strings = []
+		for frameCount in frameCounts:
+			timecode.frameCount = frameCount
+			strings.append(timecode.toString())
+		return strings
+	strings = Timecode.framesToStrings(frameCounts, framerate=29.97, dropFrame=True)
+	assert strings == perCall()
+	assert Timecode.stringsToFrames(strings, 'hh:mm:ss;ff', dropFrame=True).tolist() == frameCounts
+	print 'drop-frame strings: {:.0f}/s per call, {:.0f}/s vectorized'.format(
+		throughput(perCall),
+		throughput(lambda: Timecode.framesToStrings(frameCounts, framerate=29.97, dropFrame=True)),
+	)
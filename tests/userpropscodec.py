@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import timeit
+import subprocess
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip('PyQt4')
+from cross3d.abstract.abstractuserprops import AbstractUserProps
+
+VALUES = [
+	125,
+	147.56,
+	[1, 2, 3],
+	{'Test': 'item', 'tInt': 10, 'tfloat': 12.45},
+	(123, 498),
+	True,
+	False,
+	None,
+	u'text with\nline breaks & \xe9',
+	OrderedDict([('b', 1), ('a', [1, 2])]),
+	{1: (2, 3)},
+]
+
+# Values stored by older versions, or typed by users, and their decoded value.
+LEGACY = [
+	('125', 125),
+	('147.56', 147.56),
+	('[1, 2, 3]', [1, 2, 3]),
+	('{"Test": "item", "tInt": 10}', {'Test': 'item', 'tInt': 10}),
+	('(123, 498)', (123, 498)),
+	('True', True),
+	('hello world', 'hello world'),
+	('#(1, #(2, 3))', [1, [2, 3]]),
+]
+
+@pytest.fixture
+def typed(monkeypatch):
+	monkeypatch.setattr(AbstractUserProps, 'typedValues', True)
+
+def test_roundTrip(typed):
+	for value in VALUES:
+		decoded = AbstractUserProps.unescapeValue(AbstractUserProps.escapeValue(value))
+		assert decoded == value and type(decoded) == type(value), (value, decoded)
+	assert '\n' not in AbstractUserProps.escapeValue(u'a\nb')
+
+def test_legacy():
+	for string, value in LEGACY:
+		assert AbstractUserProps.unescapeValue(string) == value
+	# Cached containers are copied, modifying a decoded value does not affect the next one.
+	AbstractUserProps.unescapeValue('[1, 2, 3]').append(4)
+	assert AbstractUserProps.unescapeValue('[1, 2, 3]') == [1, 2, 3]
+	assert AbstractUserProps.unescapeValue(u'c3d1:x:unknown tag') == u'c3d1:x:unknown tag'
+	AbstractUserProps.setValueCacheSize(2)
+	try:
+		for string, value in LEGACY:
+			assert AbstractUserProps.unescapeValue(string) == value
+		assert len(AbstractUserProps._valueCache) == 2
+	finally:
+		AbstractUserProps.setValueCacheSize(4096)
+
+def typedValuesDefault(environment):
+	env = dict(os.environ)
+	env.pop('CROSS3D_TYPED_USERPROPS', None)
+	env.update(environment)
+	root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+	env['PYTHONPATH'] = os.pathsep.join([root] + filter(None, [env.get('PYTHONPATH')]))
+	script = 'from cross3d.abstract.abstractuserprops import AbstractUserProps; print AbstractUserProps.typedValues'
+	return subprocess.check_output([sys.executable, '-B', '-c', script], env=env).strip()
+
+def test_legacyWrites(monkeypatch):
+	# Values are written untyped unless enabled, so older versions can read them.
+	assert typedValuesDefault({}) == 'False'
+	assert typedValuesDefault({'CROSS3D_TYPED_USERPROPS': '1'}) == 'True'
+	monkeypatch.setattr(AbstractUserProps, 'typedValues', False)
+	assert AbstractUserProps.escapeValue([1, 2]) == '[1, 2]'
+	assert AbstractUserProps.escapeValue(u'a\nb') == u'a&#10;b'
+
+def test_throughput(typed):
+	count = 2000
+	typed = [AbstractUserProps.escapeValue(value) for value in VALUES]
+	legacy = [string for string, value in LEGACY]
+	uncached = timeit.timeit(lambda: [AbstractUserProps._decodeLegacyValue(string) for string in legacy], number=count)
+	cached = timeit.timeit(lambda: [AbstractUserProps.unescapeValue(string) for string in legacy], number=count)
+	typedTime = timeit.timeit(lambda: [AbstractUserProps.unescapeValue(string) for string in typed], number=count)
+	print 'per value: {:.1f}us legacy, {:.1f}us legacy cached, {:.1f}us typed'.format(
+		uncached / count / len(legacy) * 1e6, cached / count / len(legacy) * 1e6, typedTime / count / len(typed) * 1e6)
+	assert cached < uncached
@@ -0,0 +1,89 @@
+import time
+import xml.dom.minidom
+
+from cross3d.migrate import XML
+from cross3d.migrate.XML import ETreeDocument
+
+def buildLayerState(count):
+	document = ETreeDocument()
+	layerState = document.addNode('layerState')
+	for index in xrange(count):
+		layer = layerState.addNode('layer')
+		layer.setAttribute('name', u'layer %i & \xe9' % index)
+		layer.setAttribute('id', index)
+		layer.addNode('propSetOverride').recordValue({'visible': True, 'range': [1.5, 'x'], 'index': index})
+		layer.addNode('comment').setValue('layer %i' % index)
+	return document
+
+def test_roundTrip():
+	document = buildLayerState(100)
+	parsed = ETreeDocument()
+	assert parsed.parse(document.toxml())
+	assert parsed.toxml() == document.toxml()
+	layers = parsed.root().findChildren('layer')
+	assert len(layers) == 100
+	assert layers[5].attribute('name') == u'layer 5 & \xe9'
+	assert layers[5].findChild('propSetOverride').restoreValue() == {'visible': True, 'range': [1.5, 'x'], 'index': 5}
+	assert layers[5].findChild('comment').value() == 'layer 5'
+	assert parsed.findChild('comment', recursive=True).value() == 'layer 0'
+	assert layers[5].parent() == parsed.root() and parsed.root().parent() is None
+	# The minidom documents read the same values.
+	minidomDocument = xml.dom.minidom.parseString(document.toxml().encode('utf-8'))
+	assert XML.unescape(minidomDocument.getElementsByTagName('layer')[5].getAttribute('name')) == u'layer 5 & \xe9'
+
+def test_indexUpdates():
+	document = buildLayerState(10)
+	layerState = document.root()
+	assert layerState.findChild('layer').attribute('id') == '0'
+	layerState.findChild('layer').remove()
+	assert layerState.findChild('layer').attribute('id') == '1'
+	layer = layerState.addNode('layer')
+	assert layerState.findChildren('layer')[-1] == layer
+	assert layer.parent() == layerState
+	layerState.clear()
+	assert layerState.findChildren('layer') == []
+	assert document.toxml() == u'<?xml version="1.0" encoding="utf-8"?><layerState />'
+
+def test_prettyXml():
+	document = buildLayerState(2)
+	pretty = document.toprettyxml()
+	parsed = ETreeDocument()
+	parsed.parse(pretty)
+	parsed.removeWitespaceNodes(parsed._object)
+	assert parsed.toxml() == document.toxml()
+	# Indenting for display leaves the document untouched.
+	assert u'\n' not in document.toxml()
+
+def test_fCurveXml():
+	from cross3d.classes.fcurve import FCurve
+	backend = XML.backend()
+	XML.setBackend('etree')
+	try:
+		curve = FCurve()
+		curve.addKey(time=0, value=1.0)
+		curve.addKey(time=10, value=2.5)
+		restored = FCurve()
+		restored.fromXML(curve.toXML())
+		assert restored == curve
+	finally:
+		XML.setBackend(backend)
+
+def test_throughput():
+	document = buildLayerState(5000)
+	text = document.toxml().encode('utf-8')
+	start = time.time()
+	minidomDocument = xml.dom.minidom.parseString(text)
+	minidomParse = time.time() - start
+	start = time.time()
+	minidomDocument.toxml('utf-8')
+	minidomSerialize = time.time() - start
+	start = time.time()
+	parsed = ETreeDocument()
+	parsed.parse(text)
+	parse = time.time() - start
+	start = time.time()
+	parsed.toxml()
+	serialize = time.time() - start
+	print '{}kB: parse {:.0f}ms minidom, {:.0f}ms etree; serialize {:.0f}ms minidom, {:.0f}ms etree'.format(
+		len(text) / 1024, minidomParse * 1000, parse * 1000, minidomSerialize * 1000, serialize * 1000)
+	assert parse < minidomParse
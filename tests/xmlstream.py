@@ -0,0 +1,86 @@
+import os
+import sys
+import subprocess
+import cStringIO
+
+import pytest
+
+from cross3d.migrate.XML import ETreeDocument, XMLWriter, iterElements
+
+# The package root, so the interpreters started by the tests import this cross3d.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Layers written by test_flatMemory, enough for the loaded document to outgrow the peak memory of the
+# imports, which the memory growth is measured from.
+COUNT = 50000
+
+def recordLayer(parent, index):
+	layer = parent.addNode('layer')
+	layer.setAttribute('name', u'layer %i & \xe9' % index)
+	layer.setAttribute('id', index)
+	layer.addNode('propSetOverride').recordValue({'visible': True, 'index': index})
+	return layer
+
+def test_writeMatchesDocument():
+	document = ETreeDocument()
+	layerState = document.addNode('layerState')
+	layerState.setAttribute('version', 2)
+	output = cStringIO.StringIO()
+	with XMLWriter(output, 'layerState', {'version': 2}) as writer:
+		for index in xrange(20):
+			recordLayer(layerState, index)
+			recordLayer(writer, index)
+	assert output.getvalue().decode('utf-8') == document.toxml().replace('?><', '?>\n<')
+
+	pretty = cStringIO.StringIO()
+	with XMLWriter(pretty, 'layerState', {'version': 2}, pretty=True) as writer:
+		for index in xrange(20):
+			recordLayer(writer, index)
+	assert pretty.getvalue().decode('utf-8') == ETreeDocument.formatXml(document.toxml())
+
+def test_iterElements(tmpdir):
+	path = str(tmpdir.join('layerState.xml'))
+	with XMLWriter(path, 'layerState', pretty=True) as writer:
+		for index in xrange(100):
+			recordLayer(writer, index)
+	layers = []
+	previous = None
+	for element in iterElements(path, 'layer'):
+		if previous is not None:
+			# Elements are freed once the next one is requested.
+			assert previous.attribute('id') == '' and not previous.children()
+		layers.append((element.attribute('id'), element.attribute('name'), element.findChild('propSetOverride').restoreValue()))
+		assert element.findChild('propSetOverride').value() == ''
+		previous = element
+	assert layers == [(str(index), u'layer %i & \xe9' % index, {'visible': True, 'index': index}) for index in xrange(100)]
+	assert [element.attribute('key') for element in iterElements(path, 'entry', depth=3)][:2] == ['visible', 'index']
+	roots = [(element.nodeName, len(element.children())) for element in iterElements(path, depth=0)]
+	assert roots == [('layerState', 100)]
+
+def test_flatMemory(tmpdir):
+	# Peak memory is only read through the Unix resource module.
+	pytest.importorskip('resource')
+	path = str(tmpdir.join('large.xml'))
+	with XMLWriter(path, 'animation') as writer:
+		for index in xrange(COUNT):
+			recordLayer(writer, index)
+	script = '\n'.join([
+		'import resource, sys',
+		'from cross3d.migrate.XML import ETreeDocument, iterElements',
+		'imported = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss',
+		'if sys.argv[1] == "stream":',
+		'	count = sum(1 for element in iterElements(sys.argv[2]))',
+		'else:',
+		'	document = ETreeDocument()',
+		'	document.load(sys.argv[2])',
+		'	count = len(document.root().children())',
+		'print count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - imported',
+	])
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join([ROOT] + filter(None, [env.get('PYTHONPATH')]))
+	results = {}
+	for mode in ('stream', 'load'):
+		output = subprocess.check_output([sys.executable, '-c', script, mode, path], env=env).split()
+		assert output[0] == str(COUNT)
+		results[mode] = int(output[1])
+	print 'peak memory growth: {}kB streaming, {}kB loading'.format(results['stream'], results['load'])
+	assert results['stream'] * 2 < results['load']